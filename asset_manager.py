@@ -0,0 +1,122 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import pygame
+from startup import startup_stage
+
+# ---------------------- GUI ASSET MANAGER ----------------------
+# Images for the GUI are decoded and scaled on a worker thread, so loading a card
+# never stalls a frame. Decoded source images are kept apart from their scaled
+# variants (one per target size): a resize only rescales from the source, lazily,
+# one image at a time, as cells ask for the new size.
+# pygame can decode and scale off the GUI thread, but convert_alpha() needs the
+# display, so the GUI thread finishes results in pump(), within a time budget.
+# Everything except the worker functions runs on the GUI thread.
+
+class AssetManager:
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset-decode")
+        self._sources = {}   # path: Future of the decoded source surface
+        self._pending = {}   # (path, size): Future of the scaled surface, not converted yet
+        self._ready = {}     # (path, size): surface ready to blit
+        self._latest = {}    # path: size of its newest ready variant
+        self._failed = set() # Paths that could not be loaded (until invalidated)
+        self.on_ready = None # Called on the worker thread when a variant is done (GUI wake-up)
+        self.stats = {"decoded": 0, "decode_ms": 0.0, "scaled": 0, "scale_ms": 0.0}
+
+    # ----------- Worker ------------
+
+    def _decode(self, path, stage=None):
+        started = time.perf_counter()
+        if stage:
+            with startup_stage(stage):
+                surf = pygame.image.load(path)
+        else:
+            surf = pygame.image.load(path)
+        self.stats["decoded"] += 1
+        self.stats["decode_ms"] += (time.perf_counter() - started) * 1000
+        return surf
+
+    def _scale(self, source_future, size):
+        source = source_future.result()
+        started = time.perf_counter()
+        try:
+            surf = pygame.transform.smoothscale(source, size)
+        except ValueError:
+            surf = pygame.transform.scale(source, size)  # smoothscale needs 24/32-bit images
+        self.stats["scaled"] += 1
+        self.stats["scale_ms"] += (time.perf_counter() - started) * 1000
+        return surf
+
+    def _notify(self, future):
+        if self.on_ready is not None:
+            self.on_ready()
+
+    # ----------- GUI thread ------------
+
+    def preload(self, path, stage=None):
+        """Starts decoding `path` in the background, unless it already is. stage: startup stage name."""
+        if path not in self._sources:
+            self._sources[path] = self._pool.submit(self._decode, path, stage)
+
+    def request(self, path, size):
+        """Starts making `path` at `size` in the background, unless it is already there or on its way."""
+        key = (path, (max(1, size[0]), max(1, size[1])))
+        if key in self._ready or key in self._pending or path in self._failed:
+            return
+        self.preload(path)
+        future = self._pool.submit(self._scale, self._sources[path], key[1])
+        future.add_done_callback(self._notify)
+        self._pending[key] = future
+
+    def get(self, path, size, fallback=True) -> Optional[pygame.Surface]:
+        """
+        `path` scaled to `size`, requested in the background if it is not ready.
+        Meanwhile returns its latest variant of another size (fallback) or None.
+        """
+        key = (path, (max(1, size[0]), max(1, size[1])))
+        surf = self._ready.get(key)
+        if surf is None:
+            self.request(path, size)
+            if fallback and path in self._latest:
+                return self._ready.get((path, self._latest[path]))
+        return surf
+
+    def invalidate(self, path):
+        """Forgets `path` and all its variants, e.g. because the file was rewritten."""
+        self._sources.pop(path, None)
+        self._latest.pop(path, None)
+        self._failed.discard(path)
+        for cache in (self._ready, self._pending):
+            for key in [k for k in cache if k[0] == path]:
+                del cache[key]
+
+    def pump(self, budget_ms=2.0) -> int:
+        """Readies finished variants for display, for up to budget_ms. Returns how many."""
+        deadline = time.perf_counter() + budget_ms / 1000
+        done = 0
+        for key, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            if done and time.perf_counter() > deadline:
+                break
+            del self._pending[key]
+            path, size = key
+            try:
+                surf = future.result().convert_alpha()
+            except Exception as e:
+                print(f"[ASSETS] Could not load {path}: {e}")
+                self._failed.add(path)
+                continue
+            # The new size replaces the path's older variants
+            for old in [k for k in self._ready if k[0] == path]:
+                del self._ready[old]
+            self._ready[key] = surf
+            self._latest[path] = size
+            done += 1
+        return done
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"{s['decoded']} decoded ({s['decode_ms']:.0f} ms), {s['scaled']} scaled ({s['scale_ms']:.0f} ms) "
+                f"off the GUI thread, {len(self._ready)} ready, {len(self._pending)} pending")
@@ -0,0 +1,174 @@
+import json
+import queue
+import random
+import time
+from board_geometry import ALL_SQUARE_IDS
+from memory_queues import square_queue, gui_queue
+from gui_events import Reveal, PlayAgain, ScanFail, Turn, GameOver, Reset, encode
+import memory_logic
+import robot_backend
+
+# ---------------------- AUTOPLAY BENCHMARK ----------------------
+# Plays full games without the GUI: a scripted human takes the human turns by
+# sending square picks, exactly like clicks, and follows the game through the same
+# gui_queue messages the GUI reads. Meant for the mock backend with a time warp,
+# but it drives the real robot just as well.
+# The human sees what the robot's camera saw: it knows a pair once memory_logic
+# does, and acts on it with probability `human_recall`.
+# With record_path, every GUI message is also written as a JSON line
+# {"t": seconds, "msg": gui_events.encode(msg)}, which gui_profiler.py can replay.
+
+IDLE_TIMEOUT = 120.0  # Wall-clock seconds without any GUI message before giving up
+
+
+class ScriptedHuman:
+    def __init__(self, recall=0.6, seed=None):
+        self.recall = recall
+        self.rng = random.Random(seed)
+
+    def _unseen(self, exclude=None):
+        with memory_logic.board_lock:
+            return [sq for sq in ALL_SQUARE_IDS
+                    if sq not in memory_logic.memory_board and sq not in memory_logic.matched_squares
+                    and sq != exclude]
+
+    def _remaining(self, exclude=None):
+        with memory_logic.board_lock:
+            return [sq for sq in ALL_SQUARE_IDS if sq not in memory_logic.matched_squares and sq != exclude]
+
+    def first_pick(self):
+        sq1, _ = memory_logic.find_hint_pair()
+        if sq1 and self.rng.random() < self.recall:
+            return sq1
+        candidates = self._unseen() or self._remaining()
+        return self.rng.choice(candidates) if candidates else None
+
+    def second_pick(self, first):
+        with memory_logic.board_lock:
+            partner = memory_logic.partner_of.get(first)
+        if partner and self.rng.random() < self.recall:
+            return partner
+        candidates = self._unseen(first) or self._remaining(first)
+        return self.rng.choice(candidates) if candidates else None
+
+
+class AutoplayBench:
+    def __init__(self, games=1, difficulty="hard", human_recall=0.6, seed=None, record_path=None):
+        self.games = games
+        self.record_path = record_path
+        self.difficulty = difficulty
+        self.human = ScriptedHuman(human_recall, seed)
+        self.turn = "human"
+        self.turn_started = None
+        self.first = None           # Human's revealed first card this turn
+        self.pending = {}           # square: perf_counter() of the human pick
+        self.turn_times = {"human": [], "robot": []}
+        self.reveal_latency = []
+        self.game_times = []
+        self.results = []
+
+    # ----------- Human moves ------------
+
+    def _pick(self, square):
+        if square is None:
+            return
+        self.pending[square] = time.perf_counter()
+        square_queue.put(square)
+
+    def _start_game(self):
+        square_queue.put({"event": "set_difficulty", "difficulty": self.difficulty, "audio_profile": "adult"})
+        self.game_started = time.perf_counter()
+        self._start_turn("human")
+
+    def _start_turn(self, player):
+        now = time.perf_counter()
+        if self.turn_started is not None:
+            self.turn_times[self.turn].append(now - self.turn_started)
+        self.turn, self.turn_started, self.first = player, now, None
+        if player == "human":
+            self._pick(self.human.first_pick())
+
+    # ----------- Game messages ------------
+
+    def handle(self, msg):
+        if isinstance(msg, Reveal):
+            square = msg.square
+            picked = self.pending.pop(square, None)
+            if picked is None:
+                return  # Robot pick
+            self.reveal_latency.append(time.perf_counter() - picked)
+            if self.first is None:
+                self.first = square
+                self._pick(self.human.second_pick(square))
+            else:
+                self.first = None
+        elif isinstance(msg, PlayAgain) and msg.player == "human" == self.turn:
+            # Sent after a match once the board is updated: the human plays again
+            self.first = None
+            self._pick(self.human.first_pick())
+        elif isinstance(msg, ScanFail) and self.turn == "human":
+            self.pending.pop(msg.square, None)
+            self._pick(self.human.second_pick(self.first) if self.first else self.human.first_pick())
+        elif isinstance(msg, Turn) and msg.player != self.turn and self.turn_started is not None:
+            self._start_turn(msg.player)
+        elif isinstance(msg, GameOver):
+            self._start_turn(None)
+            self.turn_started = None
+            self.game_times.append(time.perf_counter() - self.game_started)
+            self.results.append(msg)
+            print(f"[AUTOPLAY] Game {len(self.results)}/{self.games}: {msg.winner} "
+                  f"({msg.human_score}–{msg.robot_score}) in {self.game_times[-1]:.1f} s")
+        elif isinstance(msg, Reset) and self.results and len(self.results) < self.games and self.turn_started is None:
+            # Cards are back on the board and the logic is reset: next game
+            self._start_game()
+        elif isinstance(msg, Reset) and len(self.results) >= self.games:
+            return "done"
+        return None
+
+    def run(self):
+        print(f"[AUTOPLAY] {self.games} game(s), difficulty {self.difficulty}, "
+              f"human recall {self.human.recall:.0%}, time warp x{robot_backend.time_warp:g}")
+        started = time.perf_counter()
+        record = open(self.record_path, "w") if self.record_path else None
+        self._start_game()
+        while True:
+            try:
+                msg = gui_queue.get(timeout=IDLE_TIMEOUT)
+            except queue.Empty:
+                print(f"[AUTOPLAY] No game progress for {IDLE_TIMEOUT:.0f} s. Stopping.")
+                break
+            if record:
+                # Recorded in robot time, so a replay runs at the real game's pace
+                t = (time.perf_counter() - started) * robot_backend.time_warp
+                record.write(json.dumps({"t": round(t, 3), "msg": encode(msg)}) + "\n")
+            if self.handle(msg) == "done":
+                break
+        if record:
+            record.close()
+            print(f"[AUTOPLAY] GUI messages recorded to {self.record_path}")
+        self.print_report(time.perf_counter() - started)
+
+    # ----------- Report ------------
+
+    def print_report(self, elapsed):
+        warp = robot_backend.time_warp
+        def mean(values):
+            return sum(values) / len(values) if values else 0.0
+        for player, times in self.turn_times.items():
+            if times:
+                print(f"[AUTOPLAY] {player:<5} turns: {len(times)}, mean {mean(times) * warp:.1f} s "
+                      f"(max {max(times) * warp:.1f} s) in robot time")
+        if self.reveal_latency:
+            ordered = sorted(self.reveal_latency)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(f"[AUTOPLAY] Pick → reveal: mean {mean(ordered) * warp:.1f} s, p95 {p95 * warp:.1f} s "
+                  f"over {len(ordered)} human picks")
+        if self.game_times:
+            game_s = mean(self.game_times) * warp
+            print(f"[AUTOPLAY] {len(self.game_times)} game(s) in {elapsed:.1f} s wall: "
+                  f"{3600 / game_s:.1f} games/hour in robot time, "
+                  f"{len(self.game_times) * 3600 / elapsed:.1f} games/hour wall clock (x{warp:g})")
+
+
+def run_autoplay(games=1, difficulty="hard", human_recall=0.6, seed=None, record_path=None):
+    AutoplayBench(games, difficulty, human_recall, seed, record_path).run()
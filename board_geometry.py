@@ -0,0 +1,87 @@
+import math
+from config import ROWS, COLS
+
+# ---------------------- BOARD GEOMETRY ----------------------
+# The one model of the board: its size comes from config.ROWS/COLS (4×5 for the
+# recorded table, 6×6 and 8×8 work too). Squares are named row letter + column
+# number ("A1" … "H8") and listed row by row. Everything that used to spell out
+# "ABCD"/"12345" or count to 20 (GUI grid, strategy, pose lookup, stacks, game
+# over) reads it from here.
+# Squares beyond the recorded 4×5 poses get poses extrapolated from the recorded
+# grid (complete_poses), which is enough for the mock robot. The real arm refuses
+# them (robot_backend.check_board): on 6×6 column 6 lands next to stack L1 and
+# 8×8 reaches past the arm's range, so another size needs its poses recorded.
+
+ROW_LABELS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class BoardGeometry:
+    def __init__(self, rows, cols):
+        if not 0 < rows <= len(ROW_LABELS) or cols <= 0:
+            raise ValueError(f"Unsupported board size {rows}×{cols}")
+        if rows * cols % 2:
+            raise ValueError(f"A {rows}×{cols} board has an odd number of squares, so cards cannot pair up")
+        self.rows = rows
+        self.cols = cols
+        self.squares = [self.label(r, c) for r in range(rows) for c in range(cols)]
+        self.index = {sq: i for i, sq in enumerate(self.squares)}   # square: position in self.squares
+        self.size = len(self.squares)
+        self.pairs = self.size // 2
+
+    def label(self, row, col):
+        return f"{ROW_LABELS[row]}{col + 1}"
+
+    def position(self, square_id):
+        """(row, col) of a square, on this board or not (e.g. a recorded pose of a bigger one)."""
+        return ROW_LABELS.index(square_id[0]), int(square_id[1:]) - 1
+
+    def __contains__(self, square_id):
+        return square_id in self.index
+
+    # ----------- Disposal stacks ------------
+
+    def cards_per_stack(self, stacks):
+        """How many cards each of `stacks` disposal stacks takes for a full board."""
+        return math.ceil(self.size / stacks)
+
+    def stack_for(self, card_number, stacks):
+        """Stack index for the card_number-th card (0-based) put on `stacks` stacks."""
+        return min(card_number // self.cards_per_stack(stacks), stacks - 1)
+
+    # ----------- Poses ------------
+
+    def complete_poses(self, positions):
+        """
+        Adds a pose for every board square missing from `positions` (square: pose).
+        x/y follow the recorded rows and columns, the rest is copied from the closest
+        recorded square. Returns the squares that were added.
+        """
+        recorded = {self.position(sq): pose for sq, pose in positions.items()}
+        missing = [sq for sq in self.squares if sq not in positions]
+        if not missing or not recorded:
+            return []
+        rows = sorted({r for r, _ in recorded})
+        cols = sorted({c for _, c in recorded})
+
+        def pitch(axis, lines, key):
+            if len(lines) < 2:
+                return 0.0
+            first = [p[axis] for rc, p in recorded.items() if key(rc) == lines[0]]
+            last = [p[axis] for rc, p in recorded.items() if key(rc) == lines[-1]]
+            return (sum(last) / len(last) - sum(first) / len(first)) / (lines[-1] - lines[0])
+
+        dx = pitch(0, rows, lambda rc: rc[0])   # Rows run along x
+        dy = pitch(1, cols, lambda rc: rc[1])   # Columns run along y
+        x0 = sum(p[0] - r * dx for (r, _), p in recorded.items()) / len(recorded)
+        y0 = sum(p[1] - c * dy for (_, c), p in recorded.items()) / len(recorded)
+        for sq in missing:
+            r, c = self.position(sq)
+            closest = min(recorded, key=lambda rc: (abs(rc[0] - r) + abs(rc[1] - c), rc))
+            pose = list(recorded[closest])
+            pose[0], pose[1] = round(x0 + r * dx, 4), round(y0 + c * dy, 4)
+            positions[sq] = pose
+        return missing
+
+
+BOARD = BoardGeometry(ROWS, COLS)
+ALL_SQUARE_IDS = BOARD.squares
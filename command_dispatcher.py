@@ -0,0 +1,70 @@
+import queue
+import time
+import spans
+
+
+def command_type(item):
+    """Dict commands are keyed by their 'event'; plain strings are square picks."""
+    if isinstance(item, dict):
+        return item.get("event")
+    return "square"
+
+
+class CommandDispatcher:
+    """
+    Blocks on the command queue and routes each command to the handler
+    registered for its type. Records enqueue-to-execution latency per type.
+    """
+
+    def __init__(self, command_queue, poll_timeout=0.5):
+        self.command_queue = command_queue
+        self.poll_timeout = poll_timeout
+        self.handlers = {}
+        self.default_handler = None
+        self.latency = {}  # command type: {"count", "total", "max"} in seconds
+
+    def on(self, *types):
+        """Decorator registering a handler for one or more command types."""
+        def register(handler):
+            for t in types:
+                self.handlers[t] = handler
+            return handler
+        return register
+
+    def fallback(self, handler):
+        """Decorator registering the handler for unregistered command types."""
+        self.default_handler = handler
+        return handler
+
+    def dispatch_next(self):
+        """Waits up to poll_timeout for one command and runs it. Returns False on timeout."""
+        try:
+            item, enqueued_at = self.command_queue.get_entry(timeout=self.poll_timeout)
+        except queue.Empty:
+            return False
+
+        kind = command_type(item)
+        dequeued_at = time.perf_counter()
+        self._record_latency(kind, dequeued_at - enqueued_at)
+        square = item if kind == "square" else None
+        spans.record("queue_wait", enqueued_at, dequeued_at, square)
+
+        handler = self.handlers.get(kind, self.default_handler)
+        if handler is None:
+            print(f"[DISPATCH] No handler for {kind!r}. Dropping {item!r}")
+            return True
+        with spans.span(f"cmd:{kind}", square=square):
+            handler(item)
+        return True
+
+    def _record_latency(self, kind, waited):
+        stats = self.latency.setdefault(kind, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += waited
+        stats["max"] = max(stats["max"], waited)
+
+    def print_latency_report(self):
+        print("[DISPATCH] ---------- Enqueue → execution latency ----------")
+        for kind, stats in sorted(self.latency.items(), key=lambda kv: str(kv[0])):
+            mean_ms = stats["total"] / stats["count"] * 1000
+            print(f"[DISPATCH] {str(kind):<22} n={stats['count']:<4} mean={mean_ms:8.1f} ms  max={stats['max'] * 1000:8.1f} ms")
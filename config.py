@@ -3,8 +3,9 @@ STABLE_WAIT_TIME = 1.0  # Seconds card must remain stable for scan
 GRIPPER_TOOL_ID  = 1    # ID for the vacuum gripper (or custom tool)
 
 # --- GAME BOARD LAYOUT ---
+# Board size; the squares, stack capacity and GUI grid follow it (see board_geometry.py).
+# Poses are recorded for 4×5 only: other sizes extrapolate them, which only the mock robot accepts.
 ROWS, COLS       = 4, 5
-ALL_SQUARE_IDS   = [r + c for r in "ABCD" for c in "12345"]
 # CARD_BOX defines the region of interest (ROI) in the camera feed (x, y, w, h)
 CARD_BOX         = (270, 190, 190, 190)  
 
@@ -13,9 +14,29 @@ PCA_DIMS                  = 3
 # Note: These values can be changed later to adjust difficulty
 MATCH_DISTANCE_THRESHOLD  = 75  # Max distance for PCA to count as match
 MATCH_KNN_SCORE_THRESHOLD = 0.5  # Min score for KNN to count as match
+# Offsets (x, y, z, roll, pitch, yaw) tried around scan_pose when a held card cannot be read
+SCAN_PERTURBATIONS = [[0, 0, 0.01, 0, 0, 0], [0, 0, 0, 0, 0, 0.08], [0, 0, 0, 0, 0, -0.08]]
 
 # --- DIFFICULTY CONFIG ---
 DIFFICULTY_DEFAULT = "hard" # Default setting when the game starts
+# Hard-mode strategy engine objective: "turns" (fewest expected turns, shortest games)
+# or "margin" (opt-in: wins more pairs, but games take longer)
+STRATEGY_OBJECTIVE = "turns"
+
+# --- ROBOT BACKEND ---
+# "niryo" drives the real Ned over pyniryo2; "mock" uses the simulated arm and camera in mock_robot.py
+ROBOT_BACKEND  = "niryo"
+MOCK_TIME_WARP = 1.0    # Mock only: simulated seconds per wall-clock second
+MOCK_DECK_DIR  = None   # Folder of recorded card photos (one per pair), or None for the synthetic deck
+# Mock motion-time model: per-segment overhead plus the slowest joint group
+MOCK_MOTION = {
+    "overhead":         0.35,  # s, planning + settle per move_pose()
+    "base_speed":       1.0,   # rad/s, base rotation
+    "reach_speed":      0.12,  # m/s, shoulder/elbow reach and height change
+    "wrist_speed":      2.0,   # rad/s, wrist rotation
+    "tool_time":        0.4,   # s per grasp/release
+    "calibration_time": 20.0,  # s for calibrate_auto()
+}
 
 SOUND_FOLDER = "sounds/chocolate/"
 
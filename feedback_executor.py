@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+from robot_interface import get_robot, start_robot_led
+from user_feedback import play_sound
+
+# ---------------------- FEEDBACK EXECUTOR ----------------------
+# LED patterns and sound cues are fire-and-forget jobs for a dedicated worker, so
+# game logic and arm motion never wait for a snake animation or a 2 s red hold.
+# Only the newest LED pattern matters: a pattern that has not started yet is
+# replaced, and one that is still showing is cut short by the next one.
+
+
+class FeedbackExecutor:
+    def __init__(self, max_pending_sounds=4):
+        self._cond = threading.Condition()
+        self._pending_led = None
+        self._sounds = deque(maxlen=max_pending_sounds)  # Oldest cues are dropped under a burst
+        self._led_off_at = None   # perf_counter deadline for turning the current pattern off
+        self._thread = None
+        self._reset_turn_stats()
+
+    def _reset_turn_stats(self):
+        self.turn_stats = {"led_jobs": 0, "sound_jobs": 0, "superseded": 0,
+                           "worker_time": 0.0, "display_time": 0.0}
+
+    # ----------- Producer API (never blocks) ------------
+
+    def show_led(self, state):
+        with self._cond:
+            if self._pending_led is not None:
+                self.turn_stats["superseded"] += 1
+            self._pending_led = state
+            self._ensure_worker()
+            self._cond.notify()
+
+    def play_sound(self, category):
+        with self._cond:
+            self._sounds.append(category)
+            self._ensure_worker()
+            self._cond.notify()
+
+    def report_turn(self, player):
+        """Prints and resets the feedback time accumulated during `player`'s turn."""
+        with self._cond:
+            stats = self.turn_stats
+            self._reset_turn_stats()
+        print(f"[FEEDBACK] {player} turn: {stats['led_jobs']} LED / {stats['sound_jobs']} sound jobs, "
+              f"{stats['superseded']} superseded, worker {stats['worker_time'] * 1000:.0f} ms, "
+              f"LED display {stats['display_time']:.2f} s (off the robot thread)")
+        return stats
+
+    # ----------- Worker ------------
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="feedback", daemon=True)
+            self._thread.start()
+
+    def _next_job(self):
+        """Waits for a job or for the current LED pattern to expire. Called with the lock held."""
+        while True:
+            if self._sounds:
+                return "sound", self._sounds.popleft()
+            if self._pending_led is not None:
+                state, self._pending_led = self._pending_led, None
+                return "led", state
+            if self._led_off_at is not None:
+                remaining = self._led_off_at - time.perf_counter()
+                if remaining <= 0:
+                    return "led_off", None
+                self._cond.wait(remaining)
+            else:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                kind, payload = self._next_job()
+                if kind in ("led", "led_off"):
+                    if self._led_off_at is not None:
+                        # Superseded mid-display: only count the part that was shown
+                        self.turn_stats["display_time"] -= max(0.0, self._led_off_at - time.perf_counter())
+                    self._led_off_at = None
+            started = time.perf_counter()
+            try:
+                if kind == "sound":
+                    play_sound(payload)
+                elif kind == "led":
+                    hold = start_robot_led(get_robot(), payload)
+                    if hold is not None:
+                        with self._cond:
+                            self._led_off_at = time.perf_counter() + hold
+                            self.turn_stats["display_time"] += hold
+                else:
+                    get_robot().led_ring.turn_off()
+            except Exception as e:
+                print(f"[FEEDBACK] {kind} job failed for {payload!r}: {e}")
+            with self._cond:
+                self.turn_stats["worker_time"] += time.perf_counter() - started
+                if kind == "sound":
+                    self.turn_stats["sound_jobs"] += 1
+                elif kind == "led":
+                    self.turn_stats["led_jobs"] += 1
+
+
+feedback = FeedbackExecutor()
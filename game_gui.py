@@ -1,8 +1,15 @@
-import sys, queue, pygame, random
+import os, sys, time, queue, pygame, random, threading
+from collections import OrderedDict
 from enum import Enum, auto
 from typing import Dict, List, Optional
 from memory_queues import square_queue, gui_queue
-from user_feedback import play_sound
+from gui_events import (Reveal, Matched, FlipBack, Reset, Turn, Score, GameOver, GotoIntro,
+                        HintFlash, ScreenMessage, RobotStatus, TurnProfile, CacheBust, coalesce)
+from user_feedback import play_sound, init_audio_async, set_audio_profile, sound_summary
+from startup import startup_stage, mark_ready
+from spans import traced
+from asset_manager import AssetManager
+from board_geometry import BOARD
 
 # ─────────────── 1. New Color Palette & Theme ───────────────
 NIRYO_BLUE = (0, 150, 214)
@@ -29,7 +36,7 @@ WINDOW_W, WINDOW_H = 1280, 800 # Default window size
 SIDEBAR_WIDTH = 320 # Space for the dashboard
 GRID_PADDING = 40   # Padding around the card grid
 BTN_W, BTN_H = 200, 50
-ROWS, COLS = 4, 5
+ROWS, COLS = BOARD.rows, BOARD.cols
 FPS = 60
 HINT_FLASH_END = pygame.USEREVENT + 3 # Choose a new unique event ID
 MESSAGE_TIMER_EVENT = pygame.USEREVENT + 4 # New unique event ID
@@ -37,6 +44,7 @@ ROBOT_STATUS_EVENT = pygame.USEREVENT + 5
 btn_hint = pygame.Rect(0,0,0,0) # Define globally
 temporary_message = "" # Stores the message text
 robot_status_message = ""
+turn_profile_lines = []  # Latency breakdown of the last turn (see spans.py)
 RESET_DESTINATION = "game" # Default reset destination
 
 # Define the button rect near the bottom of the sidebar
@@ -46,7 +54,7 @@ BTN_W, BTN_H = 200, 50
 
 # Place the Hint button slightly higher than the existing buttons
 btn_hint = pygame.Rect( (SIDEBAR_WIDTH - BTN_W) // 2, WINDOW_H - BTN_H - 240, BTN_W, BTN_H)
-ALL_SQUARE_IDS = [r + c for r in "ABCD" for c in "12345"]
+ALL_SQUARE_IDS = BOARD.squares
 
 class CellState(Enum):
     BACK = auto()
@@ -75,8 +83,7 @@ confetti_particles = []
 
 # --- Core State Variables ---
 cell_state: Dict[str, CellState] = {}
-cell_image: Dict[str, pygame.Surface] = {}
-ICON_CACHE: Dict[str, pygame.Surface] = {}
+cell_image: Dict[str, str] = {}   # square: image path of the revealed card (surfaces come from `assets`)
 score_human, score_robot = 0, 0
 current_turn = "human"
 recent_clicks: List[str] = []
@@ -96,29 +103,65 @@ INTRO_SOUND_EVENT = pygame.USEREVENT + 2
 SELECT_LEVEL_SOUND_EVENT = pygame.USEREVENT + 3
 squares_to_flip_back: List[str] = []
 
+# ─────────────── Headless Mode ───────────────
+# Under SDL's dummy video driver (gui_profiler.py, autoplay) there is no pointer: the
+# mouse position is whatever the script last set in headless_mouse_pos, and system
+# cursors, which the dummy driver cannot create, are skipped.
+HEADLESS = os.environ.get("SDL_VIDEODRIVER") == "dummy"
+headless_mouse_pos = (0, 0)
+
+def get_mouse_pos():
+    return headless_mouse_pos if HEADLESS else pygame.mouse.get_pos()
+
+def set_cursor(cursor) -> None:
+    if not HEADLESS:
+        pygame.mouse.set_cursor(cursor)
+
 # ─────────────── Pygame Setup ───────────────
-pygame.init()
-pygame.mixer.init()
+# Only the subsystems needed for the first frame are started here. The mixer and the
+# card-back image come up on background threads so the window appears immediately.
+with startup_stage("gui: display + font init"):
+    pygame.display.init()
+    pygame.font.init()
+    pygame.time.wait(0)  # Starts SDL's timer so get_ticks() counts from here
+init_audio_async()
 
 # --- MODIFICATION FOR RESIZABLE WINDOW ---
-screen = pygame.display.set_mode((WINDOW_W, WINDOW_H), pygame.RESIZABLE)
+with startup_stage("gui: open window"):
+    screen = pygame.display.set_mode((WINDOW_W, WINDOW_H), pygame.RESIZABLE)
 
 pygame.display.set_caption("Niryo Memory Match – GUI")
 clock = pygame.time.Clock()
 
 # ─────────────── 3. Improved Typography ───────────────
-try:
-    font_main = pygame.font.SysFont("Arial", 24)
-    font_title = pygame.font.SysFont("Arial", 36, bold=True)
-    font_banner = pygame.font.SysFont("Arial", 48, bold=True)
-    font_status = pygame.font.SysFont("Arial", 32, bold=True)
-except:
-    font_main = pygame.font.SysFont("sans-serif", 24)
-    font_title = pygame.font.SysFont("sans-serif", 36, bold=True)
-    font_banner = pygame.font.SysFont("sans-serif", 48, bold=True)
-    font_status = pygame.font.SysFont("sans-serif", 32, bold=True)
-
-MEMORY_BACK = pygame.image.load("memory.PNG").convert_alpha()
+with startup_stage("gui: load fonts"):
+    try:
+        font_main = pygame.font.SysFont("Arial", 24)
+        font_title = pygame.font.SysFont("Arial", 36, bold=True)
+        font_banner = pygame.font.SysFont("Arial", 48, bold=True)
+        font_status = pygame.font.SysFont("Arial", 32, bold=True)
+        font_small = pygame.font.SysFont("Arial", 16)
+    except:
+        font_main = pygame.font.SysFont("sans-serif", 24)
+        font_title = pygame.font.SysFont("sans-serif", 36, bold=True)
+        font_banner = pygame.font.SysFont("sans-serif", 48, bold=True)
+        font_status = pygame.font.SysFont("sans-serif", 32, bold=True)
+        font_small = pygame.font.SysFont("sans-serif", 16)
+
+# Card images (the 2.7 MB card back and every scanned card) are decoded and scaled
+# on the asset manager's worker thread; the back starts decoding right away.
+CARD_BACK_PATH = "memory.PNG"
+assets = AssetManager()
+assets.preload(CARD_BACK_PATH, stage="gui: decode memory.PNG")
+
+def icon_size():
+    """Size of a revealed card image in the current layout."""
+    return (CELL_W - 24, CELL_H - 24)
+
+def card_face(lbl: str) -> Optional[pygame.Surface]:
+    """The revealed image of a cell, or None while it is still loading."""
+    path = cell_image.get(lbl)
+    return assets.get(path, icon_size()) if path else None
 
 # --- Layout variables (will be calculated in reset_gui_state) ---
 CELL_W, CELL_H = 0, 0
@@ -126,6 +169,179 @@ GRID_X, GRID_Y = 0, 0
 btn_restart, btn_quit, btn_back = pygame.Rect(0,0,0,0), pygame.Rect(0,0,0,0), pygame.Rect(0,0,0,0)
 grid_rects: Dict[str, pygame.Rect] = {}
 
+# ─────────────── Render Asset Cache ───────────────
+# Everything draw_board() puts on a card (shadowed card base, scaled card back, hover
+# tint, match/mismatch borders) is rendered once per layout into one atlas surface and
+# blitted from there, instead of smoothscaling the card back for every face-down cell
+# on every frame. Rebuilt by reset_gui_state(), i.e. on start, restart and VIDEORESIZE.
+ATLAS_SLOTS = ("card", "back", "hover", "match", "mismatch")
+card_atlas: Optional[pygame.Surface] = None
+atlas_rects: Dict[str, pygame.Rect] = {}   # slot: area of card_atlas
+atlas_has_back = False                     # False until memory.PNG is decoded
+overlay_cache: Dict[tuple, pygame.Surface] = {}  # (size, rgba): full-window tint
+
+def build_card_atlas(card_size) -> None:
+    """Renders every card slot at `card_size` (the inner card rect) into card_atlas."""
+    global card_atlas, atlas_has_back
+    w, h = max(1, card_size[0]), max(1, card_size[1])
+    atlas_rects.clear()
+    x = 0
+    for slot in ATLAS_SLOTS:
+        # The card base includes its drop shadow, 4 px down and right
+        slot_w, slot_h = (w + 4, h + 4) if slot == "card" else (w, h)
+        atlas_rects[slot] = pygame.Rect(x, 0, slot_w, slot_h)
+        x += slot_w
+    card_atlas = pygame.Surface((x, h + 4), pygame.SRCALPHA)
+    card_atlas.fill((0, 0, 0, 0))
+
+    card = atlas_rects["card"]
+    pygame.draw.rect(card_atlas, BUTTON_SHADOW, pygame.Rect(card.x + 4, 4, w, h), border_radius=8)
+    pygame.draw.rect(card_atlas, CARD_BG, pygame.Rect(card.x, 0, w, h), border_radius=8)
+    card_atlas.fill((255, 255, 255, 90), atlas_rects["hover"])
+    pygame.draw.rect(card_atlas, MATCH_BORDER, atlas_rects["match"], 5, border_radius=8)
+    pygame.draw.rect(card_atlas, MISMATCH_BORDER, atlas_rects["mismatch"], 5, border_radius=8)
+    atlas_has_back = False
+    fill_atlas_back()
+
+def fill_atlas_back() -> bool:
+    """Copies the card back into its slot once it is scaled. Returns whether it is there."""
+    global atlas_has_back
+    if not atlas_has_back and card_atlas is not None:
+        slot = atlas_rects["back"]
+        back = assets.get(CARD_BACK_PATH, slot.size, fallback=False)
+        if back is not None:
+            # The slot is fully transparent, so an additive blit copies the pixels, alpha included
+            card_atlas.blit(back, slot, special_flags=pygame.BLEND_RGBA_ADD)
+            atlas_has_back = True
+    return atlas_has_back
+
+# ─────────────── Dirty-Rectangle Rendering ───────────────
+# draw_board() keeps the signature of each screen region (the sidebar and every
+# cell) from the last frame and repaints only the ones that changed, which are then
+# pushed with display.update(rects). While the robot moves most frames change
+# nothing and are skipped entirely. reset_gui_state() forces a full redraw.
+RENDER_REPORT_MS = 60000  # How often render statistics are printed
+full_redraw = True
+region_signatures: Dict[str, tuple] = {}
+render_stats = {"full": 0, "partial": 0, "skipped": 0, "cpu": 0.0, "since": 0}
+
+# ─────────────── Robot Message Pump ───────────────
+# gui_queue is drained once per frame by pump_robot_msgs(). The batch is coalesced
+# (gui_events.coalesce) and handled within a time budget, so a burst of messages
+# never stalls a frame; the rest carries over to the next one.
+GUI_MSG_BATCH = 64
+GUI_MSG_BUDGET_MS = 4
+pending_robot_msgs: List = []
+gui_msg_stats = {"received": 0, "dropped": 0, "deferred": 0}
+
+# ─────────────── Adaptive Frame Pacing ───────────────
+# The loops run at FPS only while something moves (typewriter text, confetti, a
+# repainted region) and for ACTIVE_LINGER_MS after any input event or robot message.
+# Otherwise they sleep in pygame.event.wait() for up to 1/IDLE_FPS s and wake at once
+# on input, on pygame timers and on gui_queue messages (gui_queue.on_put posts
+# GUI_WAKE_EVENT), so a static screen during a scan costs almost no CPU.
+IDLE_FPS = 4
+ACTIVE_LINGER_MS = 500
+GUI_WAKE_EVENT = pygame.USEREVENT + 6
+active_until = 0
+wake_pending = threading.Event()
+pacing_stats = {"active": 0, "idle": 0}
+
+def wake_gui() -> None:
+    """gui_queue.on_put hook, called on the sending thread: wakes an idle GUI loop."""
+    if not wake_pending.is_set():
+        wake_pending.set()
+        try:
+            pygame.event.post(pygame.event.Event(GUI_WAKE_EVENT))
+        except pygame.error:
+            pass  # Display already closed (shutting down)
+
+def pace_frame(busy: bool, deadline_ms: Optional[int] = None) -> None:
+    """
+    Ends a frame: clock.tick(FPS) while busy (or lingering after it), otherwise waits
+    for the next event, at most until deadline_ms (a get_ticks() time) or 1/IDLE_FPS s.
+    """
+    global active_until
+    now = pygame.time.get_ticks()
+    if busy:
+        active_until = now + ACTIVE_LINGER_MS
+    if now < active_until:
+        pacing_stats["active"] += 1
+        clock.tick(FPS)
+        return
+    pacing_stats["idle"] += 1
+    timeout = 1000 // IDLE_FPS
+    if deadline_ms is not None:
+        timeout = min(timeout, deadline_ms - now)
+    if timeout > 0:
+        ev = pygame.event.wait(timeout)
+        if ev.type != pygame.NOEVENT:
+            pygame.event.post(ev)  # Put back for the frame loop to handle
+    clock.tick()
+
+def blit_atlas(slot: str, pos) -> None:
+    screen.blit(card_atlas, pos, atlas_rects[slot])
+
+def get_overlay(rgba) -> pygame.Surface:
+    """A window-sized translucent tint, allocated once per window size and colour."""
+    key = ((WINDOW_W, WINDOW_H), rgba)
+    if key not in overlay_cache:
+        overlay_cache.clear()
+        overlay = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
+        overlay.fill(rgba)
+        overlay_cache[key] = overlay
+    return overlay_cache[key]
+
+# ─────────────── Text Render Cache ───────────────
+# font.render() rasterises the whole string on every call. Rendered text is kept in a
+# bounded LRU keyed by (font, text, colour), so steady-state frames only blit.
+# Typewriter texts are rendered once at full length, and each visible prefix is that
+# surface cropped at the prefix's advance width (font.size() measures, it does not
+# rasterise).
+TEXT_CACHE_SIZE = 256
+text_cache: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+prefix_width_cache: "OrderedDict[tuple, List[int]]" = OrderedDict()  # (font, text): width per prefix length
+text_cache_stats = {"hits": 0, "misses": 0}
+
+def lru_put(cache: OrderedDict, key, value) -> None:
+    cache[key] = value
+    if len(cache) > TEXT_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def render_text(font, text: str, color) -> pygame.Surface:
+    """font.render(text, True, color), rasterised once per (font, text, colour)."""
+    key = (font, text, color)
+    surf = text_cache.get(key)
+    if surf is not None:
+        text_cache.move_to_end(key)
+        text_cache_stats["hits"] += 1
+        return surf
+    text_cache_stats["misses"] += 1
+    surf = font.render(text, True, color)
+    lru_put(text_cache, key, surf)
+    return surf
+
+def render_prefix(font, full_text: str, visible_chars: int, color) -> pygame.Surface:
+    """The first `visible_chars` characters of full_text, cropped from its cached full rendering."""
+    full = render_text(font, full_text, color)
+    if visible_chars >= len(full_text):
+        return full
+    key = (font, full_text)
+    widths = prefix_width_cache.get(key)
+    if widths is None:
+        widths = [font.size(full_text[:i])[0] for i in range(len(full_text) + 1)]
+        lru_put(prefix_width_cache, key, widths)
+    else:
+        prefix_width_cache.move_to_end(key)
+    return full.subsurface((0, 0, min(widths[visible_chars], full.get_width()), full.get_height()))
+
+def render_typewriter(key: str, font, color) -> pygame.Surface:
+    """The visible part of typewriter animation `key`."""
+    state = animation_states.get(key)
+    if state is None:
+        return render_text(font, "", color)
+    return render_prefix(font, state['full_text'], state['visible_chars'], color)
+
 # ─────────────── Animation Helper Functions ───────────────
 
 def start_typewriter_animation(key, text):
@@ -137,28 +353,38 @@ def start_typewriter_animation(key, text):
         'visible_text': ''
     }
 
-def update_typewriter_animations():
+def set_typewriter_text(key, text):
+    """Starts typing `text`, unless `key` already shows (or is typing) exactly that."""
+    if animation_states.get(key, {}).get('full_text') != text:
+        start_typewriter_animation(key, text)
+
+def update_typewriter_animations() -> bool:
+    """Advances the animations. Returns whether any of them is still typing."""
     global animation_states
     now = pygame.time.get_ticks()
+    typing = False
     for state in animation_states.values():
         full_text = state['full_text']
         if state['visible_chars'] < len(full_text):
             if now - state['last_update'] > TYPEWRITER_SPEED:
                 state['visible_chars'] += 1
                 state['last_update'] = now
+            typing = True
         state['visible_text'] = full_text[:state['visible_chars']]
+    return typing
 
 # ─────────────── Helper Functions ───────────────
 
 def reset_gui_state():
     """Reset entire GUI state and recalc layout."""
     global score_human, score_robot, current_turn
-    global cell_state, recent_clicks, cell_image, ICON_CACHE, squares_to_flip_back
+    global cell_state, recent_clicks, cell_image, squares_to_flip_back
     global game_phase, winner_message
     global CELL_W, CELL_H, GRID_X, GRID_Y
     global grid_rects, btn_restart, btn_quit, btn_back, WINDOW_W, WINDOW_H
     global robot_status_message
     global RESET_DESTINATION
+    global full_redraw
     
 
     
@@ -170,8 +396,7 @@ def reset_gui_state():
     game_phase, winner_message = "playing", ""
     score_human, score_robot, current_turn = 0, 0, "human"
     recent_clicks.clear()
-    cell_image.clear()
-    ICON_CACHE.clear() # Clear the icon cache to force recreation of scaled images
+    cell_image.clear()  # Scaled images stay in `assets`: after a resize they are rescaled as cells ask for them
     squares_to_flip_back.clear()
 
     start_typewriter_animation("robot_status", "System Ready")
@@ -205,9 +430,11 @@ def reset_gui_state():
     grid_rects.clear()
     for r in range(ROWS):
         for c in range(COLS):
-            lbl = f"{chr(65+r)}{c+1}"
+            lbl = BOARD.label(r, c)
             rect = pygame.Rect(GRID_X + c*CELL_W, GRID_Y + r*CELL_H, CELL_W, CELL_H)
             grid_rects[lbl] = rect
+    build_card_atlas((CELL_W - 12, CELL_H - 12))
+    full_redraw = True
 
     btn_restart = pygame.Rect( (SIDEBAR_WIDTH - BTN_W) // 2, WINDOW_H - BTN_H - 100, BTN_W, BTN_H)
     btn_back = pygame.Rect( (SIDEBAR_WIDTH - BTN_W) // 2, WINDOW_H - BTN_H - 170, BTN_W, BTN_H)
@@ -219,44 +446,50 @@ def hit_test(pos) -> Optional[str]:
         if rect.collidepoint(pos): return lbl
     return None
 
-def draw_board(hover_lbl: Optional[str], mouse_pos):
-    # Ensure temporary_message is declared globally in the file
-    global difficulty, temporary_message
-    
-    screen.fill(BACKGROUND_COLOR)
+def sidebar_signature(mouse_pos) -> tuple:
+    """Everything the sidebar shows; it is repainted only when this changes."""
+    texts = tuple(animation_states.get(key, {}).get("visible_text", "")
+                  for key in ("title", "banner", "score_human", "score_robot", "difficulty", "robot_status"))
+    hovered = tuple(rect.collidepoint(mouse_pos) for rect in (btn_hint, btn_restart, btn_back))
+    return texts, tuple(turn_profile_lines), difficulty, hovered
+
+def cell_signature(lbl: str, hover_lbl: Optional[str], has_back: bool) -> tuple:
+    return (cell_state[lbl], has_back, lbl in recent_clicks, lbl == hover_lbl,
+            card_face(lbl), lbl in squares_to_flip_back)
+
+def draw_sidebar(mouse_pos):
+    global difficulty
 
     sidebar_rect = pygame.Rect(0, 0, SIDEBAR_WIDTH, WINDOW_H)
     pygame.draw.rect(screen, (255, 255, 255), sidebar_rect)
     pygame.draw.line(screen, (220, 220, 220), (SIDEBAR_WIDTH, 0), (SIDEBAR_WIDTH, WINDOW_H), 2)
 
-    title_text = animation_states.get("title", {}).get("visible_text", "")
-    banner_text = animation_states.get("banner", {}).get("visible_text", "")
-    sh_text = animation_states.get("score_human", {}).get("visible_text", "")
-    sr_text = animation_states.get("score_robot", {}).get("visible_text", "")
-    diff_text = animation_states.get("difficulty", {}).get("visible_text", "")
-
-    title_surf = font_title.render(title_text, True, TEXT_DARK)
+    title_surf = render_typewriter("title", font_title, TEXT_DARK)
     screen.blit(title_surf, ( (SIDEBAR_WIDTH - title_surf.get_width()) // 2, 50) )
 
-    banner_surf = font_banner.render(banner_text, True, NIRYO_BLUE)
+    banner_surf = render_typewriter("banner", font_banner, NIRYO_BLUE)
     screen.blit(banner_surf, ( (SIDEBAR_WIDTH - banner_surf.get_width()) // 2, 150) )
 
     score_y_start = 290
-    human_score_surf = font_title.render(sh_text, True, TEXT_DARK)
-    robot_score_surf = font_title.render(sr_text, True, TEXT_DARK)
+    human_score_surf = render_typewriter("score_human", font_title, TEXT_DARK)
+    robot_score_surf = render_typewriter("score_robot", font_title, TEXT_DARK)
     screen.blit(human_score_surf, ( (SIDEBAR_WIDTH - human_score_surf.get_width()) // 2, score_y_start) )
     screen.blit(robot_score_surf, ( (SIDEBAR_WIDTH - robot_score_surf.get_width()) // 2, score_y_start + 60) )
 
-    diff_surf = font_main.render(diff_text, True, TEXT_LIGHT)
+    diff_surf = render_typewriter("difficulty", font_main, TEXT_LIGHT)
     screen.blit(diff_surf, ( (SIDEBAR_WIDTH - diff_surf.get_width()) // 2, score_y_start + 120) )
-    status_text = animation_states.get("robot_status", {}).get("visible_text", "")
     STATUS_COLOR=(0,180,180)
-    status_surf = font_status.render(status_text, True, STATUS_COLOR) # Use NIRYO_BLUE for a clear status
+    status_surf = render_typewriter("robot_status", font_status, STATUS_COLOR) # Use NIRYO_BLUE for a clear status
     
     # Position the status below difficulty, centered
     status_y_start = score_y_start + 180 
     screen.blit(status_surf, ( (SIDEBAR_WIDTH - status_surf.get_width()) // 2, status_y_start) )
     # --- END NEW DRAW ---
+
+    # --- LAST TURN LATENCY BREAKDOWN (below the Restart button) ---
+    for i, line in enumerate(turn_profile_lines):
+        line_surf = render_text(font_small, line, TEXT_LIGHT)
+        screen.blit(line_surf, (20, WINDOW_H - 95 + i * 18))
     
     # --- DRAW HINT BUTTON ---
     if difficulty == "easy":
@@ -271,65 +504,139 @@ def draw_board(hover_lbl: Optional[str], mouse_pos):
         pygame.draw.rect(screen, BUTTON_SHADOW, rect.move(4,4), border_radius=12)
         pygame.draw.rect(screen, btn_color, rect, border_radius=12)
         
-        text_surf = font_main.render(label, True, (255, 255, 255))
+        text_surf = render_text(font_main, label, (255, 255, 255))
         text_rect = text_surf.get_rect(center=rect.center)
         screen.blit(text_surf, text_rect)
 
-    # --- DRAW GAME GRID AND CARDS ---
-    for lbl, rect in grid_rects.items():
-        state = cell_state[lbl]
-        inner_rect = rect.inflate(-12, -12)
-        pygame.draw.rect(screen, BUTTON_SHADOW, inner_rect.move(4, 4), border_radius=8)
-        pygame.draw.rect(screen, CARD_BG, inner_rect, border_radius=8)
-
-        if state == CellState.BACK:
-            back_img = pygame.transform.smoothscale(MEMORY_BACK, (inner_rect.width, inner_rect.height))
-            screen.blit(back_img, inner_rect.topleft)
-            if lbl in recent_clicks:
-                pygame.draw.rect(screen, NIRYO_BLUE, inner_rect, 4, border_radius=8)
-            if lbl == hover_lbl:
-                hover_surface = pygame.Surface(inner_rect.size, pygame.SRCALPHA)
-                hover_surface.fill((255, 255, 255, 90))
-                screen.blit(hover_surface, inner_rect.topleft)
-        else:
-            img = cell_image.get(lbl)
-            if img:
-                img_rect = img.get_rect(center=inner_rect.center)
-                screen.blit(img, img_rect)
-
-            if state == CellState.MATCHED:
-                pygame.draw.rect(screen, MATCH_BORDER, inner_rect, 5, border_radius=8)
-            if lbl in squares_to_flip_back:
-                pygame.draw.rect(screen, MISMATCH_BORDER, inner_rect, 5, border_radius=8)
-
     # --- DRAW RESTART/BACK BUTTONS ---
     for rect, label in ((btn_restart,"Restart Game"), (btn_back, "Back")):
         is_hovered = rect.collidepoint(mouse_pos)
         btn_color = NIRYO_LIGHT_BLUE if is_hovered else NIRYO_BLUE
         pygame.draw.rect(screen, BUTTON_SHADOW, rect.move(4,4), border_radius=12)
         pygame.draw.rect(screen, btn_color, rect, border_radius=12)
-        text_surf = font_main.render(label, True, (255,255,255))
+        text_surf = render_text(font_main, label, (255,255,255))
         text_rect = text_surf.get_rect(center=rect.center)
         screen.blit(text_surf, text_rect)
-        
+
+def draw_cell(lbl: str, rect: pygame.Rect, hover_lbl: Optional[str], has_back: bool):
+    """One grid cell, from the card atlas. Stays inside `rect`."""
+    state = cell_state[lbl]
+    inner_rect = rect.inflate(-12, -12)
+    blit_atlas("card", inner_rect.topleft)
+
+    if state == CellState.BACK:
+        if has_back:
+            blit_atlas("back", inner_rect.topleft)
+        if lbl in recent_clicks:
+            pygame.draw.rect(screen, NIRYO_BLUE, inner_rect, 4, border_radius=8)
+        if lbl == hover_lbl:
+            blit_atlas("hover", inner_rect.topleft)
+    else:
+        img = card_face(lbl)
+        if img:
+            img_rect = img.get_rect(center=inner_rect.center)
+            screen.blit(img, img_rect)
+
+        if state == CellState.MATCHED:
+            blit_atlas("match", inner_rect.topleft)
+        if lbl in squares_to_flip_back:
+            blit_atlas("mismatch", inner_rect.topleft)
+
+def draw_board(hover_lbl: Optional[str], mouse_pos, full: bool = False) -> Optional[List[pygame.Rect]]:
+    """
+    Retained-mode board render. Only the regions (sidebar, single cells) whose
+    signature changed since the last frame are repainted. Returns the rects to pass
+    to display.update(), [] when nothing changed, or None after a full redraw
+    (first frame, new layout, message overlay, or `full`), which needs a flip().
+    """
+    global full_redraw
+    has_back = fill_atlas_back()
+    regions = {"sidebar": (sidebar_signature(mouse_pos), pygame.Rect(0, 0, SIDEBAR_WIDTH + 2, WINDOW_H))}
+    for lbl, rect in grid_rects.items():
+        regions[lbl] = (cell_signature(lbl, hover_lbl, has_back), rect)
+    overlay_signature = temporary_message
+
+    dirty = [key for key, (signature, _) in regions.items() if region_signatures.get(key) != signature]
+    if region_signatures.get("overlay") != overlay_signature:
+        full_redraw = True
+    elif overlay_signature and dirty:
+        full_redraw = True  # Repainting under the overlay would punch holes in it
+    region_signatures.clear()
+    region_signatures.update({key: signature for key, (signature, _) in regions.items()},
+                             overlay=overlay_signature)
+
+    if full or full_redraw:
+        full_redraw = False
+        screen.fill(BACKGROUND_COLOR)
+        draw_sidebar(mouse_pos)
+        for lbl, rect in grid_rects.items():
+            draw_cell(lbl, rect, hover_lbl, has_back)
+        draw_message_overlay()
+        return None
+
+    rects = []
+    for key in dirty:
+        rect = regions[key][1]
+        screen.set_clip(rect)
+        screen.fill(BACKGROUND_COLOR, rect)
+        if key == "sidebar":
+            draw_sidebar(mouse_pos)
+        else:
+            draw_cell(key, rect, hover_lbl, has_back)
+        rects.append(rect)
+    screen.set_clip(None)
+    return rects
+
+def draw_message_overlay():
     # ----------------------------------------------------
     # --- NEW: DRAW TEMPORARY SCREEN MESSAGE OVER EVERYTHING ---
     # ----------------------------------------------------
     if temporary_message:
-        # Create a translucent overlay
-        overlay = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
-        # Use semi-transparent black for the background of the message
-        overlay.fill((0, 0, 0, 100))
+        # Translucent overlay: semi-transparent black for the background of the message
+        overlay = get_overlay((0, 0, 0, 100))
         
         # Render the message text (use font_banner for prominence)
         # NOTE: temporary_message must be a global variable in game_gui.py
-        msg_surf = font_banner.render(temporary_message, True, (255, 255, 255))
+        msg_surf = render_text(font_banner, temporary_message, (255, 255, 255))
         msg_rect = msg_surf.get_rect(center=(WINDOW_W // 2, WINDOW_H // 2))
         
         # Draw overlay and text
         screen.blit(overlay, (0,0))
         screen.blit(msg_surf, msg_rect)
 
+def present_frame(dirty: Optional[List[pygame.Rect]], render_cpu: float) -> None:
+    """Pushes a frame to the display and keeps the render statistics."""
+    if dirty is None:
+        pygame.display.flip()
+        render_stats["full"] += 1
+    elif dirty:
+        pygame.display.update(dirty)
+        render_stats["partial"] += 1
+    else:
+        render_stats["skipped"] += 1
+    render_stats["cpu"] += render_cpu
+    now = pygame.time.get_ticks()
+    elapsed = now - render_stats["since"]
+    if elapsed >= RENDER_REPORT_MS:
+        frames = render_stats["full"] + render_stats["partial"] + render_stats["skipped"]
+        lookups = text_cache_stats["hits"] + text_cache_stats["misses"]
+        paced = pacing_stats["active"] + pacing_stats["idle"]
+        print(f"[RENDER] {frames} frames in {elapsed / 1000:.0f} s: {render_stats['full']} full, "
+              f"{render_stats['partial']} partial, {render_stats['skipped']} skipped "
+              f"({render_stats['skipped'] / max(frames, 1):.0%}). Render CPU "
+              f"{render_stats['cpu'] * 1000 / max(frames, 1):.2f} ms/frame, "
+              f"{render_stats['cpu'] * 1000 / elapsed:.1%} of one core. Text cache: "
+              f"{text_cache_stats['misses']} rasterised, {text_cache_stats['hits'] / max(lookups, 1):.0%} hits. "
+              f"Idle pacing: {pacing_stats['idle'] / max(paced, 1):.0%} of frames. Robot messages: "
+              f"{gui_msg_stats['received']} received, {gui_msg_stats['dropped']} coalesced away, "
+              f"{gui_msg_stats['deferred']} deferred to a later frame")
+        print(f"[ASSETS] {assets.summary()}")
+        print(f"[SFX] {sound_summary()}")
+        render_stats.update(full=0, partial=0, skipped=0, cpu=0.0, since=now)
+        text_cache_stats.update(hits=0, misses=0)
+        pacing_stats.update(active=0, idle=0)
+        gui_msg_stats.update(received=0, dropped=0, deferred=0)
+
 def show_intro() -> None:
     global difficulty, player_name, audio_profile, screen, WINDOW_W, WINDOW_H
     user_name = ""
@@ -362,18 +669,20 @@ def show_intro() -> None:
     difficulty_selection = None
     play_select_level_sound = True
 
+    first_frame = True
     intro_running = True
     while intro_running:
-        mp = pygame.mouse.get_pos()
+        mp = get_mouse_pos()
 
         is_hovering_button = (
             (name_entered and not profile_selected and (btn_adult.collidepoint(mp) or btn_kid.collidepoint(mp))) or
             (profile_selected and (btn_easy.collidepoint(mp) or btn_med.collidepoint(mp) or btn_hard.collidepoint(mp) or
                                    btn_place_cards.collidepoint(mp) or btn_collect_cards.collidepoint(mp)))
         )
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_HAND if is_hovering_button else pygame.SYSTEM_CURSOR_ARROW)
+        set_cursor(pygame.SYSTEM_CURSOR_HAND if is_hovering_button else pygame.SYSTEM_CURSOR_ARROW)
 
-        for ev in pygame.event.get():
+        events = pygame.event.get()
+        for ev in events:
             if ev.type == pygame.QUIT:
                 shutdown_program()
 
@@ -426,11 +735,13 @@ def show_intro() -> None:
                 elif not profile_selected:
                     if btn_adult.collidepoint(mp):
                         audio_profile = "adult"
+                        set_audio_profile(audio_profile)
                         profile_selected = True
                         play_sound("adult/description_human")
                         instruction_text = f"Hello {player_name}, select difficulty or setup board:"
                     elif btn_kid.collidepoint(mp):
                         audio_profile = "kid"
+                        set_audio_profile(audio_profile)
                         profile_selected = True
                         play_sound("kid/description_kid")
                         instruction_text = f"Hello {player_name}, select difficulty or setup board:"
@@ -484,15 +795,15 @@ def show_intro() -> None:
             cursor_visible = not cursor_visible
             last_cursor_toggle = now
 
-        title_s = font_banner.render(title_full_text[:title_visible_chars], True, NIRYO_BLUE)
+        title_s = render_prefix(font_banner, title_full_text, title_visible_chars, NIRYO_BLUE)
         screen.blit(title_s, ( (WINDOW_W - title_s.get_width()) // 2, WINDOW_H // 3 - 80) )
 
-        inst_s = font_title.render(instruction_text, True, TEXT_DARK)
+        inst_s = render_text(font_title, instruction_text, TEXT_DARK)
         screen.blit(inst_s, ( (WINDOW_W - inst_s.get_width()) // 2, WINDOW_H // 3 + 10) )
 
         if not name_entered:
             pygame.draw.rect(screen, color, input_box, 2, border_radius=8)
-            text_surface = font_title.render(user_name, True, TEXT_DARK)
+            text_surface = render_text(font_title, user_name, TEXT_DARK)
             screen.blit(text_surface, (input_box.x + 15, input_box.y + 5))
             if active and cursor_visible:
                 cursor_rect = pygame.Rect(input_box.x + 18 + text_surface.get_width(), input_box.y + 10, 3, 30)
@@ -503,7 +814,7 @@ def show_intro() -> None:
                 clr = NIRYO_LIGHT_BLUE if btn.collidepoint(mp) else NIRYO_BLUE
                 pygame.draw.rect(screen, BUTTON_SHADOW, btn.move(4, 4), border_radius=12)
                 pygame.draw.rect(screen, clr, btn, border_radius=12)
-                txt = font_main.render(label, True, (255, 255, 255))
+                txt = render_text(font_main, label, (255, 255, 255))
                 screen.blit(txt, txt.get_rect(center=btn.center))
         else:
             # Show difficulty and utility buttons
@@ -517,7 +828,7 @@ def show_intro() -> None:
                 pygame.draw.rect(screen, BUTTON_SHADOW, btn.move(4, 4), border_radius=12)
                 pygame.draw.rect(screen, clr, btn, border_radius=12)
                 text_color = TEXT_DARK if label == "Medium" else (255, 255, 255)
-                txt = font_main.render(label, True, text_color)
+                txt = render_text(font_main, label, text_color)
                 screen.blit(txt, txt.get_rect(center=btn.center))
             """"
             utility_buttons = [
@@ -532,7 +843,12 @@ def show_intro() -> None:
                 screen.blit(txt, txt.get_rect(center=btn.center))
             """
         pygame.display.flip()
-        clock.tick(FPS)
+        if first_frame:
+            mark_ready("gui")
+            first_frame = False
+        typing = title_visible_chars < len(title_full_text) or (not name_entered and inst_visible_chars < len(instruction_text))
+        blink_deadline = last_cursor_toggle + 500 if not name_entered and active else None
+        pace_frame(bool(events) or typing, blink_deadline)
     difficulty = difficulty_selection
 
 def shutdown_program():
@@ -545,95 +861,126 @@ def shutdown_program():
     pygame.quit()
     sys.exit()
 
-def handle_robot_msg(msg: dict) -> None:
+@traced("gui_msg")
+def handle_robot_msg(msg) -> None:
+    """Applies one gui_events message to the GUI state."""
     global game_phase, winner_message, temporary_message
     global current_turn, score_human, score_robot, squares_to_flip_back
-    global robot_status_message
-    global ICON_CACHE, cell_image
+    global robot_status_message, turn_profile_lines
+    global cell_image
+    global RESET_DESTINATION
 
-    status, event = msg.get("status"), msg.get("event")
-    if event == "CACHE_BUST":
-        path = msg.get("image_path")
-        if path in ICON_CACHE:
-            del ICON_CACHE[path] # Remove the old surface from the cache
-            print(f"[GUI] Cleared image cache for {path}.")
+    if isinstance(msg, CacheBust):
+        # The file was rewritten by a new scan; its Reveal follows, so start loading it now
+        assets.invalidate(msg.image_path)
+        assets.request(msg.image_path, icon_size())
 
-    if status == "reveal":
-        sq, path = msg["square"], msg["image_path"]
+    elif isinstance(msg, Reveal):
+        sq, path = msg.square, msg.image_path
         if cell_state.get(sq) != CellState.BACK:
             return
-        if path not in ICON_CACHE:
-            try:
-                surf = pygame.image.load(path).convert_alpha()
-                # Recreate the scaled image after a resize
-                ICON_CACHE[path] = pygame.transform.smoothscale(surf, (CELL_W-24, CELL_H-24))
-            except Exception as e:
-                print(f"Error loading image {path}: {e}")
-                pass
+        assets.request(path, icon_size())  # Shown as soon as the worker has it
         cell_state[sq] = CellState.FACE_UP
-        cell_image[sq] = ICON_CACHE.get(path)
+        cell_image[sq] = path
 
-    elif status == "matched":
-        for sq in msg.get("squares", []):
+    elif isinstance(msg, Matched):
+        for sq in msg.squares:
             cell_state[sq] = CellState.MATCHED
         recent_clicks.clear()
 
-    elif status in ("mismatch", "flip_back"):
-        squares_to_flip_back = msg.get("squares",[])[:]
+    elif isinstance(msg, FlipBack):
+        squares_to_flip_back = list(msg.squares)
         pygame.time.set_timer(FLIP_BACK_EVENT, 2000, loops=1)
 
-    elif status == "reset":
-        global RESET_DESTINATION
+    elif isinstance(msg, Reset):
         reset_gui_state()
         if RESET_DESTINATION == "intro":
-            global game_phase
             game_phase = "intro"
 
-    if event == "turn":
-        current_turn = msg.get("player", "human")
+    elif isinstance(msg, Turn):
+        current_turn = msg.player
         banner_text = "Your Turn" if current_turn == "human" else "Niryo's Turn"
-        start_typewriter_animation("banner", banner_text)
-    elif event == "score":
-        score_human = msg.get("human_score", score_human)
-        score_robot = msg.get("robot_score", score_robot)
-        start_typewriter_animation("score_human", f"{player_name}: {score_human}")
-        start_typewriter_animation("score_robot", f"Niryo: {score_robot}")
-    elif event == "game_over":
+        set_typewriter_text("banner", banner_text)
+
+    elif isinstance(msg, Score):
+        score_human, score_robot = msg.human, msg.robot
+        set_typewriter_text("score_human", f"{player_name}: {score_human}")
+        set_typewriter_text("score_robot", f"Niryo: {score_robot}")
+
+    elif isinstance(msg, GameOver):
         game_phase = "game_over"
-        winner_name = player_name if msg['winner'] == 'Human' else 'Niryo'
-        if msg['winner'] == 'Tie':
-             winner_message = f"It's a TIE! {msg['human_score']} points each."
+        winner_name = player_name if msg.winner == 'Human' else 'Niryo'
+        if msg.winner == 'Tie':
+             winner_message = f"It's a TIE! {msg.human_score} points each."
         else:
-             winner_message = f"{winner_name} WON! Final Score: {msg['human_score']}–{msg['robot_score']}"
-    elif event == "GOTO_INTRO":
+             winner_message = f"{winner_name} WON! Final Score: {msg.human_score}–{msg.robot_score}"
+
+    elif isinstance(msg, GotoIntro):
         game_phase = "intro"
-    if event == "HINT_FLASH":
-        squares = msg.get("squares", [])
-        
+
+    elif isinstance(msg, HintFlash):
         # 1. Flip the identified cards FACE_UP
-        for sq in squares:
+        for sq in msg.squares:
             # We must skip matched cards
             if cell_state.get(sq) != CellState.MATCHED:
                 cell_state[sq] = CellState.FACE_UP
         
         # 2. Start the timer to flip them back after 5 seconds
         pygame.time.set_timer(HINT_FLASH_END, 5000, loops=1) # 5-second flash
-    
-    if event == "SCREEN_MESSAGE":
-        temporary_message = msg.get("text", "")
-        pygame.time.set_timer(MESSAGE_TIMER_EVENT, 3000, loops=1) # Display for 3 seconds
-    if event == "SCREEN_MESSAGE_STATUS":
-        robot_status_message = msg.get("text", "")
+
+    elif isinstance(msg, ScreenMessage):
+        temporary_message = msg.text
+        pygame.time.set_timer(MESSAGE_TIMER_EVENT, msg.duration_ms, loops=1)
+
+    elif isinstance(msg, TurnProfile):
+        turn_profile_lines = list(msg.lines[:5])
+
+    elif isinstance(msg, RobotStatus):
+        robot_status_message = msg.text
         # Reset the typewriter animation with the new text
         start_typewriter_animation("robot_status", robot_status_message)
-        # Set the timer to clear it (Note: timer is set by the sender thread)
-        # We rely on the receiver's loop to execute the timer event.
+        # Cleared by ROBOT_STATUS_EVENT; a newer status restarts the timer
+        pygame.time.set_timer(ROBOT_STATUS_EVENT, msg.duration_ms, loops=1)
+
+def pump_robot_msgs() -> int:
+    """
+    Drains gui_queue for this frame: at most GUI_MSG_BATCH messages, coalesced, then
+    applied until GUI_MSG_BUDGET_MS is spent. Whatever is left over waits for the next
+    frame. Returns the number of messages applied plus those still pending.
+    """
+    deadline = time.perf_counter() + GUI_MSG_BUDGET_MS / 1000
+    batch = list(pending_robot_msgs)
+    pending_robot_msgs.clear()
+    received = 0
+    try:
+        while received < GUI_MSG_BATCH:
+            batch.append(gui_queue.get_nowait())
+            received += 1
+    except queue.Empty:
+        pass
+    if not batch:
+        return 0
+    coalesced = coalesce(batch)
+    applied = 0
+    for msg in coalesced:
+        if applied and time.perf_counter() > deadline:
+            break
+        handle_robot_msg(msg)
+        applied += 1
+    pending_robot_msgs.extend(coalesced[applied:])
+    gui_msg_stats["received"] += received
+    gui_msg_stats["dropped"] += len(batch) - len(coalesced)
+    gui_msg_stats["deferred"] += len(coalesced) - applied
+    return applied + len(pending_robot_msgs)
 
 
 def run_gui() -> None:
 
     global recent_clicks, game_phase, difficulty, screen , audio_profile
     global RESET_DESTINATION
+    global full_redraw
+    gui_queue.on_put = wake_gui
+    assets.on_ready = wake_gui
     pygame.time.set_timer(INTRO_SOUND_EVENT, 500, loops=1)
     show_intro()
 
@@ -652,21 +999,21 @@ def run_gui() -> None:
             if difficulty:
                 square_queue.put({"event": "set_difficulty", "difficulty": difficulty, "audio_profile": audio_profile})
 
-        update_typewriter_animations()
+        typing = update_typewriter_animations()
 
-        try:
-            while True: handle_robot_msg(gui_queue.get_nowait())
-        except queue.Empty:
-            pass
+        wake_pending.clear()
+        messages = pump_robot_msgs()
+        loaded = assets.pump()
 
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = get_mouse_pos()
         new_hover = hit_test(mouse_pos)
         if new_hover != hover_lbl:
             hover_lbl = new_hover
             is_clickable = hover_lbl and cell_state.get(hover_lbl) == CellState.BACK
-            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_HAND if is_clickable else pygame.SYSTEM_CURSOR_ARROW)
+            set_cursor(pygame.SYSTEM_CURSOR_HAND if is_clickable else pygame.SYSTEM_CURSOR_ARROW)
 
-        for ev in pygame.event.get():
+        events = pygame.event.get()
+        for ev in events:
             if ev.type == pygame.QUIT:
                 shutdown_program()
             
@@ -740,7 +1087,9 @@ def run_gui() -> None:
                         square_queue.put({"event": "RESTART_GAME"})
                         
 
-        draw_board(hover_lbl, mouse_pos)
+        render_started = time.thread_time()
+        # Confetti moves every frame, so the game-over screen is always fully redrawn
+        dirty = draw_board(hover_lbl, mouse_pos, full=game_phase == "game_over")
         if game_phase == "game_over":
             if not confetti_particles:  # Create confetti only once
                 for _ in range(200):  # Create 200 confetti particles
@@ -759,17 +1108,17 @@ def run_gui() -> None:
             if "winner_msg" not in animation_states or animation_states["winner_msg"]['full_text'] != winner_message:
                  start_typewriter_animation("winner_msg", winner_message)
 
-            overlay = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
-            overlay.fill((255, 255, 255, 200))
-            screen.blit(overlay, (0,0))
+            screen.blit(get_overlay((255, 255, 255, 200)), (0,0))
 
-            winner_text = animation_states.get("winner_msg", {}).get("visible_text", "")
-            wm_surf = font_banner.render(winner_text, True, TEXT_DARK)
+            wm_surf = render_typewriter("winner_msg", font_banner, TEXT_DARK)
             wm_rect = wm_surf.get_rect(center=(WINDOW_W / 2, WINDOW_H / 2 - 50))
             screen.blit(wm_surf, wm_rect)
+            # Leaving the game-over screen must repaint what the overlay covered
+            full_redraw = True
 
-        pygame.display.flip()
-        clock.tick(FPS)
+        present_frame(dirty, time.thread_time() - render_started)
+        busy = typing or game_phase == "game_over" or dirty != [] or messages > 0 or loaded > 0 or bool(events)
+        pace_frame(busy)
 
     shutdown_program()
 
@@ -0,0 +1,106 @@
+import sys
+from typing import List, NamedTuple, Tuple
+
+# ---------------------- GUI EVENT PROTOCOL ----------------------
+# Messages from the logic and robot threads to the GUI (through gui_queue). Each is
+# a small immutable NamedTuple, so they are cheap to pickle across the queue and
+# are matched by type instead of by "status"/"event" keys.
+# coalesce() shrinks a batch the GUI drained in one frame. Messages that only set
+# state (score, turn, status text, turn profile) are last-writer-wins. A repeated
+# reveal of the same card is dropped until something flips cards back.
+
+
+class Reveal(NamedTuple):
+    square: str
+    image_path: str
+
+class Matched(NamedTuple):
+    squares: Tuple[str, ...]
+
+class FlipBack(NamedTuple):
+    squares: Tuple[str, ...]
+
+class Dropped(NamedTuple):
+    square: str
+
+class ScanFail(NamedTuple):
+    square: str
+
+class Reset(NamedTuple):
+    pass
+
+class Turn(NamedTuple):
+    """The turn passed to `player`."""
+    player: str
+
+class PlayAgain(NamedTuple):
+    """`player` keeps the turn after a match; the board is up to date."""
+    player: str
+
+class Score(NamedTuple):
+    human: int
+    robot: int
+
+class GameOver(NamedTuple):
+    winner: str         # "Human", "Robot" or "Tie"
+    human_score: int
+    robot_score: int
+
+class GotoIntro(NamedTuple):
+    pass
+
+class HintFlash(NamedTuple):
+    squares: Tuple[str, ...]
+
+class ScreenMessage(NamedTuple):
+    text: str
+    duration_ms: int = 3000
+
+class RobotStatus(NamedTuple):
+    text: str
+    duration_ms: int = 10000  # The GUI clears the status after this long
+
+class TurnProfile(NamedTuple):
+    lines: Tuple[str, ...]
+
+class CacheBust(NamedTuple):
+    image_path: str
+
+
+# State setters: only the last one of a batch matters
+LAST_WRITER_WINS = (Score, Turn, RobotStatus, TurnProfile)
+
+# After these, a reveal of an already revealed square is a real new reveal
+FLIPS_CARDS_BACK = (FlipBack, Reset, HintFlash)
+
+
+def encode(msg) -> list:
+    """JSON-ready [type name, *fields], e.g. for recording a game's message stream."""
+    return [type(msg).__name__, *msg]
+
+
+def decode(data: list):
+    """Inverse of encode(). JSON turns tuples into lists, so list fields become tuples again."""
+    cls = getattr(sys.modules[__name__], data[0])
+    return cls(*(tuple(v) if isinstance(v, list) else v for v in data[1:]))
+
+
+def coalesce(batch: List) -> List:
+    """Drops the messages of a batch that a later one makes redundant. Keeps the order of the rest."""
+    last_index = {}
+    for i, msg in enumerate(batch):
+        if isinstance(msg, LAST_WRITER_WINS):
+            last_index[type(msg)] = i
+    kept = []
+    revealed = set()
+    for i, msg in enumerate(batch):
+        if isinstance(msg, LAST_WRITER_WINS) and last_index[type(msg)] != i:
+            continue
+        if isinstance(msg, Reveal):
+            if msg in revealed:
+                continue
+            revealed.add(msg)
+        elif isinstance(msg, FLIPS_CARDS_BACK):
+            revealed.clear()
+        kept.append(msg)
+    return kept
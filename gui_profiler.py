@@ -0,0 +1,322 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# ---------------------- HEADLESS GUI PROFILER ----------------------
+# Runs the real run_gui() on SDL's dummy video driver, with no window and no robot.
+# A driver thread plays a script on it: pointer moves, clicks and key presses
+# (through game_gui.headless_mouse_pos and posted pygame events) and gui_queue
+# messages. The script is either a synthetic full game or a game recorded with
+# `python main.py --mock --autoplay --record-gui FILE`.
+# Every frame is measured between two pace_frame() calls, so idle waits do not
+# count. The report gives frame-time percentiles, time spent in draw_board(),
+# handle_robot_msg(), typewriter updates and display updates, and the number of
+# surfaces allocated per frame.
+#
+#   python gui_profiler.py                     # synthetic game
+#   python gui_profiler.py game.jsonl 20       # recorded game, replayed 20x faster
+
+INTRO_NAME = "Bench"
+STEP_TIME = 0.6          # Seconds between two card flips of the synthetic game
+GAME_OVER_TIME = 4.0     # Seconds of confetti before the script quits
+PERCENTILES = (50, 90, 99)
+
+gui = None               # game_gui, imported by run_profile() once SDL is headless
+
+
+# ---------------------- SCRIPTS ----------------------
+# A script is a list of (seconds, action, value) steps, sorted by time:
+#   "move"  square label or (x, y)     "click"  square label or (x, y)
+#   "key"   (key, unicode)             "msg"    gui_events message
+#   "quit"  None
+
+def intro_script(t=0.5):
+    """Name entry, adult profile and hard difficulty, with the default window layout."""
+    import pygame
+    WINDOW_W, WINDOW_H = gui.WINDOW_W, gui.WINDOW_H
+    steps = [(t, "click", (WINDOW_W // 2, WINDOW_H // 3 + 105))]
+    for i, char in enumerate(INTRO_NAME):
+        steps.append((t + 0.3 + i * 0.1, "key", (ord(char.lower()), char)))
+    t += 0.5 + len(INTRO_NAME) * 0.1
+    steps.append((t, "key", (pygame.K_RETURN, "\r")))
+    steps.append((t + 0.8, "click", (WINDOW_W // 2 - 125, WINDOW_H // 2 + 75)))   # Adult
+    steps.append((t + 1.6, "click", (WINDOW_W // 2 + 250, WINDOW_H // 2 + 75)))   # Hard
+    return steps, t + 2.5
+
+
+def card_images(count):
+    """Distinct card faces as image files, for Reveal messages."""
+    import pygame
+    folder = tempfile.mkdtemp(prefix="gui_profiler_")
+    rng = random.Random(1)
+    paths = []
+    for i in range(count):
+        surf = pygame.Surface((160, 160))
+        surf.fill((255, 255, 255))
+        for _ in range(8):
+            color = [rng.randint(0, 255) for _ in range(3)]
+            pygame.draw.circle(surf, color, (rng.randint(20, 140), rng.randint(20, 140)), rng.randint(8, 30))
+        path = os.path.join(folder, f"card_{i}.png")
+        pygame.image.save(surf, path)
+        paths.append(path)
+    return paths
+
+
+def synthetic_game(seed=0):
+    """
+    A full game on the 20-card board: humans and robot alternate, each remembering
+    every card it saw. Messages follow the same sequence memory_logic sends.
+    """
+    from gui_events import (Reveal, Matched, FlipBack, Reset, Turn, PlayAgain, Score, GameOver,
+                            RobotStatus, TurnProfile, CacheBust)
+    rng = random.Random(seed)
+    pairs = len(gui.ALL_SQUARE_IDS) // 2
+    faces = card_images(pairs)
+    cards = [i for i in range(pairs) for _ in range(2)]
+    rng.shuffle(cards)
+    board = dict(zip(gui.ALL_SQUARE_IDS, cards))
+    seen, left = {}, set(gui.ALL_SQUARE_IDS)
+    scores = {"human": 0, "robot": 0}
+    player, turn_no = "human", 1
+
+    steps, t = intro_script()
+    steps += [(t, "msg", Reset()), (t, "msg", Turn("human"))]
+    t += 1.0
+
+    def known_pair():
+        for a in left:
+            for b in left:
+                if a < b and a in seen and b in seen and board[a] == board[b]:
+                    return a, b
+        return None
+
+    while left:
+        pair = known_pair()
+        if pair:
+            first, second = pair
+        else:
+            unseen = sorted(sq for sq in left if sq not in seen)
+            first = rng.choice(unseen)
+            partner = [sq for sq in left if sq != first and sq in seen and board[sq] == board[first]]
+            second = partner[0] if partner else rng.choice(sorted(left - {first}))
+        for square in (first, second):
+            if player == "human":
+                steps.append((t - 0.4, "move", square))
+                steps.append((t - 0.2, "click", square))
+            path = faces[board[square]]
+            steps += [(t, "msg", RobotStatus(f"Scanning {square}")), (t, "msg", CacheBust(path)),
+                      (t + 0.1, "msg", Reveal(square, path))]
+            seen[square] = board[square]
+            t += STEP_TIME
+        if board[first] == board[second]:
+            left -= {first, second}
+            scores[player] += 1
+            steps += [(t, "msg", Matched((first, second))),
+                      (t, "msg", Score(scores["human"], scores["robot"]))]
+            if left:
+                steps.append((t + 0.2, "msg", PlayAgain(player)))
+        else:
+            player = "robot" if player == "human" else "human"
+            steps += [(t, "msg", FlipBack((first, second))),
+                      (t + 0.1, "msg", TurnProfile((f"Turn {turn_no}: {2 * STEP_TIME:.1f} s", "move_pose: 0.8 s"))),
+                      (t + 0.1, "msg", Turn(player))]
+            turn_no += 1
+        t += STEP_TIME
+
+    winner = ("Human" if scores["human"] > scores["robot"] else
+              "Robot" if scores["robot"] > scores["human"] else "Tie")
+    steps.append((t, "msg", GameOver(winner, scores["human"], scores["robot"])))
+    steps.append((t + GAME_OVER_TIME, "quit", None))
+    return steps
+
+
+def recorded_game(path, speed=10.0):
+    """A game recorded by autoplay (--record-gui), replayed `speed` times faster than it was played."""
+    from gui_events import decode, Reveal, CacheBust
+    steps, t0 = intro_script()
+    stand_ins = {}
+    records = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+    # Scanned card images are deleted when a game is reset: stand in for missing ones
+    missing = sorted({r["msg"][2] for r in records if r["msg"][0] == "Reveal" and not os.path.exists(r["msg"][2])})
+    faces = card_images(len(missing)) if missing else []
+    stand_ins.update(zip(missing, faces))
+    t = t0
+    for record in records:
+        msg = decode(record["msg"])
+        if isinstance(msg, Reveal) and msg.image_path in stand_ins:
+            msg = msg._replace(image_path=stand_ins[msg.image_path])
+        elif isinstance(msg, CacheBust) and msg.image_path in stand_ins:
+            msg = msg._replace(image_path=stand_ins[msg.image_path])
+        t = t0 + record["t"] / speed
+        steps.append((t, "msg", msg))
+    steps.append((t + GAME_OVER_TIME, "quit", None))
+    return steps
+
+
+def play_script(steps):
+    """Driver thread: performs each step at its time, relative to the start of the call."""
+    import pygame
+    from memory_queues import gui_queue
+    started = time.perf_counter()
+
+    def position(value):
+        return gui.grid_rects[value].center if isinstance(value, str) else value
+
+    for at, action, value in sorted(steps, key=lambda step: step[0]):
+        delay = at - (time.perf_counter() - started)
+        if delay > 0:
+            time.sleep(delay)
+        if action == "msg":
+            gui_queue.put(value)
+        elif action == "move":
+            gui.headless_mouse_pos = position(value)
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=gui.headless_mouse_pos,
+                                                 rel=(0, 0), buttons=(0, 0, 0)))
+        elif action == "click":
+            # The pointer moves first: the frame loop reads it before handling the click
+            gui.headless_mouse_pos = position(value)
+            time.sleep(0.05)
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=gui.headless_mouse_pos, button=1))
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=gui.headless_mouse_pos, button=1))
+        elif action == "key":
+            key, char = value
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=char, mod=0, scancode=0))
+        elif action == "quit":
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+# ---------------------- INSTRUMENTATION ----------------------
+
+class _CountingFont:
+    """Stands in for a pygame Font and counts render() calls (one new surface each)."""
+
+    def __init__(self, font, profiler):
+        self._font = font
+        self._profiler = profiler
+
+    def render(self, *args, **kwargs):
+        self._profiler.current["surfaces"] += 1
+        return self._font.render(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._font, name)
+
+
+class FrameProfiler:
+    """
+    Wraps game_gui's frame functions to time them, and pygame's surface
+    constructors to count allocations. A frame ends at each pace_frame() call.
+    """
+
+    TIMED = ("draw_board", "handle_robot_msg", "update_typewriter_animations", "present_frame")
+
+    def __init__(self):
+        self.frames = []    # (work seconds, {function: seconds, "surfaces": n})
+        self.current = self._new_frame()
+        self.frame_started = time.perf_counter()
+
+    def _new_frame(self):
+        current = {name: 0.0 for name in self.TIMED}
+        current["surfaces"] = 0
+        return current
+
+    def _timed(self, name, func):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.current[name] += time.perf_counter() - started
+        return wrapper
+
+    def _counted(self, func):
+        def wrapper(*args, **kwargs):
+            self.current["surfaces"] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    def install(self):
+        import pygame
+        for name in self.TIMED:
+            setattr(gui, name, self._timed(name, getattr(gui, name)))
+        pace_frame = gui.pace_frame
+
+        def end_frame(*args, **kwargs):
+            work = time.perf_counter() - self.frame_started
+            self.frames.append((work, self.current))
+            self.current = self._new_frame()
+            pace_frame(*args, **kwargs)
+            self.frame_started = time.perf_counter()
+        gui.pace_frame = end_frame
+
+        profiler = self
+
+        class CountingSurface(pygame.Surface):
+            def __init__(self, *args, **kwargs):
+                profiler.current["surfaces"] += 1
+                super().__init__(*args, **kwargs)
+        pygame.Surface = CountingSurface
+        pygame.transform.smoothscale = self._counted(pygame.transform.smoothscale)
+        pygame.transform.scale = self._counted(pygame.transform.scale)
+        pygame.image.load = self._counted(pygame.image.load)
+        for name in ("font_main", "font_title", "font_banner", "font_status", "font_small"):
+            setattr(gui, name, _CountingFont(getattr(gui, name), self))
+
+    def report(self, wall):
+        def pct(values, p):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else 0.0
+
+        board = [(work, parts) for work, parts in self.frames if parts["draw_board"] > 0]
+        print(f"[GUIPROF] {len(self.frames)} frames in {wall:.1f} s ({len(board)} board frames)")
+        for label, frames in (("All frames", self.frames), ("Board frames", board)):
+            if not frames:
+                continue
+            works = [work * 1000 for work, _ in frames]
+            spread = ", ".join(f"p{p} {pct(works, p):.2f}" for p in PERCENTILES)
+            print(f"[GUIPROF] {label:<12} work ms: {spread}, max {max(works):.2f}, mean {sum(works) / len(works):.2f}")
+        if board:
+            n = len(board)
+            for name in self.TIMED:
+                per_frame = [parts[name] * 1000 for _, parts in board]
+                print(f"[GUIPROF]   {name:<29} mean {sum(per_frame) / n:6.3f} ms  "
+                      f"p99 {pct(per_frame, 99):6.3f} ms  total {sum(per_frame):8.1f} ms")
+        surfaces = [parts["surfaces"] for _, parts in self.frames]
+        if surfaces:
+            print(f"[GUIPROF] Surfaces allocated per frame: mean {sum(surfaces) / len(surfaces):.2f}, "
+                  f"p99 {pct(surfaces, 99)}, max {max(surfaces)}, "
+                  f"{sum(1 for s in surfaces if s == 0) / len(surfaces):.0%} of frames allocate none")
+
+
+def run_profile(record_path=None, speed=10.0):
+    global gui
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import game_gui
+    gui = game_gui
+
+    steps = recorded_game(record_path, speed) if record_path else synthetic_game()
+    profiler = FrameProfiler()
+    profiler.install()
+    print(f"[GUIPROF] Playing {'recorded game ' + record_path if record_path else 'a synthetic game'} "
+          f"({len(steps)} steps, {steps[-1][0]:.0f} s)")
+    threading.Thread(target=play_script, args=(steps,), name="gui-script", daemon=True).start()
+    started = time.perf_counter()
+    try:
+        gui.run_gui()
+    except SystemExit:
+        pass  # shutdown_program() exits after the scripted QUIT
+    profiler.report(time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    run_profile(sys.argv[1] if len(sys.argv) > 1 else None,
+                float(sys.argv[2]) if len(sys.argv) > 2 else 10.0)
@@ -1,32 +1,69 @@
+from startup import startup_stage  # First import: starts the startup clock
+import argparse
 import multiprocessing
 import threading
 
-from game_gui import run_gui
-from memory_robot import main_loop
-
 
 def start_robot():
     print("[LAUNCH] Starting robot thread")
+    # Imported here so pyniryo2, cv2 and the robot bring-up load in parallel with the GUI
+    with startup_stage("robot: import modules"):
+        from memory_robot import main_loop
     main_loop() 
 
 
 def start_gui():
     print("[LAUNCH] Starting GUI thread")
+    with startup_stage("gui: import game_gui"):
+        from game_gui import run_gui
     run_gui()
 
 
-def main():
+def start_autoplay(args):
+    print("[LAUNCH] Starting autoplay benchmark")
+    from autoplay import run_autoplay
+    run_autoplay(args.games, args.difficulty, args.human_recall, args.seed, args.record_gui)
+
+
+def main(args):
     print("[RUN_ALL] Launching Niryo Memory Game System")
+    import robot_backend
+    robot_backend.configure("mock" if args.mock else None, args.time_warp)
+    if args.trace:
+        import trace_recorder
+        trace_recorder.start(args.trace)
 
     # Start robot in background thread
-    robot_thread = threading.Thread(target=start_robot, daemon=True)
+    robot_thread = threading.Thread(target=start_robot, name="robot", daemon=True)
     robot_thread.start()
 
-    # Run GUI in main thread
+    # Run GUI (or the scripted benchmark) in main thread
     try:
-        start_gui()
+        if args.autoplay:
+            start_autoplay(args)
+        else:
+            start_gui()
     except KeyboardInterrupt:
         print("[EXIT] Keyboard interrupt. Shutting down")
+    finally:
+        if args.trace:
+            trace_recorder.stop()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Niryo memory game")
+    parser.add_argument("--mock", action="store_true", help="use the simulated robot and camera (mock_robot.py)")
+    parser.add_argument("--time-warp", type=float, help="mock only: speed-up of simulated time (default: config.py)")
+    parser.add_argument("--autoplay", action="store_true", help="play full games with a scripted human, no GUI")
+    parser.add_argument("--games", type=int, default=1, help="autoplay: number of games")
+    parser.add_argument("--difficulty", default="hard", help="autoplay: easy, medium or hard")
+    parser.add_argument("--human-recall", type=float, default=0.6, help="autoplay: chance the human uses a known pair")
+    parser.add_argument("--seed", type=int, help="autoplay: seed of the scripted human")
+    parser.add_argument("--record-gui", metavar="FILE",
+                        help="autoplay: record the GUI messages for replay with gui_profiler.py")
+    parser.add_argument("--trace", nargs="?", const="game_trace.json", metavar="FILE",
+                        help="record a Chrome/Perfetto timeline of the session (default file: game_trace.json)")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
@@ -36,5 +73,6 @@ if __name__ == "__main__":
         # This will raise if the start method has already been set, which is fine.
         pass
 
-    main()
-    
\ No newline at end of file
+    args = parse_args()
+    main(args)
+    
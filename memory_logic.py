@@ -1,35 +1,37 @@
 import numpy as np
 import time
-import random
 import threading
-from sklearn.decomposition import PCA
-import sys, queue
+import sys
 import os
 import glob
-from pyniryo2 import NiryoRobot
-from memory_queues import gui_queue, square_queue
+from memory_queues import gui_queue, square_queue, NORMAL_LANE
+from gui_events import (Reveal, Matched, FlipBack, Reset, Turn, PlayAgain, Score, GameOver,
+                        HintFlash, ScreenMessage, TurnProfile)
 from sift_utils import compute_knn_match_score
-from user_feedback import play_sound
-from robot_interface import set_robot_led
+from feedback_executor import feedback
 from config import (
     MATCH_DISTANCE_THRESHOLD,
     MATCH_KNN_SCORE_THRESHOLD,
     PCA_DIMS,
-    DIFFICULTY_DEFAULT, ROBOT_IP_ADDRESS
+    DIFFICULTY_DEFAULT,
+    STRATEGY_OBJECTIVE
 )
-from stackandunstack import dispose_card_1_on_board,dispose_card_2_held
+from pose_graph import POSE_GRAPH
+import strategy_engine
+from board_geometry import BOARD
+import spans
 
 
 # ---------------------- GLOBALS ----------------------
 DIFFICULTY = DIFFICULTY_DEFAULT
 audio_profile = "adult"  # Default audio profile
 
-robot=NiryoRobot(ROBOT_IP_ADDRESS)
-
 
 # ---------------------- GAME STATE ----------------------
 memory_board    = {}          # square_id: {mean, desc, matched}
 matched_squares = set()
+partner_of      = {}          # square_id: square holding the same card (both unmatched, both seen)
+known_pairs     = set()       # (sq1, sq2) sorted tuples of the pairs in partner_of, for O(1) hints
 game_history    = []          # Log of all moves and decisions
 
 turn_state = {
@@ -47,8 +49,8 @@ score_robot = 0
 
 
 # ---------------------- MAIN API ----------------------
- # Ensure queue is imported at the top of memory_logic.py
 
+@spans.traced()
 def register_card(square_id, mean_vec, raw_desc, image_path, debug=False):
     global memory_board, turn_state, matched_squares, current_turn, last_flipped
     global score_human, score_robot, DIFFICULTY, audio_profile
@@ -63,21 +65,15 @@ def register_card(square_id, mean_vec, raw_desc, image_path, debug=False):
             audio_profile = square_id.get("audio_profile", "adult")
             print(f"[LOGIC] Difficulty set to: {DIFFICULTY}")
             print(f"[LOGIC] Audio profile set to: {audio_profile}")
+            if not memory_board:
+                spans.begin_turn("human")  # A new game starts with the human's turn
+            board_changed()
             return {"difficulty_set": True}
 
         # NEW LOGIC FOR GET_HINT
+        # Normally answered by the square_queue query hook and never queued (see answer_hint)
         elif event == "GET_HINT":
-            sq1, sq2 = find_hint_pair()
-            if sq1 and sq2:
-                gui_queue.put({"event": "HINT_FLASH", "squares": [sq1, sq2]})
-            else:
-                gui_queue.put({
-                    "event": "SCREEN_MESSAGE",
-                    "text": "Niryo: I don't know any pairs yet!",
-                    "duration": 3000
-                })
-                print("[LOGIC] No known pairs available for hint.")
-            return {"hint_requested": True}
+            return answer_hint(square_id)
 
 
         elif event in ["RESTART_GAME", "GOTO_INTRO", "reset_game", "collect_cards", "place_cards"]:
@@ -89,20 +85,23 @@ def register_card(square_id, mean_vec, raw_desc, image_path, debug=False):
         return {"unrecognized_command": True}
 
 
-    # 1) Skip if already matched
-    if square_id in matched_squares:
-        print(f"[LOGIC] Overwriting old entry for {square_id} from previous game.")
-        memory_board.pop(square_id, None)
+    with board_lock:
+        # 1) Skip if already matched
+        if square_id in matched_squares:
+            print(f"[LOGIC] Overwriting old entry for {square_id} from previous game.")
+            memory_board.pop(square_id, None)
 
-    # 2) Save features & log
-    memory_board[square_id] = {"mean": mean_vec, "desc": raw_desc, "matched": False}
+        # 2) Save features & log
+        newly_seen = square_id not in memory_board
+        memory_board[square_id] = {"mean": mean_vec, "desc": raw_desc, "matched": False}
+        if newly_seen:
+            # A re-flipped card was already compared against everything revealed since
+            index_partner(square_id)
+    if newly_seen:
+        board_changed()
 
     # 3) Tell GUI to reveal
-    gui_queue.put({
-        "status":     "reveal",
-        "square":     square_id,
-        "image_path": image_path
-    })
+    gui_queue.put(Reveal(square_id, image_path))
     print(f"[LOGIC] Sent REVEAL → GUI for {square_id}")
 
     # 4) Track flips & log
@@ -117,37 +116,13 @@ def register_card(square_id, mean_vec, raw_desc, image_path, debug=False):
         turn_state["first_mean"]   = mean_vec
         turn_state["first_desc"]   = raw_desc
 
-        # --- NEW LOGIC: CHECK FOR IMMEDIATE ROBOT MATCH (INTERRUPT) ---
+        # --- PHASE 2 OF THE ROBOT'S TURN: choose the second pick from what was revealed ---
+        # robot_play() only commits the first pick, so there is nothing stale to discard.
         if current_turn == "robot":
-            match_found = False
-            # Iterate through all cards currently in the robot's memory
-            for sq_id, card_data in memory_board.items():
-                # Skip the card we just flipped, or any card already matched
-                if sq_id == square_id or sq_id in matched_squares:
-                    continue
-
-                # Check for a match between the current flip (square_id) and the memory card (sq_id)
-                if is_match(square_id, mean_vec, raw_desc, sq_id, card_data["mean"], card_data["desc"]):
-                    print(f"[ROBOT INTERCEPT] Found immediate match for {square_id}: {sq_id}")
-                    log_move("robot_intercept_pick", (square_id, sq_id))
-
-                    # Interruption: Enqueue the correct SECOND pick (sq_id)
-                    square_queue.put(sq_id)
-                    match_found = True
-                    break # Stop search after finding the first match
-
-            # If a match was found, the robot has a pre-planned second pick (the incorrect one)
-            # sitting in the queue. We must discard it.
-            if match_found:
-                try:
-                    # Remove the incorrect pre-planned second pick from the queue.
-                    bad_pick = square_queue.get_nowait()
-                    print(f"[ROBOT INTERCEPT] Discarded incorrect planned pick: {bad_pick}")
-                except queue.Empty:
-                    # This is fine; it just means the robot's thread was slow and hadn't
-                    # put the second pick in yet, or its strategy only returned one pick.
-                    pass
-        # --- END NEW LOGIC ---
+            second = choose_second_pick(square_id, first_was_new=newly_seen)
+            if second is not None:
+                square_queue.put(second)
+                print(f"[ROBOT PLAY] Second pick for {square_id}: {second}")
 
         return {"wait_second": True}
 
@@ -175,23 +150,27 @@ def register_card(square_id, mean_vec, raw_desc, image_path, debug=False):
     if match:
         if current_turn == "human":
             if audio_profile == "kid":
-                play_sound("kid/correct_match_kid")
+                feedback.play_sound("kid/correct_match_kid")
             else:
-                play_sound("adult/correct_match_human")
+                feedback.play_sound("adult/correct_match_human")
             score_human += 1
-            set_robot_led(robot,"MATCH_HUMAN")
+            feedback.show_led("MATCH_HUMAN")
         else:
-            play_sound(f"{audio_profile}/correct_match_robot")
+            feedback.play_sound(f"{audio_profile}/correct_match_robot")
             score_robot += 1
-            set_robot_led(robot,"MATCH_ROBOT")
-        gui_queue.put({"status":  "matched", "squares": [sq1, square_id]})
-        gui_queue.put({"event": "score", "human_score": score_human, "robot_score": score_robot})
-        dispose_card_2_held(robot,square_id)
-        dispose_card_1_on_board(robot,sq1)
-
-        matched_squares.update([sq1, square_id])
-        memory_board[sq1]["matched"]       = True
-        memory_board[square_id]["matched"] = True
+            feedback.show_led("MATCH_ROBOT")
+        gui_queue.put(Matched((sq1, square_id)))
+        gui_queue.put(Score(score_human, score_robot))
+        # The robot thread stacks both cards: the held one first, then its partner on the board
+        result["dispose"] = {"held": square_id, "on_board": sq1}
+
+        with board_lock:
+            matched_squares.update([sq1, square_id])
+            forget_partner(sq1)
+            forget_partner(square_id)
+            memory_board[sq1]["matched"]       = True
+            memory_board[square_id]["matched"] = True
+        board_changed()
         print(f"[LOGIC] Pair matched: {sq1}, {square_id} → +1 {current_turn}")
         log_move("match", (sq1, square_id))
         if is_game_over():
@@ -200,24 +179,24 @@ def register_card(square_id, mean_vec, raw_desc, image_path, debug=False):
             #sounds
             if winner == "Human":
                 if audio_profile == "kid":
-                    play_sound("kid/kid_win")
+                    feedback.play_sound("kid/kid_win")
                 else:
-                    play_sound("adult/human_win")
+                    feedback.play_sound("adult/human_win")
             elif winner == "Robot":
                 if audio_profile == "kid":
-                    play_sound("kid/robot_win")
+                    feedback.play_sound("kid/robot_win")
                 else:
-                    play_sound("adult/robot_win")
+                    feedback.play_sound("adult/robot_win")
 
             #end of sounds
-            gui_queue.put({
-                "event": "game_over",
-                "winner": winner,
-                "human_score": score_human,
-                "robot_score": score_robot
-            })
+            gui_queue.put(GameOver(winner, score_human, score_robot))
             print(f"[LOGIC] GAME OVER: {winner} wins!")
-            square_queue.put({"event": "GOTO_INTRO"})
+            feedback.report_turn(current_turn)
+            planner.print_report()
+            finish_turn(None)
+            spans.print_game_report()
+            # Normal lane: this reset must run after 'place_cards', not jump ahead of it
+            square_queue.put({"event": "GOTO_INTRO"}, lane=NORMAL_LANE)
             
         else:
             # Continue same turn (only if game is NOT over)
@@ -227,29 +206,36 @@ def register_card(square_id, mean_vec, raw_desc, image_path, debug=False):
     else:
         if current_turn == "human":
             if audio_profile == "kid":
-                play_sound("kid/wrong_match_kid")
+                feedback.play_sound("kid/wrong_match_kid")
             else:
-                play_sound("adult/wrong_match_human")
-            set_robot_led(robot,"MISMATCH_HUMAN")
+                feedback.play_sound("adult/wrong_match_human")
+            feedback.show_led("MISMATCH_HUMAN")
         else:
-            play_sound(f"{audio_profile}/wrong_match_robot")
-            set_robot_led(robot,"MISMATCH_ROBOT")
-        gui_queue.put({"status":  "flip_back", "squares": [sq1, square_id]})
+            feedback.play_sound(f"{audio_profile}/wrong_match_robot")
+            feedback.show_led("MISMATCH_ROBOT")
+        gui_queue.put(FlipBack((sq1, square_id)))
         print(f"[LOGIC] No match → FLIP_BACK {sq1},{square_id}")
         log_move("mismatch", (sq1, square_id))
+        if partner_of.get(sq1) == square_id:
+            # The index paired them, but the direct comparison says otherwise: trust the latter
+            with board_lock:
+                forget_partner(sq1)
+            board_changed()
+            print(f"[LOGIC] Dropped wrong known pair {sq1} ↔ {square_id}")
         
         square_queue.put({"event": "DROP_CURRENT_CARD", "square": square_id})
+        feedback.report_turn(current_turn)
         new_turn = switch_turn()
         if new_turn == "human":
             if audio_profile == "kid":
-                play_sound("kid/kid_turn")
+                feedback.play_sound("kid/kid_turn")
             else:
-                play_sound("adult/human_turn")
+                feedback.play_sound("adult/human_turn")
         else:
-            play_sound(f"{audio_profile}/robot_turn")
+            feedback.play_sound(f"{audio_profile}/robot_turn")
             square_queue.put({"event": "PLAN_NEXT_ROBOT_MOVE"})
         print(f"[LOGIC-OUT] Turn changed to {new_turn}. Quitting register_card.")
-        gui_queue.put({"event":  "turn", "player": new_turn})
+        gui_queue.put(Turn(new_turn))
         print(f"[LOGIC] Turn → {new_turn}")
         """
         if new_turn == "robot":
@@ -258,85 +244,186 @@ def register_card(square_id, mean_vec, raw_desc, image_path, debug=False):
     return result
 
 # ---------------------- ROBOT STRATEGY ----------------------
+# The robot's turn is planned in two phases: robot_play() commits only the first
+# pick, and choose_second_pick() decides the second one once the first card has
+# been revealed, using the partner index instead of re-scanning memory.
+# The first pick is planned speculatively in the background (see SpeculativePlanner),
+# so robot_play() normally just takes the plan for the current board.
+
+def plan_key():
+    """
+    Everything a first-pick plan depends on: the board, the difficulty, and for the
+    nearest-square tie-break the arm's location and the strategy objective.
+    """
+    return board_version, DIFFICULTY, POSE_GRAPH.location, STRATEGY_OBJECTIVE
+
+def plan_first_pick():
+    """Plans the robot's first pick for the current board. Returns (plan_key(), pick, event, data)."""
+    with board_lock:
+        key = plan_key()
+        _, difficulty, location, objective = key
+        unreadable = {sq for sq, card in memory_board.items()
+                      if card.get("mean") is None or card.get("desc") is None}
+        pick = strategy_engine.robot_first_pick(
+            difficulty, BOARD.squares, memory_board, matched_squares, partner_of, known_pairs,
+            unpaired_singletons(), location, objective, unreadable)
+    return (key,) + pick
+
+@spans.traced()
 def robot_play(debug=False):
-    global DIFFICULTY
+    """Returns the robot's first pick as a one-element list (empty if idle)."""
     print(f"[ROBOT PLAY] Planning robot move on {DIFFICULTY} difficulty...")
-    play_sound("robot_turn")
-
-    all_squares = [r + c for r in "ABCD" for c in "12345"]
-    seen = set(memory_board.keys())
-    matched = matched_squares
-
-    valid_unmatched = [
-        sq for sq in seen
-        if sq not in matched
-        and memory_board[sq].get("mean") is not None
-        and memory_board[sq].get("desc") is not None
-    ]
-
-    # --- STRATEGY 0: Confident Match (Highest Priority) ---
-    if DIFFICULTY in ["hard", "medium"]:
-        if DIFFICULTY == "medium" and random.random() < 0.5: # 50% chance to forget
-             pass
-        else:
-            for i in range(len(valid_unmatched)):
-                for j in range(i + 1, len(valid_unmatched)):
-                    sq1, sq2 = valid_unmatched[i], valid_unmatched[j]
-                    card1, card2 = memory_board[sq1], memory_board[sq2]
-
-                    if is_match(sq1, card1["mean"], card1["desc"], sq2, card2["mean"], card2["desc"]):
-                        log_move("robot_confident_pair_match", (sq1, sq2))
-                        return [sq1, sq2]
-
-    # --- STRATEGY 1: Flip unseen cards ---
-    unseen = [sq for sq in all_squares if sq not in seen]
-    if len(unseen) >= 2:
-        a, b = random.sample(unseen, 2)
-        log_move("robot_flip_unseen", (a, b))
-        return [a, b]
-    elif len(unseen) == 1:
-        a = unseen[0]
-        fallback = [sq for sq in all_squares if sq != a and sq not in matched]
-        b = random.choice(fallback) if fallback else a
-        log_move("robot_flip_unseen_and_fallback", (a, b))
-        return [a, b]
-
-    # --- STRATEGY 2: Fallback unmatched ---
-    remaining = [sq for sq in all_squares if sq not in matched]
-    if len(remaining) >= 2:
-        a, b = random.sample(remaining, 2)
-        log_move("robot_fallback", (a, b))
-        return [a, b]
-
-    # --- STRATEGY 3: Final single ---
-    if len(remaining) == 1:
-        log_move("robot_final_single", remaining[0])
-        return [remaining[0], remaining[0]]
-
-    # --- STRATEGY 4: Idle ---
-    log_move("robot_idle", None)
-    return []
+    feedback.play_sound("robot_turn")
+
+    _, pick, event, data = planner.take()
+    log_move(event, data)
+    return [pick] if pick is not None else []
+
+def choose_second_pick(first, first_was_new=True):
+    """Second pick once `first` is revealed: its known partner (O(1)), else an unseen card."""
+    with board_lock:
+        choice = strategy_engine.robot_second_pick(
+            DIFFICULTY, first, first_was_new, BOARD.squares, memory_board, matched_squares, partner_of,
+            unpaired_singletons(), POSE_GRAPH.location, STRATEGY_OBJECTIVE)
+    if choice is None:
+        return None
+    second, event = choice
+    log_move(event, (first, second))
+    return second
+
+# ---------------------- PARTNER INDEX ----------------------
+def index_partner(square_id):
+    """Compares a freshly revealed card against unpaired memory once, so later lookups are O(1)."""
+    if square_id in partner_of:
+        return
+    card = memory_board[square_id]
+    # The pending first card of this turn is compared by register_card() itself
+    candidates = [sq_id for sq_id in memory_board
+                  if not (sq_id == square_id or sq_id in matched_squares or sq_id in partner_of
+                          or sq_id == turn_state["first_square"])]
+    if card["mean"] is not None and len(candidates) > 1:
+        # Closest mean descriptor first (the distance check_match's PCA measures for two
+        # cards), so the partner is usually the first full comparison on any board size
+        means = [memory_board[sq_id]["mean"] for sq_id in candidates]
+        if all(m is not None for m in means):
+            order = np.argsort(np.linalg.norm(np.asarray(means) - card["mean"], axis=1), kind="stable")
+            candidates = [candidates[i] for i in order]
+    for sq_id in candidates:
+        other = memory_board[sq_id]
+        if is_match(square_id, card["mean"], card["desc"], sq_id, other["mean"], other["desc"]):
+            partner_of[square_id] = sq_id
+            partner_of[sq_id] = square_id
+            with pairs_lock:
+                known_pairs.add(tuple(sorted((square_id, sq_id))))
+            print(f"[LOGIC] Known pair: {square_id} ↔ {sq_id}")
+            return
+
+def unpaired_singletons():
+    """Seen, unmatched squares whose partner has not been seen yet (call with board_lock held)."""
+    return [sq for sq in memory_board if sq not in matched_squares and sq not in partner_of]
+
+def forget_partner(square_id):
+    partner = partner_of.pop(square_id, None)
+    if partner is not None and partner_of.get(partner) == square_id:
+        del partner_of[partner]
+    if partner is not None:
+        with pairs_lock:
+            known_pairs.discard(tuple(sorted((square_id, partner))))
+
+# ---------------------- SPECULATIVE PLANNER ----------------------
+# memory_board is written by the card-analysis worker and read by the planner
+# thread, so both go through board_lock. Every change that can alter the robot's
+# next move bumps board_version, which invalidates the cached plan. So does an arm
+# move (the tie-break picks the square nearest the arm): the planner re-plans in the
+# background after every segment, and a plan made from another location is a miss.
+board_lock    = threading.RLock()
+pairs_lock    = threading.Lock()  # Only guards known_pairs, so hints never wait for an index_partner() sweep
+board_version = 0
+
+def board_changed():
+    global board_version
+    with board_lock:
+        board_version += 1
+    planner.wake()
+
+
+class SpeculativePlanner:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._plan = None
+        self._thread = None
+        self.stats = {"hits": 0, "misses": 0, "plans": 0, "plan_time": 0.0,
+                      "requests": 0, "request_time": 0.0}
+
+    def _is_current(self, plan):
+        return plan is not None and plan[0] == plan_key()
+
+    def wake(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="planner", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._is_current(self._plan):
+                    self._cond.wait()
+            started = time.perf_counter()
+            plan = plan_first_pick()
+            with self._cond:
+                self._plan = plan
+                self.stats["plans"] += 1
+                self.stats["plan_time"] += time.perf_counter() - started
+
+    def take(self):
+        """Returns the plan for the current board, planning synchronously on a cache miss."""
+        started = time.perf_counter()
+        with self._cond:
+            plan = self._plan if self._is_current(self._plan) else None
+            self._plan = None  # A plan is used at most once (its random choices are per turn)
+            self._cond.notify()
+        hit = plan is not None
+        if not hit:
+            plan = plan_first_pick()
+        with self._cond:
+            self.stats["hits" if hit else "misses"] += 1
+            self.stats["requests"] += 1
+            self.stats["request_time"] += time.perf_counter() - started
+        return plan
+
+    def print_report(self):
+        with self._cond:
+            stats = dict(self.stats)
+        if stats["requests"]:
+            hit_rate = stats["hits"] / stats["requests"] * 100
+            request_ms = stats["request_time"] / stats["requests"] * 1000
+            plan_ms = stats["plan_time"] / max(1, stats["plans"]) * 1000
+            print(f"[PLANNER] {stats['hits']}/{stats['requests']} first picks from cache ({hit_rate:.0f}%), "
+                  f"robot_play() {request_ms:.2f} ms mean, {stats['plans']} background plans at {plan_ms:.2f} ms")
+
+
+planner = SpeculativePlanner()
+POSE_GRAPH.add_move_listener(planner.wake)
 
 # ---------------------- HELPERS ----------------------
+@spans.traced()
 def check_match(sq1_id, m1, d1, sq2_id, m2, d2):
+    # sklearn takes ~1 s to import, so it is only pulled in on the first comparison
+    from sklearn.decomposition import PCA
     vecs = np.array([m1, m2])
     pca  = PCA(n_components=min(PCA_DIMS, vecs.shape[0]))
     v3   = pca.fit_transform(vecs)
     dist = np.linalg.norm(v3[0] - v3[1])
     knn  = compute_knn_match_score(d1, d2)
-    print("-" * 50)
-    print(f"[COMPARE] Checking pair: {sq1_id} vs {sq2_id}")
-    print(f"[SCORE] PCA Distance: {dist:.4f} (Threshold <= {MATCH_DISTANCE_THRESHOLD})")
-    print(f"[SCORE] KNN Score:    {knn:.4f} (Threshold >= {MATCH_KNN_SCORE_THRESHOLD})")
 
+    # Called for every pair index_partner() sweeps, so results are only logged by callers
     match_pca = (dist <= MATCH_DISTANCE_THRESHOLD)
     match_knn = (knn >= MATCH_KNN_SCORE_THRESHOLD)
 
     match = match_pca or match_knn
 
-    print(f"[RESULT] Match by PCA: {match_pca}, Match by KNN: {match_knn}")
-    print(f"[RESULT] Final Match Decision: {match}")
-
     return match, dist, knn
 
 def is_match(sq1_id, m1, d1,sq2_id, m2, d2):
@@ -349,8 +436,15 @@ def is_match(sq1_id, m1, d1,sq2_id, m2, d2):
 def switch_turn():
     global current_turn
     current_turn = "robot" if current_turn == "human" else "human"
+    finish_turn(current_turn)
     return current_turn
 
+def finish_turn(next_player):
+    """Closes the turn's span summary and shows its breakdown in the GUI sidebar."""
+    summary = spans.begin_turn(next_player)
+    if summary is not None:
+        gui_queue.put(TurnProfile(tuple(spans.summary_lines(summary))))
+
 def reset_turn_state():
     turn_state["first_square"] = None
     turn_state["first_mean"]   = None
@@ -365,31 +459,22 @@ def log_move(event, data):
     })
 
 def find_hint_pair():
-    """Searches memory for the first known, unmatched pair."""
-    
-    # We use the same powerful memory logic as the robot's Strategy 0
-    valid_unmatched = [
-        sq for sq in memory_board.keys() 
-        if sq not in matched_squares
-        and memory_board[sq].get("mean") is not None
-        and memory_board[sq].get("desc") is not None
-    ]
-    
-    # Check every known, unmatched pair
-    for i in range(len(valid_unmatched)):
-        for j in range(i + 1, len(valid_unmatched)):
-            sq1, sq2 = valid_unmatched[i], valid_unmatched[j]
-            card1, card2 = memory_board[sq1], memory_board[sq2]
-            
-            # Check for confident match
-            if is_match(sq1, card1["mean"], card1["desc"], sq2, card2["mean"], card2["desc"]):
-                # Found the pair!
-                return sq1, sq2 
-
-    return None, None # No known pair found
+    """Returns any known, unmatched pair in O(1), or (None, None)."""
+    with pairs_lock:
+        return next(iter(known_pairs), (None, None))
+
+def answer_hint(msg=None):
+    """GET_HINT handler. Only reads game state, so it is safe on the GUI thread."""
+    sq1, sq2 = find_hint_pair()
+    if sq1 and sq2:
+        gui_queue.put(HintFlash((sq1, sq2)))
+    else:
+        gui_queue.put(ScreenMessage("Niryo: I don't know any pairs yet!", 3000))
+        print("[LOGIC] No known pairs available for hint.")
+    return {"hint_requested": True}
 
 def advance_to_next_turn():
-    gui_queue.put({"status": "turn", "player": current_turn})
+    gui_queue.put(PlayAgain(current_turn))
     if current_turn == "robot":
         picks = robot_play()
         for sq in picks:
@@ -398,27 +483,38 @@ def advance_to_next_turn():
 def reset_game(play_turn_sound=True): # <-- CHANGE #1: Add the argument
     global memory_board, matched_squares, current_turn, last_flipped, game_history
     global score_human, score_robot
-    memory_board.clear()
-    matched_squares.clear()
+    with board_lock:
+        memory_board.clear()
+        matched_squares.clear()
+        partner_of.clear()
+        with pairs_lock:
+            known_pairs.clear()
     last_flipped.clear()
     game_history.clear()
     reset_turn_state()
+    finish_turn(None)
+    spans.print_game_report()  # Only prints if the game was cut short
     current_turn = "human"
     score_human = 0
     score_robot = 0
+    board_changed()
     image_save_dir = "scanned_cards"
     for f in glob.glob(os.path.join(image_save_dir, "*")):
         try:
             os.remove(f)
         except OSError as e:
             print(f"[ERROR] Could not delete file {f}: {e}")
-    gui_queue.put({"status":"reset"})
-    gui_queue.put({"event":"turn","player":"human"})
+    gui_queue.put(Reset())
+    gui_queue.put(Turn("human"))
     if play_turn_sound: # <-- CHANGE #2: Add this 'if' condition
-        play_sound("human_turn")
+        feedback.play_sound("human_turn")
 
 def get_turn():
     return current_turn
 
 def is_game_over():
-    return len(matched_squares) == 20
\ No newline at end of file
+    return len(matched_squares) == BOARD.size
+
+
+# Hints bypass the robot command queue: answered immediately on the requesting thread
+square_queue.add_query_handler("GET_HINT", answer_hint)
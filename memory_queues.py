@@ -1,3 +1,154 @@
-from multiprocessing import Queue
-square_queue = Queue()
-gui_queue = Queue()
+import multiprocessing
+import multiprocessing.queues
+import queue
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+import trace_recorder
+
+# Lanes of the robot command queue, served in this order
+CONTROL_LANE = 0
+NORMAL_LANE = 1
+
+# Operator commands that jump ahead of queued square picks
+CONTROL_EVENTS = ("RESTART_GAME", "GOTO_INTRO")
+
+
+class CommandQueue:
+    """
+    Robot command queue with a priority lane for control messages.
+    Keeps the put()/get()/get_nowait()/empty() interface of queue.Queue and
+    stamps every item with its enqueue time so the dispatcher can measure latency.
+    """
+
+    def __init__(self):
+        self._lanes = {CONTROL_LANE: deque(), NORMAL_LANE: deque()}
+        self._cond = threading.Condition()
+        self._control_listeners = []
+        self._query_handlers = {}
+
+    def add_control_listener(self, listener):
+        """Calls listener(item) on the producer's thread whenever a control command is put."""
+        self._control_listeners.append(listener)
+
+    def add_query_handler(self, event, handler):
+        """
+        Answers `event` with handler(item) on the producer's thread instead of queueing it.
+        For read-only requests (e.g. GET_HINT) that must not wait behind robot motion.
+        """
+        self._query_handlers[event] = handler
+
+    def put(self, item, block=True, timeout=None, lane=None):
+        if isinstance(item, dict) and item.get("event") in self._query_handlers:
+            self._query_handlers[item["event"]](item)
+            return
+        if lane is None:
+            is_control = isinstance(item, dict) and item.get("event") in CONTROL_EVENTS
+            lane = CONTROL_LANE if is_control else NORMAL_LANE
+        enqueued_at = time.perf_counter()
+        with self._cond:
+            self._lanes[lane].append((item, enqueued_at))
+            self._cond.notify()
+        tracer = trace_recorder.recorder
+        if tracer is not None:
+            tracer.flow("s", _flow_id(enqueued_at), _label(item), "square_queue")
+        if lane == CONTROL_LANE:
+            for listener in self._control_listeners:
+                listener(item)
+
+    def get_entry(self, block=True, timeout=None):
+        """Returns (item, enqueued_at), control lane first. Raises queue.Empty."""
+        with self._cond:
+            if not self._cond.wait_for(self._has_items, timeout if block else 0):
+                raise queue.Empty
+            for lane in (CONTROL_LANE, NORMAL_LANE):
+                if self._lanes[lane]:
+                    entry = self._lanes[lane].popleft()
+                    break
+        tracer = trace_recorder.recorder
+        if tracer is not None:
+            tracer.flow("f", _flow_id(entry[1]), _label(entry[0]), "square_queue")
+        return entry
+
+    def get(self, block=True, timeout=None):
+        return self.get_entry(block, timeout)[0]
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def empty(self):
+        with self._cond:
+            return not self._has_items()
+
+    def qsize(self):
+        with self._cond:
+            return sum(len(lane) for lane in self._lanes.values())
+
+    def clear(self, before=None):
+        """Drops queued commands (only those enqueued before `before`, if given)."""
+        with self._cond:
+            dropped = 0
+            for lane in self._lanes.values():
+                kept = deque(e for e in lane if before is not None and e[1] >= before)
+                dropped += len(lane) - len(kept)
+                lane.clear()
+                lane.extend(kept)
+            return dropped
+
+    def _has_items(self):
+        return any(self._lanes.values())
+
+
+class GuiQueue(multiprocessing.queues.Queue):
+    """
+    The robot → GUI message queue. While a trace is recorded, each message
+    is wrapped with a flow id from put() to get(), so the timeline links producer and consumer.
+    on_put, when set, is called after every put() (the GUI uses it to wake from idle).
+    """
+
+    def __init__(self):
+        super().__init__(ctx=multiprocessing.get_context())
+        self.on_put = None
+
+    def put(self, obj, block=True, timeout=None):
+        tracer = trace_recorder.recorder
+        if tracer is not None:
+            flow_id = trace_recorder.next_flow_id()
+            tracer.flow("s", flow_id, _label(obj), "gui_queue")
+            obj = _Traced(flow_id, obj)
+        super().put(obj, block, timeout)
+        if self.on_put is not None:
+            self.on_put()
+
+    def get(self, block=True, timeout=None):
+        obj = super().get(block, timeout)
+        if isinstance(obj, _Traced):
+            flow_id, obj = obj
+            tracer = trace_recorder.recorder
+            if tracer is not None:
+                tracer.flow("f", flow_id, _label(obj), "gui_queue")
+        return obj
+
+
+class _Traced(NamedTuple):
+    """A gui_queue message with the flow id linking its put() and get() in the trace."""
+    flow_id: int
+    msg: object
+
+
+def _label(item):
+    if isinstance(item, dict):
+        return str(item.get("event"))
+    if isinstance(item, str):
+        return item
+    return type(item).__name__
+
+
+def _flow_id(enqueued_at):
+    # Command entries are (item, enqueued_at); the timestamp is unique enough to pair put and get
+    return int(enqueued_at * 1e9)
+
+
+square_queue = CommandQueue()
+gui_queue = GuiQueue()
@@ -1,40 +1,124 @@
-import queue
 import cv2
 import os
 import time
 import numpy as np
-import pygame
 import glob
-from game_gui import ROBOT_STATUS_EVENT
+from concurrent.futures import ThreadPoolExecutor
 from memory_queues import square_queue, gui_queue
+from gui_events import CacheBust, Dropped, ScanFail, ScreenMessage, RobotStatus
+from command_dispatcher import CommandDispatcher
 from memory_logic import register_card, reset_game,robot_play
 from sift_utils import *
 from recorded_positions import *
-from pyniryo2 import NiryoRobot, NiryoRos, Vision
-from config import ROBOT_IP_ADDRESS, STABLE_WAIT_TIME, CARD_BOX
-import pyniryo
+from config import ROBOT_IP_ADDRESS, STABLE_WAIT_TIME, CARD_BOX, SCAN_PERTURBATIONS
+import robot_backend
 from user_feedback import play_sound
-from stackandunstack import collect_cards_to_stacks, place_initial_cards
+from stackandunstack import collect_cards_to_stacks, place_initial_cards, safe_move, travel, recovery_move
+from stackandunstack import dispose_card_1_on_board, dispose_card_2_held
+from robot_tasks import ActionCancelled, check_cancelled, request_cancel, finish_cancel
+from robot_interface import get_robot
+from pose_graph import POSE_GRAPH, pick_node, clear_node
+from startup import startup_stage, mark_ready
+from spans import span, traced
 
 # -------------------- Robot Setup --------------------
 
-robot = NiryoRobot(ROBOT_IP_ADDRESS)
-robot.arm.calibrate_auto()
-robot.tool.release_with_tool()
-robot.arm.move_pose(home_pose)
+robot = None  # Shared connection, opened by init_robot() on the robot thread
+
+def init_robot():
+    """Connects to the robot, calibrates only if needed, then parks it at home."""
+    global robot
+    with startup_stage("robot: connect"):
+        robot = get_robot()
+
+    with startup_stage("robot: calibration check"):
+        try:
+            needs_calibration = robot.arm.need_calibration()
+        except Exception as e:
+            print(f"[STARTUP] Could not read calibration status ({e}). Calibrating to be safe.")
+            needs_calibration = True
+
+    if needs_calibration:
+        with startup_stage("robot: calibrate_auto"):
+            robot.arm.calibrate_auto()
+    else:
+        print("[STARTUP] Robot already calibrated. Skipping calibration.")
+
+    with startup_stage("robot: release + home"):
+        robot.tool.release_with_tool()
+        recovery_move(robot, home_pose)
+    mark_ready("robot")
 
 image_save_dir = "scanned_cards"
 os.makedirs(image_save_dir, exist_ok=True)
 is_scanning = False
 
 
-def is_at_scan_pose(current, target, tol=0.1):
+def is_at_pose(current, target, tol=0.1):
     return all(abs(c - t) < tol for c, t in zip(current[:3], target[:3]))
 
+def is_at_scan_pose(current, target, tol=0.1):
+    return is_at_pose(current, target, tol)
+
 # -------------------- Card Scanning --------------------
-def scan_card_image(square_id, max_scan_retries=3):
+_vision = None
+
+def get_vision():
+    """Camera client, created once and reused by every scan and recovery attempt."""
+    global _vision
+    if _vision is None:
+        backend = robot_backend.load()
+        ros_instance = backend.NiryoRos(ROBOT_IP_ADDRESS)
+        _vision = backend.Vision(ros_instance)
+    return _vision
+
+def grab_frame(vision):
+    """Grabs one undistorted 640x480 frame, or None on failure."""
+    img_compressed = vision.get_img_compressed()
+    if img_compressed is None:
+        print("[ERROR] Could not get compressed image.")
+        return None
+
+    backend = robot_backend.load()
+    img_uncompressed = backend.uncompress_image(img_compressed)
+    if img_uncompressed is None:
+        print("[ERROR] Failed to uncompress image.")
+        return None
+
+    camera_info = vision.get_camera_intrinsics()
+    img = backend.undistort_image(
+        img_uncompressed,
+        camera_info.intrinsics,
+        camera_info.distortion
+    )
+
+    try:
+        return cv2.resize(img, (640, 480))
+    except Exception as e:
+        print("[ERROR] cv2.resize failed:", e)
+        return None
+
+def card_in_gripper():
+    """
+    Grasp-presence check from a single frame at the scan pose.
+    pyniryo2 exposes no vacuum pressure reading, so "held" means a card outline is
+    visible in CARD_BOX. Returns None if no frame could be grabbed.
+    """
+    try:
+        frame = grab_frame(get_vision())
+    except Exception as e:
+        print(f"[ERROR] Grasp-presence check failed: {e}")
+        return None
+    if frame is None:
+        return None
+    _, box = draw_oriented_bounding_box(mask_outside_card(frame, CARD_BOX))
+    return box is not None and box.shape == (4, 2)
+
+@traced("scan")
+def scan_card_image(square_id, target=scan_pose, no_card_timeout=10.0):
+    """Capture half of a scan: returns the warped card image once it is stable, or None."""
     current_pose = [round(v, 2) for v in robot.arm.get_pose().to_list()]
-    target_pose = [round(v, 2) for v in scan_pose]
+    target_pose = [round(v, 2) for v in target]
     print(f"[DEBUG] Current pose")
     print(f"[DEBUG] Target scan pose")
 
@@ -42,37 +126,18 @@ def scan_card_image(square_id, max_scan_retries=3):
         print("[SKIP] Not at scan pose.")
         return None
 
-    ros_instance = NiryoRos("169.254.200.200")
-    vision = Vision(ros_instance)
+    vision = get_vision()
 
     print(f"[SCAN] Looking for card at {square_id}")
     last_center = stable_since = detection_time = None
     last_box_debug = 0
-    start_time = time.time()
+    start_time = robot_backend.clock()  # Robot time, so stability waits follow the mock's time warp
     
     while True:
+        check_cancelled()  # The stability wait can last up to 10 s
         try:
-            img_compressed = vision.get_img_compressed()
-            if img_compressed is None:
-                print("[ERROR] Could not get compressed image.")
-                return None
-
-            img_uncompressed = pyniryo.uncompress_image(img_compressed)
-            if img_uncompressed is None:
-                print("[ERROR] Failed to uncompress image.")
-                return None
-
-            camera_info = vision.get_camera_intrinsics()
-            img = pyniryo.undistort_image(
-                img_uncompressed,
-                camera_info.intrinsics,
-                camera_info.distortion
-            )
-          
-            try:
-                frame_resized = cv2.resize(img, (640, 480))
-            except Exception as e:
-                print("[ERROR] cv2.resize failed:", e)
+            frame_resized = grab_frame(vision)
+            if frame_resized is None:
                 return None
 
             masked = mask_outside_card(frame_resized, CARD_BOX)
@@ -81,7 +146,7 @@ def scan_card_image(square_id, max_scan_retries=3):
             cv2.imwrite("debug_preview.jpg", frame_resized)
             cv2.imwrite("debug_masked.jpg", masked)
 
-            t = time.time()
+            t = robot_backend.clock()
             if box is not None and box.shape == (4, 2):
                 center = tuple(np.mean(box, axis=0).astype(int))
                 if last_center and np.linalg.norm(np.array(center) - np.array(last_center)) < 10:
@@ -108,273 +173,372 @@ def scan_card_image(square_id, max_scan_retries=3):
                         return None
 
                     card = auto_crop_inside_white_edges(card)
-                    cv2.destroyAllWindows()
-
-                    retry_count = 0
-                    while retry_count < max_scan_retries:
-                        mean_vec, descriptors = extract_sift_signature(card)
-                        if mean_vec is not None and descriptors is not None:
-                            break
-
-                        print(f"[WARN] No features found for {square_id}. Retrying scan... (attempt {retry_count+1}/{max_scan_retries})")
-                        time.sleep(0.7)
-                        retry_count += 1
-                    
-                    if mean_vec is None:
-                        print(f"[FAIL] Failed to extract features after {max_scan_retries} software retries.")
-                        return None
-                    
-                    filename = f"{square_id}.jpg"
-                    filepath = os.path.join(image_save_dir, filename)
-                    cv2.imwrite(filepath, card)
-                    print(f"[ROBOT] Captured {square_id} → {filepath}")
-                    gui_queue.put({"event": "CACHE_BUST", "image_path": filepath})
-
-                    result = register_card(square_id, mean_vec, descriptors, filepath, debug=True)
-
-                    gui_queue.put({
-                        "status": "reveal",
-                        "square": square_id,
-                        "image_path": filepath
-                    })
-                    return result
+
+                    print(f"[SCAN] Captured {square_id} in {robot_backend.clock() - start_time:.1f} s")
+                    return card
             else:
-                now = time.time()
+                now = robot_backend.clock()
                 if now - last_box_debug > 3.0:
                     print("[DEBUG] No valid bounding box found.")
                     last_box_debug = now
 
-                if now - start_time > 10.0:
-                    print("[ERROR] Timed out: Could not detect a valid bounding box in 15 seconds.")
+                if now - start_time > no_card_timeout:
+                    print(f"[ERROR] Timed out: Could not detect a valid bounding box in {no_card_timeout:.0f} seconds.")
                     return None
 
+        except ActionCancelled:
+            raise
         except Exception as e:
             print("[FATAL ERROR] Exception in scan_card_image:", e)
             return None
 
+# -------------------- Card Analysis --------------------
+# Only the capture needs the arm at scan_pose. SIFT extraction and register_card()
+# run on a single worker thread (so logic state is still updated one card at a
+# time) while the arm travels back to the board; the robot thread waits for the
+# result only at the drop pose, where it has to choose between release and dispose.
+_analysis_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="card-analysis")
+_pending_analysis = None
+ANALYSIS_STATS = {"count": 0, "analysis_time": 0.0, "wait_time": 0.0}
+
+@traced("analysis")
+def analyze_card(square_id, card):
+    """Extracts the card signature and registers it. Returns register_card()'s result, or None."""
+    started = time.perf_counter()
+    with span("sift", square=square_id):
+        mean_vec, descriptors = extract_sift_signature(card)
+    if mean_vec is None or descriptors is None:
+        print(f"[WARN] No features found for {square_id}.")
+        return None
+
+    filename = f"{square_id}.jpg"
+    filepath = os.path.join(image_save_dir, filename)
+    cv2.imwrite(filepath, card)
+    print(f"[ROBOT] Captured {square_id} → {filepath}")
+    gui_queue.put(CacheBust(filepath))
+
+    # register_card() sends the Reveal to the GUI
+    result = register_card(square_id, mean_vec, descriptors, filepath, debug=True)
+    ANALYSIS_STATS["analysis_time"] += time.perf_counter() - started
+    return result
+
+def submit_analysis(square_id, card):
+    global _pending_analysis
+    _pending_analysis = _analysis_pool.submit(analyze_card, square_id, card)
+    return _pending_analysis
+
+@traced("await_analysis")
+def await_analysis():
+    """Blocks until the pending analysis is done. Returns its result (None on failure)."""
+    global _pending_analysis
+    if _pending_analysis is None:
+        return None
+    started = time.perf_counter()
+    try:
+        result = _pending_analysis.result()
+    except Exception as e:
+        print(f"[ERROR] Card analysis failed: {e}")
+        result = None
+    _pending_analysis = None
+    waited = time.perf_counter() - started
+    ANALYSIS_STATS["count"] += 1
+    ANALYSIS_STATS["wait_time"] += waited
+    print(f"[ANALYSIS] Waited {waited * 1000:.0f} ms at the drop pose")
+    return result
+
+def print_analysis_report():
+    n = ANALYSIS_STATS["count"]
+    if n:
+        analysis_ms = ANALYSIS_STATS["analysis_time"] / n * 1000
+        wait_ms = ANALYSIS_STATS["wait_time"] / n * 1000
+        print(f"[ANALYSIS] {n} cards: mean analysis {analysis_ms:.0f} ms, mean wait at drop {wait_ms:.0f} ms "
+              f"({max(0.0, analysis_ms - wait_ms):.0f} ms hidden behind arm travel)")
+
+# -------------------- Scan Recovery Ladder --------------------
+# Cheapest recovery first: another capture where the arm already is, then small
+# wrist/pose perturbations around the scan pose, and only then a full re-grasp,
+# which is skipped entirely while the card is still in the gripper.
+SCAN_LADDER_LEVELS = ("capture", "recapture", "perturb", "regrasp")
+SCAN_LADDER_STATS = {level: {"attempts": 0, "successes": 0, "time": 0.0} for level in SCAN_LADDER_LEVELS}
+
+def _ladder_attempt(level, attempt):
+    started = time.perf_counter()
+    result = attempt()
+    stats = SCAN_LADDER_STATS[level]
+    stats["attempts"] += 1
+    stats["time"] += time.perf_counter() - started
+    if result is not None:
+        stats["successes"] += 1
+    print(f"[SCAN-LADDER] {level}: {'ok' if result is not None else 'failed'} in {time.perf_counter() - started:.1f} s")
+    return result
+
+def print_scan_ladder_report():
+    print("[SCAN-LADDER] ---------- Recovery ladder ----------")
+    for level in SCAN_LADDER_LEVELS:
+        stats = SCAN_LADDER_STATS[level]
+        if stats["attempts"]:
+            rate = stats["successes"] / stats["attempts"] * 100
+            mean_s = stats["time"] / stats["attempts"]
+            print(f"[SCAN-LADDER] {level:<10} {stats['successes']}/{stats['attempts']} ok ({rate:.0f}%), mean {mean_s:.1f} s")
+
+def regrasp_card(square_id):
+    """Last resort: put the card back on its square, pick it again and return to the scan pose."""
+    pick_pose = pick_positions[square_id]
+    drop_pose = drop_positions[square_id]
+    safe_move(robot, drop_pose)
+    robot.tool.release_with_tool()
+    robot_backend.sleep(1.0)
+    safe_move(robot, pick_pose)
+    robot.tool.grasp_with_tool()
+    safe_move(robot, drop_pose) # Lift to safe height
+    safe_move(robot, scan_pose)
+
+def scan_with_recovery(square_id):
+    """Captures the held card, climbing the recovery ladder on failure. Returns None if all levels fail."""
+    result = _ladder_attempt("capture", lambda: scan_card_image(square_id))
+    if result is not None:
+        return result
+
+    held = card_in_gripper()
+    if held is not False:
+        # Still holding the card (or unsure): retry without moving the card
+        result = _ladder_attempt("recapture", lambda: scan_card_image(square_id, no_card_timeout=3.0))
+        for offset in SCAN_PERTURBATIONS:
+            if result is not None:
+                return result
+            perturbed = [p + o for p, o in zip(scan_pose, offset)]
+            safe_move(robot, perturbed)
+            result = _ladder_attempt("perturb", lambda: scan_card_image(square_id, target=perturbed, no_card_timeout=3.0))
+        if result is not None:
+            return result
+        held = card_in_gripper()
+
+    if held:
+        print(f"[SCAN-LADDER] Card {square_id} is still held but unreadable. Re-grasping would not help.")
+        return None
+
+    print(f"[SCAN-LADDER] Card {square_id} not in the gripper. Re-grasping.")
+    def regrasp_and_scan():
+        regrasp_card(square_id)
+        return scan_card_image(square_id)
+    return _ladder_attempt("regrasp", regrasp_and_scan)
+
 # --- memory_robot.py (New Helper Function) ---
 def send_robot_status(message: str):
-    """Sends a temporary status message to the GUI with a 3s timer."""
-    # NOTE: robot_status_message is the key used in start_typewriter_animation
-    gui_queue.put({"event": "SCREEN_MESSAGE_STATUS", "text": message})
-    
-    # Use the specific timer event ID defined in game_gui.py
-    pygame.time.set_timer(ROBOT_STATUS_EVENT, 10000, loops=1) 
-    
-# NOTE: You must import this function and the ROBOT_STATUS_EVENT constant into memory_logic.py
+    """Sends a temporary status message to the GUI, which clears it after 10 s."""
+    # The GUI arms the clearing timer itself: this module never touches pygame or game_gui,
+    # so importing it on the robot thread cannot open the window there
+    gui_queue.put(RobotStatus(message))
+
+
+# -------------------- Command Handlers --------------------
+dispatcher = CommandDispatcher(square_queue)
+last_square = None  # Square of the most recent pick, used for the safe reset pose
+
+# Operator restarts preempt whatever the arm is doing at the next motion segment
+square_queue.add_control_listener(lambda item: request_cancel(item.get("event")))
+
+
+def abort_to_safe_pose():
+    """Safe abort path: put down anything held above its square, release, park at home."""
+    current_pose = robot.arm.get_pose().to_list()
+    if is_at_pose(current_pose, home_pose, tol=0.02):
+        # Idle at home: nothing is held and there is nowhere safer to go
+        robot.tool.release_with_tool()
+        return
+    if last_square in drop_positions:
+        recovery_move(robot, drop_positions[last_square])
+    robot.tool.release_with_tool()
+    recovery_move(robot, home_pose)
+
+
+@dispatcher.fallback
+def forward_to_logic(msg):
+    """Non-movement commands ('set_difficulty', 'GET_HINT', ...) are handled by the game logic."""
+    register_card(msg, None, None, None)
+
+
+@dispatcher.on("collect_cards")
+def handle_collect_cards(msg):
+    print("[ROBOT] Received 'collect_cards' command. Executing...")
+    collect_cards_to_stacks(robot)
+    print("[ROBOT] Card collection finished.")
+
+
+@dispatcher.on("place_cards")
+def handle_place_cards(msg):
+    print("[ROBOT] Received 'place_cards' command. Executing...")
+    gui_queue.put(ScreenMessage("Placing cards..."))
+    place_initial_cards(robot)
+    robot_backend.sleep(0.5)
+    gui_queue.put(ScreenMessage("Card placement finished."))
+    robot_backend.sleep(0.5)
+    print("[ROBOT] Card placement finished.")
+
+
+@dispatcher.on("DROP_CURRENT_CARD")
+def handle_drop_current_card(msg):
+    square_id_to_drop = msg.get("square")
+    print(f"[ROBOT] Received DROP command for mismatch: {square_id_to_drop}.")
+    # 1. Execute physical drop (using the card ID received; a no-op move if already above it)
+    travel(robot, clear_node(square_id_to_drop))
+
+    robot.tool.release_with_tool()
+
+    gui_queue.put(Dropped(square_id_to_drop))
+    # 2. Return to safe pose, unless the next pick is already waiting
+    if square_queue.empty():
+        travel(robot, "home")
+
+
+@dispatcher.on("PLAN_NEXT_ROBOT_MOVE")
+def handle_plan_next_robot_move(msg):
+    print("[ROBOT] Received PLAN_NEXT_ROBOT_MOVE command. Executing planning.")
+    picks = robot_play()
+    for pick in picks:
+        square_queue.put(pick)
+    print(f"[ROBOT] Enqueued next moves: {picks}")
+
+
+@dispatcher.on("RESTART_GAME", "GOTO_INTRO")
+def handle_reset(msg):
+    event = msg.get("event")
+    print(f"[ROBOT] Received '{event}' command. Resetting robot state.")
+    # 1. IMMEDIATE STOP/SAFE STATE (a no-op if an in-flight action was already aborted)
+    abort_to_safe_pose()
+    finish_cancel()
+    await_analysis()  # A card preempted on its way back may still be registering
+
+    # 2. CLEAR PENDING COMMAND QUEUE
+    # Only commands queued before now are stale; anything the GUI sends after the
+    # reset (e.g. the new 'set_difficulty') must survive.
+    dropped = square_queue.clear(before=time.perf_counter())
+    print(f"[ROBOT] Dropped {dropped} pending command(s).")
+
+    for f in glob.glob(os.path.join("scanned_cards", "*")):
+        os.remove(f)
+    print("[ROBOT] All previous scans and memory data cleared.")
+
+    if event == "RESTART_GAME":
+        reset_game(play_turn_sound=True)
+    else:
+        reset_game(play_turn_sound=False)
+    dispatcher.print_latency_report()
+    print_analysis_report()
+    POSE_GRAPH.print_report()
+
+
+@dispatcher.on("square")
+def handle_square_pick(square_id):
+    global last_square, is_scanning
+    # Remove redundant 'reset_game' checks, rely on dictionary message reset
+    if square_id == "reset_game":
+        print("[ROBOT] Received legacy/redundant reset command. Ignoring.")
+        return
+    print(f"[ROBOT] Received square: {square_id}")
+    pick_pose = pick_positions.get(square_id)
+    drop_pose = drop_positions.get(square_id)
+
+    if pick_pose is None or drop_pose is None:
+        print(f"[ERROR] Missing pose for {square_id}")
+        return
+    last_square = square_id
+    send_robot_status(f"Moving to : {square_id}")
+    # --- START: PICK, SCAN, DROP SEQUENCE ---
+    card = None
+    try:
+        # 1. PICK MOVEMENT LOGIC
+        print(f"[MOVE] Picking {square_id}")
+        travel(robot, pick_node(square_id)) # Descends through the square's clearance pose
+        robot.tool.grasp_with_tool()
+
+        # 2. SCAN MOVEMENT AND EXECUTION (recovery ladder re-grasps only if the card was lost)
+        print(f"[MOVE] Going to scan pose")
+        travel(robot, "scan") # Lifts to clearance first
+        is_scanning = True
+        card = scan_with_recovery(square_id)
+        is_scanning = False
+    except ActionCancelled:
+        is_scanning = False
+        raise
+    except Exception as e:
+        is_scanning = False
+        # --- EMERGENCY RECOVERY ACTION ---
+        # This catches the Motion Planning abortion (the orange light/collision error)
+        print(f"[RECOVERY] Motion failed during pick/scan: {e}. Executing emergency drop.")
+
+        # 1. Force move to the safe drop pose
+        recovery_move(robot, drop_pose)
+
+        # 2. Release the card
+        robot.tool.release_with_tool()
+
+        # 3. Move home and signal failure
+        recovery_move(robot, home_pose)
+
+        card = None # Force a total failure for the outer check
+
+    # 3. ANALYSIS OVERLAPS THE TRAVEL BACK TO THE BOARD
+    result = None
+    if card is not None:
+        submit_analysis(square_id, card)
+        travel(robot, clear_node(square_id))
+        result = await_analysis()
+
+    # --- END: PICK, SCAN, DROP SEQUENCE ---
+
+    if result is None:
+        # Total failure after all retries
+        print(f"[WARN] Failed to scan {square_id} after all attempts. Signaling scan failure.")
+        print_scan_ladder_report()
+        gui_queue.put(ScanFail(square_id))
+
+        # Cleanup: Release tool and go home
+        recovery_move(robot, drop_pose)
+        robot.tool.release_with_tool()
+        recovery_move(robot, home_pose)
+        return # Skip drop and go to next pick
+
+    if result.get("match"):
+        dispose = result.get("dispose")
+        if dispose:
+            dispose_card_2_held(robot, dispose["held"])
+            dispose_card_1_on_board(robot, dispose["on_board"])
+        # The turn continues after a match, so only park if nothing is queued yet
+        if square_queue.empty():
+            travel(robot, "home")
+        return
+
+    # ---- DROP (Only executes on successful scan; the arm is already at drop_pose) ----
+    robot.tool.release_with_tool()
+    print(f"[DROP] Released at {square_id}")
+
+    gui_queue.put(Dropped(square_id))
+    if square_queue.empty():
+        travel(robot, "home")
 
 
 # -------------------- Main Loop --------------------
 def main_loop():
+    if robot is None:
+        init_robot()
     print("[READY] Awaiting square picks...")
-    robot.arm.move_pose(home_pose)
 
     try:
         while True:
-            # Setting LED state based on turn (Assuming set_robot_led is fixed elsewhere)
-            # if get_turn() == "robot": set_robot_led(robot, "PLANNING")
-            # else: set_robot_led(robot, "WAITING")
-
-            if square_queue.empty():
-                time.sleep(0.05)
-                continue
-
-            queue_item = square_queue.get()
-            
-            # --- START: HANDLE DICTIONARY MESSAGES (INCLUDING HINT) ---
-            if isinstance(queue_item, dict):
-                event = queue_item.get("event")
-                
-                # --- CRITICAL FIX: FORWARD ALL NON-MOVEMENT COMMANDS TO LOGIC ---
-                # This handles 'set_difficulty', 'GET_HINT', 'RESTART_GAME', 'GOTO_INTRO', etc.
-                register_card(queue_item, None, None, None)
-                
-                # --- EXECUTE PHYSICAL COMMANDS LOCALLY (IF APPLICABLE) ---
-                
-                if event == "collect_cards":
-                    print("[ROBOT] Received 'collect_cards' command. Executing...")
-                    collect_cards_to_stacks(robot)
-                    print("[ROBOT] Card collection finished.")
-                elif event == "place_cards":
-                    print("[ROBOT] Received 'place_cards' command. Executing...")
-                    gui_queue.put({"event": "SCREEN_MESSAGE", "text": "Placing cards..."})
-                    place_initial_cards(robot)
-                    time.sleep(0.5)
-                    gui_queue.put({"event": "SCREEN_MESSAGE", "text": "Card placement finished."})
-                    time.sleep(0.5)
-                    print("[ROBOT] Card placement finished.")
-                elif event == "DROP_CURRENT_CARD":
-                    square_id_to_drop = queue_item.get("square")
-                    print(f"[ROBOT] Received DROP command for mismatch: {square_id_to_drop}.")
-                    # 1. Execute physical drop (using the card ID received)
-                    drop_pose_target = drop_positions.get(square_id_to_drop)
-                    robot.arm.move_pose(drop_pose_target)
-
-                    robot.tool.release_with_tool()
-                    
-
-                    gui_queue.put({"status": "dropped", "square": square_id_to_drop})
-                    # 2. Return to safe pose
-                    robot.arm.move_pose(home_pose)
-                    continue
-                elif event == "PLAN_NEXT_ROBOT_MOVE":
-                    print("[ROBOT] Received PLAN_NEXT_ROBOT_MOVE command. Executing planning.")
-                    picks = robot_play()
-                    for pick in picks:
-                        square_queue.put(pick)
-                    print(f"[ROBOT] Enqueued next moves: {picks}")
-                
-                elif event in ["RESTART_GAME", "GOTO_INTRO"]:
-                    # Note: Physical halt logic would be placed here if needed.
-                    print(f"[ROBOT] Received '{event}' command. Resetting robot state.")
-                    # 1. IMMEDIATE STOP/SAFE STATE
-                    #robot.arm.move_pose(drop_pose)
-                    #robot.tool.release_with_tool()
-                    robot.arm.move_pose(drop_pose)
-                    robot.tool.release_with_tool()
-                    robot.arm.move_pose(home_pose)
-                    
-                    # 2. CLEAR PENDING COMMAND QUEUE
-                    try:
-                        while True: 
-                            square_queue.get_nowait()
-                    except queue.Empty:
-                        pass
-
-                    
-                    for f in glob.glob(os.path.join("scanned_cards", "*")):
-                        os.remove(f)
-                    print("[ROBOT] All previous scans and memory data cleared.")
-                    
-                    if event == "RESTART_GAME":
-                        reset_game(play_turn_sound=True)
-                    else:
-                        reset_game(play_turn_sound=False)
-
-                    continue
-
-                register_card(queue_item, None, None, None)
-                
-                
-                # We skip the rest of the main loop since the command was handled.
-                continue
-            
-            # --- END: HANDLE DICTIONARY MESSAGES ---
-            
-            # --- HANDLE LEGACY/STRING MESSAGES ---
-            
-            # Remove redundant 'reset_game' checks, rely on dictionary message reset
-            square_id = queue_item
-            if square_id == "reset_game":
-                 print("[ROBOT] Received legacy/redundant reset command. Ignoring.")
-                 continue
-            print(f"[ROBOT] Received square: {square_id}")
-            pick_pose = pick_positions.get(square_id)
-            drop_pose = drop_positions.get(square_id)
-
-            if pick_pose is None or drop_pose is None:
-                print(f"[ERROR] Missing pose for {square_id}")
-                continue
-            send_robot_status(f"Moving to : {square_id}")
-            #robot.arm.move_pose(pick_pose)
-            # --- START: PICK, SCAN, DROP SEQUENCE ---
-            result = None
-            total_attempt_cycles = 3
-            
-            for attempt_cycle in range(total_attempt_cycles):
-                try:
-                # 1. PICK MOVEMENT LOGIC (Optimized and simplified)
-                    print(f"[MOVE] Cycle {attempt_cycle+1}: Picking {square_id}")
-                    if attempt_cycle == 0:
-                        robot.arm.move_pose(drop_pose)
-
-                    # Initial pick
-                    # NOTE: Assuming row D check for approaching via drop_pose happens here or is omitted for simplicity
-                        print(f"[MOVE] Cycle 1: Picking {square_id}")
-                        pass
-                    elif attempt_cycle == 1:
-                    # Repick logic: Release, wait, grasp
-                        print(f"[MOVE] Cycle 2: Picking {square_id}")
-                        robot.arm.move_pose(drop_pose)
-                        robot.tool.release_with_tool()
-                        time.sleep(1.0)
-
-                    #robot.arm.move_pose(drop_pose) # Move to drop height first
-                
-                    robot.arm.move_pose(pick_pose)
-                    robot.tool.grasp_with_tool()
-                    robot.arm.move_pose(drop_pose) # Lift to safe height
-
-                # 2. SCAN MOVEMENT AND EXECUTION
-                    print(f"[MOVE] Going to scan pose")
-                    robot.arm.move_pose(scan_pose)
-                    global is_scanning
-                    is_scanning = True
-                    result = scan_card_image(square_id)
-                    is_scanning = False
-                    if result is not None:
-                        break # Success!
-                except Exception as e:
-                    # --- EMERGENCY RECOVERY ACTION ---
-                    # This catches the Motion Planning abortion (the orange light/collision error)
-                    print(f"[RECOVERY] Motion failed during pick/scan: {e}. Executing emergency drop.")
-                    
-                    # 1. Force move to the safe drop pose
-                    robot.arm.move_pose(drop_pose) 
-                    
-                    # 2. Release the card
-                    robot.tool.release_with_tool()
-                    
-                    # 3. Move home and signal failure
-                    robot.arm.move_pose(home_pose) 
-                    
-                    result = None # Force a total failure for the outer check
-                    break # Stop the retry loop
-                    
-            # --- END: PICK, SCAN, DROP SEQUENCE ---
-
-            if result is None:
-                # Total failure after all retries
-                print(f"[WARN] Failed to scan {square_id} after all attempts. Signaling scan failure.")
-                gui_queue.put({"status": "scan_fail", "square": square_id})
-                
-                # Cleanup: Release tool and go home
-                
-                robot.arm.move_pose(drop_pose)
-                robot.tool.release_with_tool()
-                robot.arm.move_pose(home_pose)
-                """
-                try:
-                    while not square_queue.empty():
-                        square_queue.get_nowait()
-                        print("[ROBOT] Cleared stale pick from queue due to scan failure.")
-                except queue.Empty:
-                    pass
-
-               # robot.arm.move_pose(home_pose)
-               """
-                continue # Skip drop and go to next pick
-
-            if result.get("match"):
-                robot.arm.move_pose(home_pose)
-                continue
-
-            # ---- DROP (Only executes on successful scan) ----
-           # play_sound("placing") # Move this before the move
-            robot.arm.move_pose(drop_pose) # Move to drop position
-            robot.tool.release_with_tool()
-            print(f"[DROP] Released at {square_id}")
-
-            gui_queue.put({"status": "dropped", "square": square_id})
-            #robot.arm.move_pose(home_pose)
-            if square_queue.empty():
-                 robot.arm.move_pose(home_pose)
+            try:
+                # Blocks until a command arrives; control messages are served first
+                dispatcher.dispatch_next()
+            except ActionCancelled as e:
+                print(f"[CANCEL] Preempted in-flight action ({e}). Aborting to safe pose.")
+                abort_to_safe_pose()
+                finish_cancel()
 
     except KeyboardInterrupt:
         print("[STOP] Interrupted by user.")
     finally:
-        cv2.destroyAllWindows()
+        dispatcher.print_latency_report()
         robot.arm.move_pose(home_pose)
 
 if __name__ == "__main__":
-    main_loop()
\ No newline at end of file
+    main_loop()
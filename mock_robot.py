@@ -0,0 +1,278 @@
+import glob
+import math
+import os
+import random
+import threading
+from types import SimpleNamespace
+import cv2
+import numpy as np
+from config import CARD_BOX, GRIPPER_TOOL_ID, MOCK_DECK_DIR, MOCK_MOTION
+from recorded_positions import pick_positions, scan_pose, L1, L2, R1, R2
+from board_geometry import BOARD
+import robot_backend
+
+# ---------------------- MOCK NED BACKEND ----------------------
+# Drop-in stand-ins for pyniryo2's NiryoRobot / NiryoRos / Vision and pyniryo's
+# image helpers, selected with ROBOT_BACKEND = "mock" (see robot_backend.py).
+# One shared MockWorld tracks where every card is (board square, gripper, stack)
+# so grasp/release behave like the real table, and the camera renders the held
+# card when the arm is at the scan pose.
+# Motion time is modelled per segment from a joint-space proxy: base rotation,
+# reach/height change of the shoulder-elbow pair and the largest wrist rotation,
+# whichever is slowest, plus a fixed planning overhead. All waits go through
+# robot_backend.sleep(), so they follow the time warp.
+
+STACK_POSES = {"L1": L1, "L2": L2, "R1": R1, "R2": R2}
+SQUARE_POSES = {sq: pick_positions[sq] for sq in BOARD.squares}
+XY_TOLERANCE = 0.02
+GRASP_MAX_Z  = 0.07   # The suction cup only reaches a card from pick height
+
+warp_sleep = robot_backend.sleep
+
+
+def motion_time(start, end):
+    """Seconds for one move_pose() from `start` to `end` under MOCK_MOTION."""
+    base = abs(math.remainder(math.atan2(end[1], end[0]) - math.atan2(start[1], start[0]), math.tau))
+    reach = math.hypot(math.hypot(end[0], end[1]) - math.hypot(start[0], start[1]), end[2] - start[2])
+    wrist = max(abs(math.remainder(a - b, math.tau)) for a, b in zip(end[3:], start[3:]))
+    return MOCK_MOTION["overhead"] + max(base / MOCK_MOTION["base_speed"],
+                                         reach / MOCK_MOTION["reach_speed"],
+                                         wrist / MOCK_MOTION["wrist_speed"])
+
+
+# ---------------------- CARD DECK ----------------------
+
+# Pattern seeds of the synthetic deck, picked so that every pair is told apart by
+# the default MATCH_DISTANCE_THRESHOLD / MATCH_KNN_SCORE_THRESHOLD with margin
+DECK_SEEDS = [0, 2, 12, 20, 26, 34, 71, 91, 96, 110]
+
+
+def synthetic_card(seed, size=160):
+    """A white-bordered card with a random pattern of filled shapes and lines."""
+    rng = random.Random(seed * 7919 + 17)
+    card = np.full((size, size, 3), 255, np.uint8)
+    inner = np.zeros((size - 24, size - 24, 3), np.uint8)
+    inner[:] = [rng.randint(20, 120) for _ in range(3)]
+    for _ in range(12):
+        color = [rng.randint(0, 255) for _ in range(3)]
+        x, y = rng.randint(0, inner.shape[1]), rng.randint(0, inner.shape[0])
+        r = rng.randint(4, 22)
+        shape = rng.choice(("circle", "rect", "line", "triangle"))
+        if shape == "circle":
+            cv2.circle(inner, (x, y), r, color, -1)
+        elif shape == "rect":
+            cv2.rectangle(inner, (x, y), (x + r, y + rng.randint(4, r)), color, -1)
+        elif shape == "triangle":
+            corners = [[x, y]] + [[x + rng.randint(-30, 30), y + rng.randint(-30, 30)] for _ in range(2)]
+            cv2.fillPoly(inner, [np.array(corners, np.int32)], color)
+        else:
+            end = (rng.randint(0, inner.shape[1]), rng.randint(0, inner.shape[0]))
+            cv2.line(inner, (x, y), end, color, rng.randint(1, 4))
+    card[12:-12, 12:-12] = inner
+    return card
+
+
+def load_deck(pairs):
+    """pairs card faces: recorded images from MOCK_DECK_DIR if there are enough, else synthetic."""
+    if MOCK_DECK_DIR:
+        paths = sorted(glob.glob(os.path.join(MOCK_DECK_DIR, "*.jpg")) + glob.glob(os.path.join(MOCK_DECK_DIR, "*.png")))
+        if len(paths) >= pairs:
+            return [cv2.resize(cv2.imread(p), (160, 160)) for p in paths[:pairs]]
+        print(f"[MOCK] Only {len(paths)} images in {MOCK_DECK_DIR}. Using the synthetic deck.")
+    return [synthetic_card(DECK_SEEDS[i % len(DECK_SEEDS)] + i // len(DECK_SEEDS) * 1000) for i in range(pairs)]
+
+
+# ---------------------- WORLD ----------------------
+
+class MockWorld:
+    def __init__(self, seed=None):
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.faces = load_deck(BOARD.pairs)
+        cards = [i for i in range(BOARD.pairs) for _ in range(2)]
+        self.rng.shuffle(cards)
+        self.board = dict(zip(BOARD.squares, cards))   # square: pair id (None when empty)
+        self.stacks = {name: [] for name in STACK_POSES}
+        self.held = None
+        self.pose = [0.22, 0.0, 0.21, 0.0, 1.54, 0.0]
+        self.stats = {"moves": 0, "motion_time": 0.0, "grasps": 0, "frames": 0}
+
+    def card_at(self, square):
+        return self.board.get(square)
+
+    def _distance(self, pose):
+        return math.hypot(pose[0] - self.pose[0], pose[1] - self.pose[1])
+
+    def _place(self):
+        """(square, stack) under the arm, within XY_TOLERANCE. Only the closer one is kept
+        when both are (an extrapolated edge square of a big board can be near a stack)."""
+        square = min(SQUARE_POSES, key=lambda sq: self._distance(SQUARE_POSES[sq]))
+        stack = min(STACK_POSES, key=lambda name: self._distance(STACK_POSES[name]))
+        square_dist, stack_dist = self._distance(SQUARE_POSES[square]), self._distance(STACK_POSES[stack])
+        if square_dist >= XY_TOLERANCE or stack_dist < square_dist:
+            square = None
+        if stack_dist >= XY_TOLERANCE or square is not None:
+            stack = None
+        return square, stack
+
+    def grasp(self):
+        with self.lock:
+            if self.held is not None or self.pose[2] > GRASP_MAX_Z:
+                return
+            square, stack = self._place()
+            if square is not None and self.board.get(square) is not None:
+                self.held, self.board[square] = self.board[square], None
+            else:
+                if stack is not None and self.stacks[stack]:
+                    self.held = self.stacks[stack].pop()
+            self.stats["grasps"] += 1
+
+    def release(self):
+        with self.lock:
+            if self.held is None:
+                return
+            square, stack = self._place()
+            if square is not None and self.board.get(square) is None:
+                self.board[square] = self.held
+            elif stack is not None:
+                self.stacks[stack].append(self.held)
+            else:
+                print(f"[MOCK] Card {self.held} released off the board at {self.pose[:3]}")
+            self.held = None
+
+    def render(self):
+        """
+        Camera frame: the held card inside CARD_BOX when the arm is at the scan pose.
+        No sensor noise, so a card always gives the same signature and match results are reproducible.
+        """
+        frame = np.full((480, 640, 3), 35, np.uint8)
+        with self.lock:
+            held, pose = self.held, list(self.pose)
+            self.stats["frames"] += 1
+        if held is not None and math.dist(pose[:3], scan_pose[:3]) < 0.03:
+            face = self.faces[held]
+            x, y, w, h = CARD_BOX
+            top, left = y + (h - face.shape[0]) // 2, x + (w - face.shape[1]) // 2
+            frame[top:top + face.shape[0], left:left + face.shape[1]] = face
+        return frame
+
+
+WORLD = MockWorld()
+
+
+# ---------------------- ROBOT ----------------------
+
+class _Pose:
+    def __init__(self, values):
+        self._values = list(values)
+
+    def to_list(self):
+        return list(self._values)
+
+
+class MockArm:
+    def __init__(self, world):
+        self.world = world
+        self._calibrated = False
+
+    def need_calibration(self):
+        return not self._calibrated
+
+    def calibrate_auto(self):
+        warp_sleep(MOCK_MOTION["calibration_time"])
+        self._calibrated = True
+
+    def move_pose(self, pose):
+        duration = motion_time(self.world.pose, pose)
+        warp_sleep(duration)
+        with self.world.lock:
+            self.world.pose = list(pose)
+            self.world.stats["moves"] += 1
+            self.world.stats["motion_time"] += duration
+
+    def get_pose(self):
+        with self.world.lock:
+            return _Pose(self.world.pose)
+
+    def stop_move(self):
+        pass
+
+
+class MockTool:
+    def __init__(self, world):
+        self.world = world
+
+    def grasp_with_tool(self):
+        warp_sleep(MOCK_MOTION["tool_time"])
+        self.world.grasp()
+
+    def release_with_tool(self):
+        warp_sleep(MOCK_MOTION["tool_time"])
+        self.world.release()
+
+    def get_current_tool_id(self):
+        return GRIPPER_TOOL_ID
+
+
+class MockLedRing:
+    def __init__(self):
+        self.state = ("off", None)
+
+    def _show(self, pattern, color, period=0.0, iterations=0, wait=False):
+        self.state = (pattern, color)
+        if wait and iterations:
+            warp_sleep(period * iterations)
+
+    def solid(self, color, wait=False):
+        self._show("solid", color)
+
+    def flash(self, color, period=0.0, iterations=0, wait=False):
+        self._show("flash", color, period, iterations, wait)
+
+    def snake(self, color, period=0.0, iterations=0, wait=False):
+        self._show("snake", color, period, iterations, wait)
+
+    def breath(self, color, period=0.0, iterations=0, wait=False):
+        self._show("breath", color, period, iterations, wait)
+
+    def turn_off(self):
+        self.state = ("off", None)
+
+
+class NiryoRobot:
+    def __init__(self, ip_address, world=None):
+        world = world or WORLD
+        self.arm = MockArm(world)
+        self.tool = MockTool(world)
+        self.led_ring = MockLedRing()
+        print(f"[MOCK] Simulated Ned at {ip_address} (time warp x{robot_backend.time_warp:g})")
+
+    def end(self):
+        pass
+
+
+# ---------------------- CAMERA ----------------------
+
+class NiryoRos:
+    def __init__(self, ip_address):
+        self.ip_address = ip_address
+
+
+class Vision:
+    def __init__(self, ros_instance, world=None):
+        self.world = world or WORLD
+
+    def get_img_compressed(self):
+        ok, data = cv2.imencode(".jpg", self.world.render())
+        return data.tobytes() if ok else None
+
+    def get_camera_intrinsics(self):
+        return SimpleNamespace(intrinsics=np.eye(3), distortion=np.zeros(5))
+
+
+def uncompress_image(compressed):
+    return cv2.imdecode(np.frombuffer(compressed, np.uint8), cv2.IMREAD_COLOR)
+
+
+def undistort_image(img, intrinsics, distortion):
+    return img  # The mock camera has no lens distortion
@@ -0,0 +1,180 @@
+import heapq
+import math
+import time
+from spans import span
+from recorded_positions import pick_positions, drop_positions, home_pose, scan_pose, L1, L2, R1, R2
+from board_geometry import BOARD
+
+# ---------------------- POSE GRAPH ----------------------
+# Every named pose the arm uses is a node. Transit nodes (board and stack clearance
+# poses, scan, home) sit at or above the board clearance height and are connected
+# to each other, so consecutive segments at the same height are chained directly
+# instead of lifting to a fixed clearance in between. A pick pose, and a stack's
+# release pose, is only reachable through the clearance pose straight above it.
+# Edge costs start from a distance-based prior and are replaced by measured
+# move_pose() durations (EMA) as the arm actually travels them.
+
+NOMINAL_SPEED    = 0.15  # m/s, prior for segments that were never measured
+ROTATION_SPEED   = 1.5   # rad/s
+SEGMENT_OVERHEAD = 0.5   # s per move_pose() call (planning + settle)
+COST_EMA_ALPHA   = 0.3
+STACK_CLEARANCE  = 0.05  # m above a stack's release pose, so the arm never slides across a stack
+
+STACK_NAMES = ["L1", "L2", "R1", "R2"]
+
+
+def pose_key(pose):
+    return tuple(round(v, 3) for v in pose)
+
+
+def pick_node(square_id):
+    return f"{square_id}/pick"
+
+
+def clear_node(name):
+    """Clearance pose above a board square or a stack."""
+    return f"{name}/clear"
+
+
+class PoseGraph:
+    def __init__(self):
+        self.poses = {}      # name: pose
+        self.names = {}      # pose_key: name
+        self.edges = {}      # name: set of neighbour names
+        self.approach = {}   # name: node that must be visited right before it
+        self.measured = {}   # (a, b): EMA of measured seconds
+        self.prior_scale = 1.0  # EMA of measured / prior, keeps unmeasured edges comparable
+        self.location = None # pose_key of the last commanded pose, None if unknown
+        self._move_listeners = []
+        self.stats = {"moves": 0, "skipped": 0, "move_time": 0.0}
+
+    def add_move_listener(self, listener):
+        """Calls listener() on the moving thread after every segment the arm completes."""
+        self._move_listeners.append(listener)
+
+    def add_pose(self, name, pose):
+        self.poses[name] = list(pose)
+        self.names[pose_key(pose)] = name
+        self.edges.setdefault(name, set())
+
+    def connect(self, a, b):
+        self.edges[a].add(b)
+        self.edges[b].add(a)
+
+    def estimate(self, a, b):
+        """Expected seconds for a → b: measured if available, otherwise the scaled prior."""
+        if (a, b) in self.measured:
+            return self.measured[(a, b)]
+        return self.prior(a, b) * self.prior_scale
+
+    def prior(self, a, b):
+        pa, pb = self.poses[a], self.poses[b]
+        distance = math.dist(pa[:3], pb[:3])
+        rotation = max(abs(math.remainder(x - y, math.tau)) for x, y in zip(pa[3:], pb[3:]))
+        return SEGMENT_OVERHEAD + distance / NOMINAL_SPEED + rotation / ROTATION_SPEED
+
+    def current_node(self):
+        return self.names.get(self.location)
+
+    def shortest_path(self, src, dst):
+        """Dijkstra from src to dst. Returns the hops after src (empty if src == dst)."""
+        dist = {src: 0.0}
+        previous = {}
+        frontier = [(0.0, src)]
+        while frontier:
+            cost, node = heapq.heappop(frontier)
+            if node == dst:
+                break
+            if cost > dist[node]:
+                continue
+            for nxt in self.edges[node]:
+                new_cost = cost + self.estimate(node, nxt)
+                if new_cost < dist.get(nxt, math.inf):
+                    dist[nxt] = new_cost
+                    previous[nxt] = node
+                    heapq.heappush(frontier, (new_cost, nxt))
+        if dst not in dist:
+            raise ValueError(f"No safe path from {src} to {dst}")
+        path = [dst]
+        while path[-1] != src:
+            path.append(previous[path[-1]])
+        return path[-2::-1]
+
+    def route(self, dst):
+        """Named hops to reach dst from where the arm is now."""
+        src = self.current_node()
+        if src == dst:
+            self.stats["skipped"] += 1
+            return []
+        if src is None:
+            # Unknown start (e.g. after a perturbed scan): take dst's approach pose first
+            return [self.approach[dst], dst] if dst in self.approach else [dst]
+        return self.shortest_path(src, dst)
+
+    def move(self, robot, pose):
+        """Commands one segment. A move to where the arm already is is skipped."""
+        key = pose_key(pose)
+        if key == self.location:
+            self.stats["skipped"] += 1
+            return
+        src = self.current_node()
+        started = time.perf_counter()
+        try:
+            with span("move_pose", args={"from": src, "to": self.names.get(key)}):
+                robot.arm.move_pose(pose)
+        except Exception:
+            self.location = None
+            raise
+        elapsed = time.perf_counter() - started
+        self.location = key
+        self.stats["moves"] += 1
+        self.stats["move_time"] += elapsed
+
+        dst = self.names.get(key)
+        if src is not None and dst is not None and src != dst:
+            ratio = elapsed / self.prior(src, dst)
+            self.prior_scale += COST_EMA_ALPHA * (ratio - self.prior_scale)
+            # Joint-space moves are close enough to symmetric to share one estimate
+            for edge in ((src, dst), (dst, src)):
+                old = self.measured.get(edge)
+                self.measured[edge] = elapsed if old is None else old + COST_EMA_ALPHA * (elapsed - old)
+        for listener in self._move_listeners:
+            listener()
+
+    def forget_location(self):
+        self.location = None
+
+    def print_report(self):
+        stats = self.stats
+        print(f"[ROUTE] {stats['moves']} segments in {stats['move_time']:.1f} s, "
+              f"{stats['skipped']} redundant moves skipped, {len(self.measured) // 2} edges measured")
+
+
+def build_pose_graph():
+    graph = PoseGraph()
+    graph.add_pose("home", home_pose)
+    graph.add_pose("scan", scan_pose)
+    for name, pose in zip(STACK_NAMES, (L1, L2, R1, R2)):
+        clearance = list(pose)
+        clearance[2] += STACK_CLEARANCE
+        graph.add_pose(clear_node(name), clearance)
+    for square_id in BOARD.squares:
+        graph.add_pose(clear_node(square_id), drop_positions[square_id])
+
+    transit = list(graph.poses)
+    for i, a in enumerate(transit):
+        for b in transit[i + 1:]:
+            graph.connect(a, b)
+
+    for square_id in BOARD.squares:
+        graph.add_pose(pick_node(square_id), pick_positions[square_id])
+        graph.connect(pick_node(square_id), clear_node(square_id))
+        graph.approach[pick_node(square_id)] = clear_node(square_id)
+    for name, pose in zip(STACK_NAMES, (L1, L2, R1, R2)):
+        graph.add_pose(name, pose)
+        graph.connect(name, clear_node(name))
+        graph.approach[name] = clear_node(name)
+    return graph
+
+
+POSE_GRAPH = build_pose_graph()
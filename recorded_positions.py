@@ -1,3 +1,5 @@
+from board_geometry import BOARD
+
 
 pick_positions = {
     "A1": [0.147, -0.144, 0.06, -3.80, 1.54, 2.5],
@@ -48,6 +50,10 @@ drop_positions = {
 }
 
 
+# Squares of a bigger board that were never recorded are extrapolated from the recorded grid.
+# Only the mock robot may use them: robot_backend refuses them for the real arm.
+EXTRAPOLATED_SQUARES = BOARD.complete_poses(pick_positions)
+BOARD.complete_poses(drop_positions)
 
 home_pose = [0.22, -0.0, 0.21, -2.96, 1.54, -2.9783]
 scan_pose = [0.26, 0.03, 0.15, 1.58, 0.01, 1.45]
@@ -0,0 +1,69 @@
+import time
+from types import SimpleNamespace
+from config import ROBOT_BACKEND, MOCK_TIME_WARP
+from board_geometry import BOARD
+from recorded_positions import EXTRAPOLATED_SQUARES
+
+# ---------------------- ROBOT BACKEND ----------------------
+# Picks the implementation behind NiryoRobot / NiryoRos / Vision and the pyniryo
+# image helpers: the real Ned ("niryo") or the simulated one in mock_robot.py
+# ("mock"). Everything that talks to the robot goes through load(), so the rest of
+# the code is the same for both.
+# With the mock, time is warped: clock() and sleep() run `time_warp` times faster
+# than the wall clock, and so do the mock's motions, scan waits included.
+
+backend   = ROBOT_BACKEND
+time_warp = MOCK_TIME_WARP if ROBOT_BACKEND == "mock" else 1.0
+_loaded   = None
+_epoch    = time.time()
+
+
+def configure(name=None, warp=None):
+    """Overrides config.py (e.g. from the command line). Must run before the first load()."""
+    global backend, time_warp
+    if _loaded is not None:
+        raise RuntimeError("Robot backend already loaded")
+    if name is not None:
+        backend = name
+    if backend != "mock":
+        time_warp = 1.0
+    elif warp is not None:
+        time_warp = warp
+    check_board(backend)
+    print(f"[BACKEND] {backend} (time warp x{time_warp:g})")
+
+
+def check_board(name):
+    """Only the mock may use extrapolated poses: on the real arm they can hit the stacks or be out of reach."""
+    if name != "mock" and EXTRAPOLATED_SQUARES:
+        raise ValueError(
+            f"The {BOARD.rows}×{BOARD.cols} board has no recorded poses for {len(EXTRAPOLATED_SQUARES)} squares "
+            f"({', '.join(EXTRAPOLATED_SQUARES[:4])}, …). Record them, set ROWS, COLS = 4, 5 or use the mock robot.")
+
+
+def load():
+    """Namespace with NiryoRobot, NiryoRos, Vision, uncompress_image and undistort_image."""
+    global _loaded
+    if _loaded is None:
+        if backend == "mock":
+            import mock_robot
+            _loaded = mock_robot
+        elif backend == "niryo":
+            check_board(backend)
+            import pyniryo
+            from pyniryo2 import NiryoRobot, NiryoRos, Vision
+            _loaded = SimpleNamespace(NiryoRobot=NiryoRobot, NiryoRos=NiryoRos, Vision=Vision,
+                                      uncompress_image=pyniryo.uncompress_image,
+                                      undistort_image=pyniryo.undistort_image)
+        else:
+            raise ValueError(f"Unknown robot backend: {backend}")
+    return _loaded
+
+
+def clock():
+    """Seconds in robot time: wall-clock time, sped up by the time warp."""
+    return _epoch + (time.time() - _epoch) * time_warp
+
+
+def sleep(seconds):
+    time.sleep(seconds / time_warp)
@@ -1,11 +1,28 @@
-from pyniryo2 import NiryoRobot
 from config import ROBOT_IP_ADDRESS
-import time
+import robot_backend
+from spans import traced
+import threading
 
-robot=NiryoRobot(ROBOT_IP_ADDRESS)
+# Single connection shared by memory_robot and memory_logic. It is opened lazily on
+# the robot thread so importing this module never blocks on the network.
+_robot = None
+_robot_lock = threading.Lock()
 
-def set_robot_led(robot, state: str):
-    
+def get_robot():
+    """Returns the shared robot connection (real or mock, see robot_backend), opening it on first use."""
+    global _robot
+    with _robot_lock:
+        if _robot is None:
+            _robot = robot_backend.load().NiryoRobot(ROBOT_IP_ADDRESS)
+    return _robot
+
+@traced("led")
+def start_robot_led(robot, state: str):
+    """
+    Starts the LED pattern for `state` without blocking.
+    Returns how many seconds the pattern should stay up before turn_off(),
+    or None if it stays on until the next pattern.
+    """
     # Define colors as RGB lists (R, G, B)
     COLOR_RED = [255, 0, 0]
     COLOR_GREEN = [0, 255, 0]
@@ -25,32 +42,31 @@ def set_robot_led(robot, state: str):
     # --- State: Match/Mismatch Outcomes ---
     elif state == "MATCH_ROBOT":
         # Required: Chase Green. Using faster snake pattern (0.05s) for a chase effect.
-        robot.led_ring.snake(COLOR_GREEN, period=0.25, iterations=5, wait=True)
-        robot.led_ring.turn_off()
+        robot.led_ring.snake(COLOR_GREEN, period=0.25, iterations=5, wait=False)
+        return 0.25 * 5
         
     elif state == "MISMATCH_ROBOT":
         # Required: Solid Red.
         robot.led_ring.solid(COLOR_RED)
-        time.sleep(2.0)
-        robot.led_ring.turn_off()
+        return 2.0
 
     elif state == "MATCH_HUMAN":
         # Required: Snake Green.
-        robot.led_ring.snake(COLOR_GREEN, period=0.3, iterations= 4, wait=True)
-        robot.led_ring.turn_off()
+        robot.led_ring.snake(COLOR_GREEN, period=0.3, iterations= 4, wait=False)
+        return 0.3 * 4
         
     elif state == "MISMATCH_HUMAN":
         # Required: Solid Red.
         robot.led_ring.solid(COLOR_RED)
-        time.sleep(2.0)
-        robot.led_ring.turn_off()
+        return 2.0
         
     # --- Critical Failure States ---
     elif state == "SCAN_FAIL":
         # Fast Blinking Magenta
-        robot.led_ring.flash(COLOR_MAGENTA, period=0.35, iterations=5, wait=True) 
-        robot.led_ring.turn_off()
+        robot.led_ring.flash(COLOR_MAGENTA, period=0.35, iterations=5, wait=False) 
+        return 0.35 * 5
         
     elif state == "HOME":
         # Default state
-        robot.led_ring.solid(COLOR_BLUE)
\ No newline at end of file
+        robot.led_ring.solid(COLOR_BLUE)
+    return None
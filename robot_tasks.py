@@ -0,0 +1,58 @@
+import threading
+import time
+
+# ---------------------- CANCELLATION ----------------------
+# Robot macro-actions (pick/scan/drop, collect, place, dispose) are cancellable:
+# every motion segment goes through stackandunstack.safe_move(), which calls
+# check_cancelled() first. A RESTART_GAME/GOTO_INTRO entering the control lane of
+# square_queue calls request_cancel() from the GUI thread, so the robot thread
+# stops at the next segment boundary instead of finishing the whole action.
+
+
+class ActionCancelled(Exception):
+    """Raised at a segment boundary when the running macro-action was preempted."""
+
+
+_cancel_event = threading.Event()
+_cancel_lock = threading.Lock()
+_cancel_reason = None
+_cancel_requested_at = None
+
+ABORT_LATENCIES = []  # Seconds from request_cancel() to the arm being idle again
+
+
+def request_cancel(reason):
+    """Asks the running macro-action to stop at its next checkpoint (first request wins)."""
+    global _cancel_reason, _cancel_requested_at
+    with _cancel_lock:
+        if _cancel_event.is_set():
+            return
+        _cancel_reason = reason
+        _cancel_requested_at = time.perf_counter()
+        _cancel_event.set()
+    print(f"[CANCEL] Cancellation requested: {reason}")
+
+
+def cancel_requested():
+    return _cancel_event.is_set()
+
+
+def check_cancelled():
+    """Checkpoint between motion segments. Raises ActionCancelled if preempted."""
+    if _cancel_event.is_set():
+        raise ActionCancelled(_cancel_reason)
+
+
+def finish_cancel():
+    """Clears a pending cancellation. Returns the abort-to-idle latency in seconds, or None."""
+    global _cancel_reason, _cancel_requested_at
+    with _cancel_lock:
+        if not _cancel_event.is_set():
+            return None
+        latency = time.perf_counter() - _cancel_requested_at
+        reason = _cancel_reason
+        _cancel_reason = _cancel_requested_at = None
+        _cancel_event.clear()
+    ABORT_LATENCIES.append(latency)
+    print(f"[CANCEL] '{reason}' → idle in {latency * 1000:.0f} ms")
+    return latency
@@ -2,9 +2,22 @@ import cv2
 import numpy as np
 
 # -------- Global SIFT Detector and Matcher --------
+# Created on first use so importing this module stays cheap at startup.
 
-sift = cv2.SIFT_create()
-bf = cv2.BFMatcher(cv2.NORM_L2, crossCheck=False)
+sift = None
+bf = None
+
+def _get_sift():
+    global sift
+    if sift is None:
+        sift = cv2.SIFT_create()
+    return sift
+
+def _get_matcher():
+    global bf
+    if bf is None:
+        bf = cv2.BFMatcher(cv2.NORM_L2, crossCheck=False)
+    return bf
 
 # ----------- Feature Extraction ------------
 
@@ -16,7 +29,7 @@ def extract_sift_signature(image):
         or (None, None) if not enough features.
     """
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    kp, desc = sift.detectAndCompute(gray, None)
+    kp, desc = _get_sift().detectAndCompute(gray, None)
 
     if desc is None or len(desc) == 0:
         return None, None
@@ -34,7 +47,7 @@ def compute_knn_match_score(desc1, desc2, ratio_thresh=0.75):
     if desc1 is None or desc2 is None:
         return 0.0
 
-    matches = bf.knnMatch(desc1, desc2, k=2)
+    matches = _get_matcher().knnMatch(desc1, desc2, k=2)
     good = []
 
     for m_n in matches:
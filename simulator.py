@@ -0,0 +1,299 @@
+import sys
+import time
+import random
+from contextlib import contextmanager
+import numpy as np
+from board_geometry import BOARD
+from pose_graph import POSE_GRAPH, STACK_NAMES, pose_key, clear_node
+from recorded_positions import drop_positions
+import strategy_engine
+
+# ---------------------- MONTE-CARLO GAME SIMULATOR ----------------------
+# Plays thousands of games without robot, camera or GUI and collects the results in
+# NumPy arrays (one row per game). The game state is not batched across games: each
+# game is stepped in Python, because the robot's picks must come from the same
+# per-game policy code as live play rather than a vectorised copy of it that can
+# drift (it did: the copy broke ties at random). Every robot decision goes through
+# strategy_engine.robot_first_pick / robot_second_pick, the functions memory_logic
+# calls in a live game, fed the same state: memory in first-seen order, the partner
+# index and the arm location for the nearest-square tie-break. cross_check() replays
+# seeded games through memory_logic itself and asserts both pick the same squares.
+# The human is modelled as remembering every card but recalling a known pair
+# only with probability `human_recall`.
+# A scan error means the robot could not read a card: it is remembered without a
+# signature, so it is never indexed as half of a pair, and the recovery ladder costs
+# one extra scan motion.
+
+HUMAN, ROBOT = 0, 1
+MAX_ATTEMPTS = 400  # Safety cap; a game with perfect memory needs far fewer attempts
+
+
+class SimGame:
+    """One seeded game. The seed fixes the layout, the human's choices, the scan errors and the robot's random choices."""
+
+    def __init__(self, seed, difficulty="hard", human_recall=0.6, scan_error=0.02, objective="turns",
+                 robot_starts=False):
+        cards = [pair for pair in range(BOARD.pairs) for _ in range(2)]
+        random.Random(f"{seed}/layout").shuffle(cards)
+        self.seed = seed
+        self.cards = dict(zip(BOARD.squares, cards))   # square: pair id
+        self.rng = random.Random(f"{seed}/game")        # Human picks and scan errors
+        self.robot_rng = random.Random(f"{seed}/robot")  # Robot picks (memory_logic uses the global random)
+        self.difficulty = difficulty
+        self.objective = objective
+        self.human_recall = human_recall
+        self.scan_error = scan_error
+
+        self.on_board = set(BOARD.squares)
+        self.human_seen = set()
+        # The robot's memory, kept the way memory_logic keeps it
+        self.seen = {}          # square: readable, in first-seen order (memory_board)
+        self.matched = set()
+        self.partner_of = {}
+        self.known_pairs = set()
+        self.arm = None         # pose_key of the arm (POSE_GRAPH.location), None = home
+        self.disposed = 0
+
+        self.player = ROBOT if robot_starts else HUMAN
+        self.score = [0, 0]
+        self.turns = [0, 0]
+        self.turns[self.player] = 1
+        self.flips = self.rescans = 0
+        self.robot_picks = []   # (first, second) of every robot attempt
+
+    # ----------- Robot ------------
+
+    def singletons(self):
+        return [sq for sq in self.seen if sq not in self.matched and sq not in self.partner_of]
+
+    def robot_first(self):
+        unreadable = {sq for sq, readable in self.seen.items() if not readable}
+        pick, _, _ = strategy_engine.robot_first_pick(
+            self.difficulty, BOARD.squares, self.seen, self.matched, self.partner_of, self.known_pairs,
+            self.singletons(), self.arm, self.objective, unreadable, self.robot_rng)
+        return pick
+
+    def robot_second(self, first, first_was_new):
+        choice = strategy_engine.robot_second_pick(
+            self.difficulty, first, first_was_new, BOARD.squares, self.seen, self.matched, self.partner_of,
+            self.singletons(), self.arm, self.objective, self.robot_rng)
+        return choice[0] if choice else None
+
+    def forget_partner(self, square_id):
+        partner = self.partner_of.pop(square_id, None)
+        if partner is not None:
+            self.partner_of.pop(partner, None)
+            self.known_pairs.discard(tuple(sorted((square_id, partner))))
+
+    # ----------- Human ------------
+
+    def human_first(self, recall):
+        board = [sq for sq in BOARD.squares if sq in self.on_board]
+        if recall:
+            known = [sq for sq in board if sq in self.human_seen and self.partner(sq) in self.human_seen]
+            if known:
+                return self.rng.choice(known)
+        unseen = [sq for sq in board if sq not in self.human_seen]
+        return self.rng.choice(unseen or board)
+
+    def human_second(self, first, recall):
+        if recall and self.partner(first) in self.human_seen:
+            return self.partner(first)
+        others = [sq for sq in BOARD.squares if sq in self.on_board and sq != first]
+        unseen = [sq for sq in others if sq not in self.human_seen]
+        return self.rng.choice(unseen or others)
+
+    def partner(self, square_id):
+        return next(sq for sq in BOARD.squares if sq != square_id and self.cards[sq] == self.cards[square_id])
+
+    # ----------- One attempt ------------
+
+    def reveal(self, square_id, pending=None):
+        """Flips a card: the human sees it, the robot scans and stores it (index_partner on first sight)."""
+        self.flips += 1
+        self.human_seen.add(square_id)
+        self.arm = pose_key(drop_positions[square_id])
+        readable = self.rng.random() >= self.scan_error
+        if not readable:
+            self.rescans += 1
+        newly_seen = square_id not in self.seen
+        self.seen[square_id] = readable
+        if newly_seen and readable and square_id not in self.partner_of:
+            for sq in self.seen:
+                if (sq not in (square_id, pending) and self.seen[sq] and sq not in self.matched
+                        and sq not in self.partner_of and self.cards[sq] == self.cards[square_id]):
+                    self.partner_of[square_id], self.partner_of[sq] = sq, square_id
+                    self.known_pairs.add(tuple(sorted((square_id, sq))))
+                    break
+
+    def attempt(self):
+        """Plays one two-flip attempt. Returns False once the game is over."""
+        if self.player == ROBOT:
+            first = self.robot_first()
+            if first is None:
+                return False
+            first_was_new = first not in self.seen
+            self.reveal(first)
+            second = self.robot_second(first, first_was_new)
+            self.robot_picks.append((first, second))
+            if second is None:
+                return False
+        else:
+            recall = self.rng.random() < self.human_recall
+            first = self.human_first(recall)
+            self.reveal(first)
+            second = self.human_second(first, recall)
+        self.reveal(second, pending=first)
+
+        if self.cards[first] != self.cards[second]:
+            if self.partner_of.get(first) == second:
+                self.forget_partner(first)
+            self.player = 1 - self.player
+            self.turns[self.player] += 1
+            return True
+
+        self.score[self.player] += 1
+        self.on_board -= {first, second}
+        self.matched.update((first, second))
+        self.forget_partner(first)
+        self.forget_partner(second)
+        for _ in range(2):   # Both cards go to the disposal stacks
+            stack = STACK_NAMES[BOARD.stack_for(self.disposed, len(STACK_NAMES))]
+            self.arm = pose_key(POSE_GRAPH.poses[clear_node(stack)])
+            self.disposed += 1
+        return bool(self.on_board)
+
+    def play(self):
+        attempts = 0
+        while attempts < MAX_ATTEMPTS and self.attempt():
+            attempts += 1
+        return self
+
+
+@contextmanager
+def borrowed_live_state():
+    """
+    Lends memory_logic's state (and the global random it draws from) to LiveGame games,
+    and puts it back afterwards. The board locks are held throughout, so a running
+    game's threads never see the borrowed state.
+    """
+    import memory_logic as ml
+    with ml.board_lock, ml.pairs_lock:
+        saved = (random.getstate(), dict(ml.memory_board), set(ml.matched_squares), dict(ml.partner_of),
+                 set(ml.known_pairs), list(ml.game_history), ml.DIFFICULTY, ml.STRATEGY_OBJECTIVE,
+                 POSE_GRAPH.location)
+        try:
+            yield
+        finally:
+            (rng_state, board, matched, partners, pairs, history,
+             ml.DIFFICULTY, ml.STRATEGY_OBJECTIVE, POSE_GRAPH.location) = saved
+            random.setstate(rng_state)
+            for live, copy in ((ml.memory_board, board), (ml.matched_squares, matched),
+                               (ml.partner_of, partners), (ml.known_pairs, pairs)):
+                live.clear()
+                live.update(copy)
+            ml.game_history[:] = history
+
+
+class LiveGame(SimGame):
+    """The same game, but the robot's picks come from memory_logic's live code path (inside borrowed_live_state())."""
+
+    def play(self):
+        random.seed(f"{self.seed}/robot")
+        return super().play()
+
+    def _load(self):
+        """Copies the robot's memory into memory_logic's globals (no board_changed: the planner stays off)."""
+        import memory_logic
+        memory_logic.memory_board.clear()
+        for sq, readable in self.seen.items():
+            signature = np.zeros(1) if readable else None
+            memory_logic.memory_board[sq] = {"mean": signature, "desc": signature}
+        memory_logic.matched_squares.clear()
+        memory_logic.matched_squares.update(self.matched)
+        memory_logic.partner_of.clear()
+        memory_logic.partner_of.update(self.partner_of)
+        memory_logic.known_pairs.clear()
+        memory_logic.known_pairs.update(self.known_pairs)
+        memory_logic.DIFFICULTY = self.difficulty
+        memory_logic.STRATEGY_OBJECTIVE = self.objective
+        POSE_GRAPH.location = self.arm
+        return memory_logic
+
+    def robot_first(self):
+        _, pick, _, _ = self._load().plan_first_pick()
+        return pick
+
+    def robot_second(self, first, first_was_new):
+        return self._load().choose_second_pick(first, first_was_new)
+
+
+class BatchSimulator:
+    """Plays `games` seeded games one after the other and summarises them."""
+
+    def __init__(self, difficulty="hard", games=10000, human_recall=0.6, scan_error=0.02,
+                 objective="turns", seed=None):
+        self.games = games
+        base = seed if seed is not None else random.randrange(2 ** 32)
+        # Alternate who starts
+        self.sims = [SimGame(f"{base}:{g}", difficulty, human_recall, scan_error, objective, robot_starts=g % 2 == 1)
+                     for g in range(games)]
+
+    def run(self):
+        for game in self.sims:
+            game.play()
+        score = np.array([game.score for game in self.sims])
+        turns = np.array([game.turns for game in self.sims])
+        flips = np.array([game.flips for game in self.sims])
+        rescans = np.array([game.rescans for game in self.sims])
+        disposed = np.array([game.disposed for game in self.sims])
+        robot, human = score[:, ROBOT], score[:, HUMAN]
+        return {
+            "games":        self.games,
+            "robot_wins":   float(np.mean(robot > human)),
+            "human_wins":   float(np.mean(human > robot)),
+            "ties":         float(np.mean(robot == human)),
+            "robot_pairs":  float(robot.mean()),
+            "turns":        float(turns.sum(axis=1).mean()),
+            "robot_turns":  float(turns[:, ROBOT].mean()),
+            # Every flip is a pick-scan-drop cycle; every matched pair is disposed with two more motions
+            "robot_motions": float((flips + rescans + disposed).mean()),
+            "rescans":      float(rescans.mean()),
+        }
+
+
+def compare_difficulties(games=10000, human_recall=0.6, scan_error=0.02, seed=0):
+    results = {}
+    for difficulty in strategy_engine.DIFFICULTY_PROFILES:
+        started = time.perf_counter()
+        stats = BatchSimulator(difficulty, games, human_recall, scan_error, seed=seed).run()
+        elapsed = time.perf_counter() - started
+        results[difficulty] = stats
+        print(f"[SIM] {difficulty:<6} robot wins {stats['robot_wins'] * 100:5.1f}%  ties {stats['ties'] * 100:4.1f}%  "
+              f"{stats['turns']:.1f} turns/game ({stats['robot_turns']:.1f} robot)  "
+              f"{stats['robot_motions']:.1f} arm motions/game  [{games / elapsed:,.0f} games/s]")
+    return results
+
+
+def cross_check(games=5, human_recall=0.6, scan_error=0.1, seed=0):
+    """Plays seeded games through the simulator and through memory_logic; both must pick the same squares."""
+    picks = 0
+    for difficulty in strategy_engine.DIFFICULTY_PROFILES:
+        for g in range(games):
+            args = (f"check{seed}:{g}", difficulty, human_recall, scan_error, "turns", g % 2 == 1)
+            simulated = SimGame(*args).play()
+            with borrowed_live_state():
+                live = LiveGame(*args).play()
+            assert simulated.robot_picks == live.robot_picks, (
+                f"{difficulty} game {g}: simulator {simulated.robot_picks} != memory_logic {live.robot_picks}")
+            picks += len(simulated.robot_picks)
+    print(f"[SIM] Cross-check OK: {picks} robot attempts in {games} seeded games per difficulty "
+          f"pick the same squares as memory_logic")
+
+
+if __name__ == "__main__":
+    # python simulator.py [games] [human_recall] [scan_error]
+    args = [float(a) for a in sys.argv[1:4]]
+    games = int(args[0]) if args else 10000
+    cross_check()
+    compare_difficulties(games, *args[1:])
@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+import trace_recorder
+
+# ---------------------- SPAN TRACING ----------------------
+# Lightweight nested timings for "where did this turn go". A span is one timed
+# block on one thread. Spans nest per thread, and each one also records its self
+# time (its duration minus its children's), so self times add up without double
+# counting. Finished spans go into a fixed-size ring buffer, tagged with the turn
+# they started in and with the card (square) they belong to, when there is one.
+# Turn boundaries come from memory_logic. A span that is still running when the
+# turn changes stays with the turn it started in.
+# While a Chrome trace is recorded (trace_recorder), every span is also written to
+# the timeline.
+
+SPAN_BUFFER_SIZE = 8192
+
+_local = threading.local()
+_spans = deque(maxlen=SPAN_BUFFER_SIZE)  # (turn, name, thread, start, duration, self_time, square, depth)
+_lock = threading.Lock()
+_turn = {"id": 0, "player": None, "started": time.perf_counter()}
+_game_turns = []    # Finished turn summaries of the current game
+last_turn = None    # Summary of the last finished turn, for the GUI
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+@contextmanager
+def span(name, square=None, args=None):
+    """
+    Times the enclosed block as `name`. square defaults to the enclosing span's.
+    args are only used by the trace timeline.
+    """
+    stack = _stack()
+    if square is None and stack:
+        square = stack[-1]["square"]
+    frame = {"children": 0.0, "square": square}
+    stack.append(frame)
+    turn = _turn["id"]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        stack.pop()
+        if stack:
+            stack[-1]["children"] += duration
+        _spans.append((turn, name, threading.current_thread().name, start, duration,
+                       duration - frame["children"], square, len(stack)))
+        tracer = trace_recorder.recorder
+        if tracer is not None:
+            tracer.complete(name, "span", start, duration, dict(args or {}, square=square) if square else args)
+
+
+def traced(name=None):
+    """Decorator form of span(); the span is named after the function by default."""
+    def decorate(func):
+        label = name or func.__name__
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record(name, start, end, square=None):
+    """Adds an already measured interval (e.g. a queue hop) as a top-level span."""
+    _spans.append((_turn["id"], name, threading.current_thread().name, start, end - start,
+                   end - start, square, 0))
+
+
+# ----------- Turns ------------
+
+def _summarize(turn_id, player, started, ended):
+    by_name = {}
+    cards = {}
+    for turn, name, _, _, duration, self_time, square, _ in list(_spans):
+        if turn != turn_id:
+            continue
+        stats = by_name.setdefault(name, {"count": 0, "total": 0.0, "self": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += duration
+        stats["self"] += self_time
+        stats["max"] = max(stats["max"], duration)
+        if square is not None:
+            cards[square] = cards.get(square, 0.0) + self_time
+    return {"turn": turn_id, "player": player, "wall": ended - started, "spans": by_name, "cards": cards}
+
+
+def begin_turn(player):
+    """Closes the running turn and starts a new one for `player`. Returns the closed turn's summary."""
+    global last_turn
+    now = time.perf_counter()
+    with _lock:
+        turn_id, previous, started = _turn["id"], _turn["player"], _turn["started"]
+        _turn.update(id=turn_id + 1, player=player, started=now)
+    if previous is None:
+        return None
+    summary = _summarize(turn_id, previous, started, now)
+    with _lock:
+        _game_turns.append(summary)
+        last_turn = summary
+    return summary
+
+
+def summary_lines(summary=None, top=4):
+    """Short text lines for the GUI sidebar: turn wall time and the biggest self times."""
+    summary = summary or last_turn
+    if summary is None:
+        return []
+    lines = [f"{summary['player'].capitalize()} turn: {summary['wall']:.1f} s"]
+    ranked = sorted(summary["spans"].items(), key=lambda kv: kv[1]["self"], reverse=True)
+    for name, stats in ranked[:top]:
+        lines.append(f"{name}: {stats['self']:.1f} s" + (f" ×{stats['count']}" if stats["count"] > 1 else ""))
+    return lines
+
+
+def print_game_report():
+    """Per-turn and per-card breakdown of the game so far, then starts a new one."""
+    with _lock:
+        turns, _game_turns[:] = list(_game_turns), []
+    if not turns:
+        return
+    print("[SPANS] ---------- Turn breakdown (self time) ----------")
+    totals = {}
+    for summary in turns:
+        ranked = sorted(summary["spans"].items(), key=lambda kv: kv[1]["self"], reverse=True)
+        parts = ", ".join(f"{name} {stats['self']:.1f}" for name, stats in ranked[:5])
+        print(f"[SPANS] turn {summary['turn']:<3} {summary['player']:<5} {summary['wall']:6.1f} s  {parts}")
+        for name, stats in summary["spans"].items():
+            total = totals.setdefault(name, {"count": 0, "total": 0.0, "self": 0.0, "max": 0.0})
+            total["count"] += stats["count"]
+            total["total"] += stats["total"]
+            total["self"] += stats["self"]
+            total["max"] = max(total["max"], stats["max"])
+    print("[SPANS] ---------- Game totals ----------")
+    for name, stats in sorted(totals.items(), key=lambda kv: kv[1]["self"], reverse=True):
+        print(f"[SPANS] {name:<22} n={stats['count']:<5} self={stats['self']:7.1f} s  "
+              f"total={stats['total']:7.1f} s  max={stats['max'] * 1000:8.0f} ms")
+    cards = {}
+    for summary in turns:
+        for square, seconds in summary["cards"].items():
+            cards.setdefault(square, []).append(seconds)
+    if cards:
+        per_card = ", ".join(f"{sq} {sum(v) / len(v):.1f}" for sq, v in sorted(cards.items()))
+        print(f"[SPANS] Mean seconds per card visit: {per_card}")
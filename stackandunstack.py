@@ -1,20 +1,39 @@
 import os
 import time
 import random
-from pyniryo2 import NiryoRobot
 from recorded_positions import pick_positions, drop_positions, home_pose, L1, L2, R1, R2
-from config import ROBOT_IP_ADDRESS
+from robot_tasks import ActionCancelled, check_cancelled
+from pose_graph import POSE_GRAPH, STACK_NAMES, pick_node, clear_node
+from board_geometry import BOARD, ALL_SQUARE_IDS
+from spans import traced
 
 CARD_THICKNESS = 0.003
-CARDS_PER_STACK = 5
-BOARD_ROWS = ["A", "B", "C", "D"]
-ALL_SQUARE_IDS = [r + c for r in BOARD_ROWS for c in "12345"]
+# The whole board fits on the stacks: 5 cards each for 4×5, 16 for 8×8
+CARDS_PER_STACK = BOARD.cards_per_stack(len(STACK_NAMES))
 
+# Pick heights recorded on the 4×5 table, one per pick from a 5-card stack
+RECORDED_STACK_PICK_Z = [0.065, 0.065, 0.06, 0.06, 0.06]
+RECORDED_STACK_CARDS  = len(RECORDED_STACK_PICK_Z)
+
+def stack_pick_z(stack_cards, i):
+    """
+    Pick height for the i-th pick (0-based) from a stack of stack_cards cards.
+    Stacks up to the recorded size use the recorded heights as they are; on a bigger
+    stack every card above the recorded five lifts the top by CARD_THICKNESS.
+    """
+    if stack_cards <= RECORDED_STACK_CARDS:
+        return RECORDED_STACK_PICK_Z[i]
+    extra = stack_cards - i - RECORDED_STACK_CARDS
+    if extra > 0:
+        return RECORDED_STACK_PICK_Z[0] + extra * CARD_THICKNESS
+    return RECORDED_STACK_PICK_Z[-extra]
+
+# Collection fills the stacks in order, CARDS_PER_STACK squares each (one row each on 4×5)
 STACK_MAP = {
-    "A": {"id": "L1", "pose": L1, "count": 0},
-    "B": {"id": "L2", "pose": L2, "count": 0},
-    "C": {"id": "R1", "pose": R1, "count": 0},
-    "D": {"id": "R2", "pose": R2, "count": 0},
+    "L1": {"id": "L1", "pose": L1, "count": 0},
+    "L2": {"id": "L2", "pose": L2, "count": 0},
+    "R1": {"id": "R1", "pose": R1, "count": 0},
+    "R2": {"id": "R2", "pose": R2, "count": 0},
 }
 STACKS_DATA = {
     "L1": L1,
@@ -25,8 +44,20 @@ STACKS_DATA = {
 
 def safe_move(robot, pose):
     """Helper function to execute arm movement with exception handling."""
-    robot.arm.move_pose(pose)
+    # Cancellation checkpoint: a restart preempts the action before the next segment
+    check_cancelled()
+    POSE_GRAPH.move(robot, pose)
+
+def recovery_move(robot, pose):
+    """Move for abort/emergency paths: no cancellation checkpoint, but location stays tracked."""
+    POSE_GRAPH.move(robot, pose)
 
+def travel(robot, name):
+    """Moves to a named pose along the cheapest safe path of the pose graph."""
+    for hop in POSE_GRAPH.route(name):
+        safe_move(robot, POSE_GRAPH.poses[hop])
+
+@traced("collect_cards")
 def collect_cards_to_stacks(robot):
 
     print("[SETUP] Starting card collection from board...")
@@ -36,9 +67,8 @@ def collect_cards_to_stacks(robot):
     for info in STACK_MAP.values():
         info["count"] = 0
 
-    for slot_id in ALL_SQUARE_IDS:
-        row_id = slot_id[0]
-        stack_info = STACK_MAP[row_id]
+    for n, slot_id in enumerate(ALL_SQUARE_IDS):
+        stack_info = STACK_MAP[STACK_NAMES[BOARD.stack_for(n, len(STACK_NAMES))]]
 
         board_pick_pose = pick_positions.get(slot_id)
         board_safe_pose = drop_positions.get(slot_id)
@@ -74,6 +104,8 @@ def collect_cards_to_stacks(robot):
             # D. Update Stack Count
             stack_info["count"] += 1
 
+        except ActionCancelled:
+            raise
         except Exception as e:
             print(f"[FATAL ERROR] Robot movement failed during collection of {slot_id}: {e}")
             robot.tool.release_with_tool()
@@ -84,9 +116,13 @@ def collect_cards_to_stacks(robot):
     safe_move(robot, home_pose)
 
 
+@traced("place_cards")
 def place_initial_cards(robot):
+    global TOTAL_DISPOSED_CARDS
 
     print("[SETUP] Starting automatic card placement...")
+    # Every card leaves the stacks, so the next game fills them from the first one again
+    TOTAL_DISPOSED_CARDS = 0
 
     target_slots = ALL_SQUARE_IDS[:]
     random.shuffle(target_slots)
@@ -94,19 +130,17 @@ def place_initial_cards(robot):
     safe_move(robot, home_pose)
     
     card_placed_count = 0
-    stack_ids = ["L1", "L2", "R1", "R2"]
+    stack_ids = STACK_NAMES
 
     for idx, stack_id in enumerate(stack_ids):
-        for i in range(5):
+        stack_cards = min(CARDS_PER_STACK, len(target_slots))
+        for i in range(stack_cards):
             target_id = target_slots.pop(0)
 
             stack_pick_pose = STACKS_DATA.get(stack_id)[:]
 
-            # Adjust Z value based on pick count
-            if i < 2:
-                stack_pick_pose[2] = 0.065
-            else:
-                stack_pick_pose[2] = 0.06
+            # The stack gets one card thinner with every pick
+            stack_pick_pose[2] = stack_pick_z(stack_cards, i)
 
             # Safe height above current stack
             stack_safe_pose = stack_pick_pose[:]
@@ -118,7 +152,7 @@ def place_initial_cards(robot):
                 print(f"[ERROR] Missing pose for stack {stack_id} or target {target_id}. Aborting.")
                 return
 
-            print(f"[MOVE] Placing card {card_placed_count+1}/20: From {stack_id} to {target_id}")
+            print(f"[MOVE] Placing card {card_placed_count+1}/{BOARD.size}: From {stack_id} to {target_id}")
 
             try:
                 # Pick from Stack
@@ -137,6 +171,8 @@ def place_initial_cards(robot):
                 
                 card_placed_count += 1
 
+            except ActionCancelled:
+                raise
             except Exception as e:
                 print(f"[FATAL ERROR] Robot movement failed during placement: {e}")
                 robot.tool.release_with_tool()
@@ -162,43 +198,35 @@ def place_initial_cards(robot):
 
 # Global state to track ALL cards disposed so far
 TOTAL_DISPOSED_CARDS = 0 
-CARD_THICKNESS = 0.003
-CARDS_PER_STACK = 5
 
-# Array of all four stack poses in sequence
-STACK_POSES_SEQUENCE = [L1, L2, R1, R2] 
+# Stacks in fill order (pose graph node names)
+STACK_POSES_SEQUENCE = STACK_NAMES
 
 
+@traced("dispose_held")
 def dispose_card_2_held(robot, card_id):
     """
-    Disposes of the currently held card (Card 2) by moving directly to the stack,
-    dropping it, and lifting up for the next move, skipping all intermediate poses.
+    Disposes of the currently held card (Card 2). The pose graph chains the move
+    from the board clearance height to the clearance pose above the stack, then
+    drops onto it and lifts back out.
     """
     global TOTAL_DISPOSED_CARDS
     
     # 1. DETERMINE TARGET STACK (Ignoring thickness, Z is fixed)
-    stack_index = TOTAL_DISPOSED_CARDS // CARDS_PER_STACK 
-    base_stack_pose = STACK_POSES_SEQUENCE[stack_index]
-    stack_target_pose = base_stack_pose[:] # Use fixed Z
-    
-    # We must calculate a clearance height above the stack to avoid collision on exit
-    stack_clearance_pose = stack_target_pose[:]
-    stack_clearance_pose[2] += 0.05 # Add a minimal clearance (e.g., 5cm)
+    stack_index = BOARD.stack_for(TOTAL_DISPOSED_CARDS, len(STACK_POSES_SEQUENCE))
+    stack_name = STACK_POSES_SEQUENCE[stack_index]
 
     print(f"[DISPOSE] Stacking {card_id} (HELD) on Stack {stack_index+1} (Fixed Z)")
 
     try:
-        # A. Move to Stack
-        # Move directly to the clearance pose above the stack
-        robot.arm.move_pose(stack_clearance_pose) 
-        robot.arm.move_pose(stack_target_pose) # Drop down to fixed Z
+        travel(robot, stack_name)
         robot.tool.release_with_tool()
-        
-        # B. Lift and Update Counter
-        robot.arm.move_pose(stack_clearance_pose) # Lift up to clear the card
+        travel(robot, clear_node(stack_name))  # Lift straight up before moving on
         TOTAL_DISPOSED_CARDS += 1
         return True
 
+    except ActionCancelled:
+        raise
     except Exception as e:
         print(f"[FATAL ERROR] Disposal failed for HELD card {card_id}: {e}")
         robot.tool.release_with_tool()
@@ -206,57 +234,49 @@ def dispose_card_2_held(robot, card_id):
 
 # --- Inside your robot control file (e.g., memory_robot.py) ---
 
+@traced("dispose_on_board")
 def dispose_card_1_on_board(robot, card_id):
     """
-    Disposes of the card currently ON THE BOARD (Card 1), picking it up
-    and placing it on the stack without using intermediate home poses.
+    Disposes of the card currently ON THE BOARD (Card 1): picks it through its
+    clearance pose and carries it to the stack along the pose graph.
     """
     global TOTAL_DISPOSED_CARDS
     
     # 1. DETERMINE TARGET STACK
-    stack_index = TOTAL_DISPOSED_CARDS // CARDS_PER_STACK 
-    base_stack_pose = STACK_POSES_SEQUENCE[stack_index]
-    
-    # Calculate fixed Z poses
-    stack_target_pose = base_stack_pose[:] 
-    stack_clearance_pose = stack_target_pose[:]
-    stack_clearance_pose[2] += 0.05 
-    
-    board_pick_pose = pick_positions.get(card_id)
-    board_clearance_pose = drop_positions.get(card_id) # Use drop_pose for board clearance
+    stack_index = BOARD.stack_for(TOTAL_DISPOSED_CARDS, len(STACK_POSES_SEQUENCE))
+    stack_name = STACK_POSES_SEQUENCE[stack_index]
 
-    if not board_pick_pose or not board_clearance_pose:
+    if card_id not in pick_positions or card_id not in drop_positions:
         print(f"[ERROR] Missing pick pose for {card_id}. Cannot dispose.")
         return False
 
     print(f"[DISPOSE] Picking {card_id} from board and stacking on Stack {stack_index+1}")
 
     try:
-        # A. Pick from Board (Go to clearance, pick, then lift)
-        robot.arm.move_pose(board_clearance_pose)
-        robot.arm.move_pose(board_pick_pose)
+        # A. Pick from Board (the route descends through the square's clearance pose)
+        travel(robot, pick_node(card_id))
         robot.tool.grasp_with_tool()
-        robot.arm.move_pose(board_clearance_pose) # Lift the card up for transit
-        
-        # B. Move to Stack (Travel from board clearance pose directly to stack clearance pose)
-        robot.arm.move_pose(stack_clearance_pose) 
-        robot.arm.move_pose(stack_target_pose) # Drop down
+
+        # B. Move to Stack (lifts back to clearance, chains across at that height, drops onto the stack)
+        travel(robot, stack_name)
         robot.tool.release_with_tool()
-        
-        # C. Lift and Update Counter
-        robot.arm.move_pose(stack_clearance_pose) 
+
+        # C. Lift straight up before moving on
+        travel(robot, clear_node(stack_name))
         TOTAL_DISPOSED_CARDS += 1
         
         return True
     
+    except ActionCancelled:
+        raise
     except Exception as e:
         print(f"[FATAL ERROR] Disposal failed for ON-BOARD card {card_id}: {e}")
         robot.tool.release_with_tool()
         return False
 
 if __name__ == "__main__":
-    from pyniryo2 import NiryoRobot
-    robot = NiryoRobot(ROBOT_IP_ADDRESS)
+    from robot_interface import get_robot
+    robot = get_robot()
     robot.tool.release_with_tool()
     robot.arm.calibrate_auto()
     place_initial_cards(robot)
\ No newline at end of file
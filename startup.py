@@ -0,0 +1,50 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# ---------------------- STARTUP TIMING ----------------------
+# Imported first by main.py so STARTUP_T0 is as close to process start as we can get.
+STARTUP_T0 = time.perf_counter()
+
+_lock = threading.Lock()
+_stages = []          # (thread_name, stage_name, start_s, end_s) relative to STARTUP_T0
+_ready = {}           # component: seconds since STARTUP_T0
+EXPECTED_COMPONENTS = ("gui", "robot")
+
+
+def _now():
+    return time.perf_counter() - STARTUP_T0
+
+
+@contextmanager
+def startup_stage(name):
+    """Times one startup stage on the calling thread."""
+    start = _now()
+    try:
+        yield
+    finally:
+        with _lock:
+            _stages.append((threading.current_thread().name, name, start, _now()))
+
+
+def mark_ready(component):
+    """Marks a component (gui/robot) as ready; prints the report once all are up."""
+    with _lock:
+        if component in _ready:
+            return
+        _ready[component] = _now()
+        print(f"[STARTUP] {component} ready after {_ready[component] * 1000:.0f} ms")
+        all_ready = all(c in _ready for c in EXPECTED_COMPONENTS)
+    if all_ready:
+        print_startup_report()
+
+
+def print_startup_report():
+    with _lock:
+        stages = sorted(_stages, key=lambda s: s[2])
+        ready = dict(_ready)
+    print("[STARTUP] ---------- Startup timing ----------")
+    for thread_name, name, start, end in stages:
+        print(f"[STARTUP] {thread_name:<12} {name:<32} {start * 1000:7.0f} → {end * 1000:7.0f} ms  ({(end - start) * 1000:.0f} ms)")
+    for component, t in sorted(ready.items(), key=lambda kv: kv[1]):
+        print(f"[STARTUP] {component} ready at {t * 1000:.0f} ms")
@@ -0,0 +1,359 @@
+import math
+import random
+from functools import lru_cache
+from recorded_positions import drop_positions, home_pose
+from board_geometry import BOARD
+
+# ---------------------- STRATEGY ENGINE ----------------------
+# Perfect-memory play for the two-player memory game, after Zwick & Paterson's
+# expected-value analysis. A position is (n, k): n pairs left on the board, k of
+# them with exactly one card seen ("known singletons"). Complete known pairs are
+# always taken first, so they are not part of the position. Both players are
+# assumed to remember every revealed card.
+# By default each pick minimises the expected number of remaining turns
+# (turns_after), for shorter games. value(n, k), the expected pair margin (own
+# pairs - opponent's pairs) for the player to move, backs the opt-in "margin"
+# objective, which wins more pairs at the cost of longer games.
+#
+# The engine only decides *what kind* of card to flip. Which square of that kind
+# is flipped does not change the odds, so the tie is broken by travel distance
+# from the arm.
+
+UNSEEN = "unseen"  # flip a card nobody has seen yet
+KNOWN  = "known"   # flip a known singleton: no new information for the opponent
+
+# How each difficulty plays. "forget_pairs" is the chance of ignoring a known pair
+# at the first pick; non-engine difficulties flip unseen cards at random otherwise.
+DIFFICULTY_PROFILES = {
+    "hard":   {"engine": True,  "forget_pairs": 0.0},
+    "medium": {"engine": False, "forget_pairs": 0.5},
+    "easy":   {"engine": False, "forget_pairs": 1.0},
+}
+
+
+@lru_cache(maxsize=None)
+def value(n, k):
+    """Expected pair margin for the player to move in position (n, k)."""
+    if n == 0:
+        return 0.0
+    best = _first_unseen_value(n, k)
+    if k:
+        best = max(best, _first_known_value(n, k))
+    return best
+
+
+def _first_unseen_value(n, k):
+    unseen = 2 * n - k
+    total = k * (1 + value(n - 1, k - 1)) if k else 0.0  # Matches a known singleton: take it
+    if unseen > k:
+        total += (unseen - k) * max(second_pick_values(n, k).values())
+    return total / unseen
+
+
+def _first_known_value(n, k):
+    # Flip known card A, then an unseen card
+    unseen = 2 * n - k
+    total = 1 + value(n - 1, k - 1)                     # It is A's partner
+    total += (k - 1) * (-1 - value(n - 1, k - 1))       # Completes another known pair: opponent takes it
+    if unseen > k:
+        total += (unseen - k) * -value(n, k + 1)        # A new card
+    return total / unseen
+
+
+@lru_cache(maxsize=None)
+def second_pick_values(n, k):
+    """
+    Values of the second pick after the first card turned out to be new.
+    k counts the known singletons besides that first card.
+    """
+    unseen = 2 * n - k - 1
+    new_cards = unseen - 1 - k
+    total = 1 + value(n - 1, k)                         # Matches the first card
+    total += k * (-1 - value(n - 1, k))                 # Completes a known pair for the opponent
+    if new_cards:
+        total += new_cards * -value(n, k + 2)
+    values = {UNSEEN: total / unseen}
+    if k:
+        values[KNOWN] = -value(n, k + 1)                # Deliberate miss
+    return values
+
+
+# ---------------------- EXPECTED TURNS ----------------------
+# turns_after(n, k): expected number of turns still to start after the current one,
+# for the player to move in (n, k), when every pick minimises it. A turn continues
+# after each match and ends on the first mismatch.
+
+@lru_cache(maxsize=None)
+def turns_after(n, k):
+    if n == 0:
+        return 0.0
+    best = _first_unseen_turns(n, k)
+    if k:
+        best = min(best, _first_known_turns(n, k))
+    return best
+
+
+def _next_turn(n, k):
+    """Turns left once the opponent starts a turn in (n, k) (known pairs already taken)."""
+    return 1 + turns_after(n, k) if n else 0.0
+
+
+def _first_unseen_turns(n, k):
+    unseen = 2 * n - k
+    total = k * turns_after(n - 1, k - 1) if k else 0.0
+    if unseen > k:
+        total += (unseen - k) * min(second_pick_turns(n, k).values())
+    return total / unseen
+
+
+def _first_known_turns(n, k):
+    unseen = 2 * n - k
+    total = turns_after(n - 1, k - 1)
+    total += (k - 1) * _next_turn(n - 1, k - 1)
+    if unseen > k:
+        total += (unseen - k) * _next_turn(n, k + 1)
+    return total / unseen
+
+
+@lru_cache(maxsize=None)
+def second_pick_turns(n, k):
+    unseen = 2 * n - k - 1
+    new_cards = unseen - 1 - k
+    total = turns_after(n - 1, k)
+    total += k * _next_turn(n - 1, k)
+    if new_cards:
+        total += new_cards * _next_turn(n, k + 2)
+    values = {UNSEEN: total / unseen}
+    if k:
+        values[KNOWN] = _next_turn(n, k + 1)
+    return values
+
+
+# ---------------------- POLICY ----------------------
+# "turns" (the default) minimises the expected number of remaining turns, for the
+# shortest games; "margin" maximises the expected pair margin instead.
+
+def first_pick_kind(n, k, objective="turns"):
+    if not k:
+        return UNSEEN
+    if objective == "turns":
+        return KNOWN if _first_known_turns(n, k) < _first_unseen_turns(n, k) else UNSEEN
+    return KNOWN if _first_known_value(n, k) > _first_unseen_value(n, k) else UNSEEN
+
+
+def second_pick_kind(n, k, objective="turns"):
+    if objective == "turns":
+        values = second_pick_turns(n, k)
+        return min(values, key=lambda kind: (values[kind], kind != UNSEEN))
+    values = second_pick_values(n, k)
+    return max(values, key=lambda kind: (values[kind], kind == UNSEEN))
+
+
+def engine_policy(n, k, objective="turns"):
+    """(first kind, second kind) in position (n, k). The second kind applies when the first card is new."""
+    second = second_pick_kind(n, k, objective) if k < n else UNSEEN
+    return first_pick_kind(n, k, objective), second
+
+
+def policy_table(max_pairs=BOARD.pairs, objective="turns"):
+    """{(n, k): (first kind, second kind)} for every reachable position, for simulations."""
+    return {(n, k): engine_policy(n, k, objective) for n in range(1, max_pairs + 1) for k in range(n + 1)}
+
+
+# ---------------------- SQUARE SELECTION ----------------------
+
+def nearest_square(squares, arm_pose=None):
+    """Closest square to the arm (by its clearance pose), ties broken by name."""
+    xyz = (arm_pose or home_pose)[:3]
+    return min(squares, key=lambda sq: (math.dist(drop_positions[sq][:3], xyz), sq))
+
+
+def choose_first(known_pairs, singletons, unseen, arm_pose=None, objective="turns"):
+    """
+    First pick of a turn. Returns (square, event, data) for log_move, or None if idle.
+    known_pairs are (sq1, sq2) tuples, singletons the seen squares with no known partner.
+    """
+    if known_pairs:
+        nearest = nearest_square([sq for pair in known_pairs for sq in pair], arm_pose)
+        pair = next(p for p in known_pairs if nearest in p)
+        return nearest, "robot_confident_pair_match", pair
+    if not unseen and not singletons:
+        return None
+    # Misread cards can make the counts inconsistent; keep the position valid
+    n = max(1, (len(unseen) + len(singletons)) // 2)
+    k = min(len(singletons), n)
+    if not unseen or first_pick_kind(n, k, objective) == KNOWN:
+        square = nearest_square(singletons, arm_pose)
+        return square, "robot_flip_known", square
+    square = nearest_square(unseen, arm_pose)
+    return square, "robot_flip_unseen", square
+
+
+def choose_second(first_was_new, singletons, unseen, arm_pose=None, objective="turns"):
+    """
+    Second pick once the first card is revealed and has no known partner.
+    singletons excludes the first card. Returns (square, event) or None.
+    """
+    k = len(singletons)
+    if not unseen:
+        return (nearest_square(singletons, arm_pose), "robot_second_pick_known") if singletons else None
+    n = max(1, (len(unseen) + k + 1) // 2)
+    k = min(k, n - 1)
+    if first_was_new and singletons and second_pick_kind(n, k, objective) == KNOWN:
+        return nearest_square(singletons, arm_pose), "robot_second_pick_known"
+    return nearest_square(unseen, arm_pose), "robot_second_pick_unseen"
+
+
+# ---------------------- ROBOT POLICY ----------------------
+# The robot's picks for every difficulty, from plain game state, so live games
+# (memory_logic) and the Monte-Carlo simulator make the same decisions. `seen` is the
+# robot's memory in the order cards were first seen (a dict or anything ordered that
+# supports `in`), `unreadable` the seen squares without a usable signature, and `rng`
+# draws the random choices of the non-engine difficulties.
+
+def robot_first_pick(difficulty, squares, seen, matched, partner_of, known_pairs, singletons,
+                     arm_pose=None, objective="turns", unreadable=(), rng=random):
+    """First pick of a robot turn. Returns (square, event, data) for log_move; square is None when idle."""
+    profile = DIFFICULTY_PROFILES.get(difficulty, DIFFICULTY_PROFILES["easy"])
+    if profile["engine"]:
+        # Perfect memory: the engine picks the card kind, travel distance the square
+        choice = choose_first(sorted(known_pairs), singletons,
+                              [sq for sq in squares if sq not in seen], arm_pose, objective)
+        return choice or (None, "robot_idle", None)
+
+    # Confident match, unless this turn forgets it (e.g. medium: 50% chance)
+    if profile["forget_pairs"] < 1.0 and rng.random() >= profile["forget_pairs"]:
+        for sq1 in seen:
+            sq2 = partner_of.get(sq1)
+            if sq2 is not None and sq1 not in matched and sq1 not in unreadable:
+                return sq1, "robot_confident_pair_match", (sq1, sq2)
+
+    unseen = [sq for sq in squares if sq not in seen]
+    if unseen:
+        square = rng.choice(unseen)
+        return square, "robot_flip_unseen", square
+    remaining = [sq for sq in squares if sq not in matched]
+    if remaining:
+        square = rng.choice(remaining)
+        return square, "robot_fallback", square
+    return None, "robot_idle", None
+
+
+def robot_second_pick(difficulty, first, first_was_new, squares, seen, matched, partner_of, singletons,
+                      arm_pose=None, objective="turns", rng=random):
+    """Second pick once `first` is revealed: its known partner, else per difficulty. Returns (square, event) or None."""
+    partner = partner_of.get(first)
+    if partner is not None:
+        return partner, "robot_second_pick_partner"
+
+    if DIFFICULTY_PROFILES.get(difficulty, {}).get("engine"):
+        choice = choose_second(first_was_new, [sq for sq in singletons if sq != first],
+                               [sq for sq in squares if sq not in seen], arm_pose, objective)
+        if choice is not None:
+            return choice
+
+    unseen = [sq for sq in squares if sq not in seen and sq != first]
+    if unseen:
+        return rng.choice(unseen), "robot_second_pick_unseen"
+    fallback = [sq for sq in squares if sq != first and sq not in matched]
+    if fallback:
+        return rng.choice(fallback), "robot_second_pick_fallback"
+    return None
+
+
+# ---------------------- STRATEGY COMPARISON ----------------------
+
+def greedy_policy(n, k):
+    """The previous hard-mode behaviour: always flip unseen cards."""
+    return UNSEEN, UNSEEN
+
+
+def _play_turn(cards, seen, removed, policy, rng):
+    """Plays one turn in place. Returns pairs won; the turn ends on the first mismatch."""
+    won = 0
+    while True:
+        on_board = [i for i in range(len(cards)) if i not in removed]
+        if not on_board:
+            return won
+        seen_by_pair = {}
+        for i in on_board:
+            if i in seen:
+                seen_by_pair.setdefault(cards[i], []).append(i)
+        known = [p for p in seen_by_pair.values() if len(p) == 2]
+        if known:
+            removed.update(known[0])
+            won += 1
+            continue
+        singletons = [p[0] for p in seen_by_pair.values()]
+        unseen = [i for i in on_board if i not in seen]
+        k = len(singletons)
+        first_kind, second_kind = policy((len(unseen) + k) // 2, k)
+
+        if first_kind == KNOWN and singletons:
+            first, first_was_new = rng.choice(singletons), False
+        else:
+            first, first_was_new = rng.choice(unseen), True
+            unseen.remove(first)
+        seen.add(first)
+        partner = next((i for i in singletons if cards[i] == cards[first] and i != first), None)
+        if partner is not None:
+            removed.update((first, partner))
+            won += 1
+            continue
+
+        others = [i for i in singletons if i != first]
+        if first_was_new and second_kind == KNOWN and others:
+            second = rng.choice(others)
+        else:
+            second = rng.choice(unseen) if unseen else rng.choice(others)
+        seen.add(second)
+        if cards[second] == cards[first]:
+            removed.update((first, second))
+            won += 1
+            continue
+        return won
+
+
+def simulate_game(robot_policy, human_policy, pairs=BOARD.pairs, rng=random, human_starts=True):
+    """One perfect-memory game. Returns (robot pairs, human pairs, robot turns, human turns)."""
+    cards = [p for p in range(pairs) for _ in range(2)]
+    rng.shuffle(cards)
+    seen, removed = set(), set()
+    score = {"robot": 0, "human": 0}
+    turns = {"robot": 0, "human": 0}
+    player = "human" if human_starts else "robot"
+    while len(removed) < len(cards):
+        policy = robot_policy if player == "robot" else human_policy
+        turns[player] += 1
+        score[player] += _play_turn(cards, seen, removed, policy, rng)
+        player = "human" if player == "robot" else "robot"
+    return score["robot"], score["human"], turns["robot"], turns["human"]
+
+
+def compare_strategies(games=2000, pairs=BOARD.pairs, seed=0):
+    """Plays each policy against a greedy human and prints margin, win rate and turns."""
+    rng = random.Random(seed)
+    policies = (("greedy", greedy_policy),
+                ("turns", engine_policy),
+                ("margin", lambda n, k: engine_policy(n, k, "margin")))
+    results = {}
+    for name, policy in policies:
+        margin = wins = robot_turns = all_turns = 0
+        for g in range(games):
+            robot, human, r_turns, h_turns = simulate_game(policy, greedy_policy, pairs, rng, human_starts=g % 2 == 0)
+            margin += robot - human
+            wins += robot > human
+            robot_turns += r_turns
+            all_turns += r_turns + h_turns
+        results[name] = {"margin": margin / games, "win_rate": wins / games,
+                         "robot_turns": robot_turns / games, "game_turns": all_turns / games}
+        print(f"[STRATEGY] {name:<7} margin {results[name]['margin']:+.3f} pairs, "
+              f"win rate {results[name]['win_rate'] * 100:.1f}%, {results[name]['robot_turns']:.2f} robot turns, "
+              f"{results[name]['game_turns']:.2f} turns/game")
+    print(f"[STRATEGY] Fresh board: margin {value(pairs, 0):+.3f} for the player to move, "
+          f"{1 + turns_after(pairs, 0):.2f} turns expected")
+    return results
+
+
+if __name__ == "__main__":
+    compare_strategies()
@@ -0,0 +1,61 @@
+import math
+import pytest
+from board_geometry import BoardGeometry
+from recorded_positions import drop_positions
+
+
+def recorded_4x5():
+    return {sq: pose for sq, pose in drop_positions.items() if sq in BoardGeometry(4, 5)}
+
+
+@pytest.mark.parametrize("rows, cols", [(4, 5), (6, 6), (8, 8)])
+def test_layout(rows, cols):
+    board = BoardGeometry(rows, cols)
+    assert board.size == rows * cols and board.pairs == rows * cols // 2
+    assert board.squares[0] == "A1" and board.squares[-1] == board.label(rows - 1, cols - 1)
+    assert len(set(board.squares)) == board.size
+    assert all(board.index[sq] == i for i, sq in enumerate(board.squares))
+    assert board.position(board.squares[-1]) == (rows - 1, cols - 1)
+
+
+def test_invalid_sizes_are_refused():
+    with pytest.raises(ValueError):
+        BoardGeometry(3, 3)   # Odd number of squares
+    with pytest.raises(ValueError):
+        BoardGeometry(0, 4)
+    with pytest.raises(ValueError):
+        BoardGeometry(27, 2)  # Runs out of row letters
+
+
+@pytest.mark.parametrize("rows, cols, per_stack", [(4, 5, 5), (6, 6, 9), (8, 8, 16), (2, 3, 2)])
+def test_stack_capacity_holds_the_whole_board(rows, cols, per_stack):
+    board = BoardGeometry(rows, cols)
+    assert board.cards_per_stack(4) == per_stack
+    stacks = [board.stack_for(n, 4) for n in range(board.size)]
+    assert stacks == sorted(stacks) and max(stacks) <= 3
+    assert all(stacks.count(s) <= per_stack for s in set(stacks))
+
+
+def test_recorded_board_needs_no_extra_poses():
+    positions = recorded_4x5()
+    assert BoardGeometry(4, 5).complete_poses(positions) == []
+
+
+def test_bigger_board_extrapolates_along_the_recorded_grid():
+    positions = recorded_4x5()
+    added = BoardGeometry(6, 6).complete_poses(positions)
+    assert len(added) == 36 - 20 and "F6" in added and "A1" not in added
+    dx = positions["B1"][0] - positions["A1"][0]
+    dy = positions["A2"][1] - positions["A1"][1]
+    assert positions["F1"][0] == pytest.approx(positions["A1"][0] + 5 * dx, abs=0.01)
+    assert positions["A6"][1] == pytest.approx(positions["A1"][1] + 5 * dy, abs=0.01)
+    assert math.isclose(positions["F6"][2], positions["D5"][2])   # Height copied from the closest recorded square
+
+
+def test_real_arm_refuses_extrapolated_poses(monkeypatch):
+    import robot_backend
+    robot_backend.check_board("niryo")   # The recorded 4×5 board
+    monkeypatch.setattr(robot_backend, "EXTRAPOLATED_SQUARES", ["A6", "B6"])
+    robot_backend.check_board("mock")
+    with pytest.raises(ValueError):
+        robot_backend.check_board("niryo")
@@ -0,0 +1,43 @@
+import json
+import pytest
+from gui_events import (CacheBust, FlipBack, GameOver, HintFlash, Matched, Reset, Reveal, RobotStatus,
+                        Score, ScreenMessage, Turn, TurnProfile, coalesce, decode, encode)
+
+MESSAGES = [
+    Reveal("A1", "scanned_cards/A1.jpg"),
+    Matched(("A1", "B2")),
+    FlipBack(("C3", "D4")),
+    Reset(),
+    Turn("robot"),
+    Score(2, 3),
+    GameOver("Robot", 2, 3),
+    ScreenMessage("Placing cards...", 2000),
+    RobotStatus("Scanning"),
+    TurnProfile(("scan 1.2 s", "move 0.8 s")),
+    CacheBust("scanned_cards/A1.jpg"),
+]
+
+
+@pytest.mark.parametrize("msg", MESSAGES, ids=lambda m: type(m).__name__)
+def test_encode_decode_round_trip_through_json(msg):
+    assert decode(json.loads(json.dumps(encode(msg)))) == msg
+
+
+def test_last_writer_wins_keeps_the_final_state():
+    batch = [Score(1, 0), Turn("robot"), Score(1, 1), Turn("human"), Score(2, 1)]
+    assert coalesce(batch) == [Turn("human"), Score(2, 1)]
+
+
+def test_repeated_reveal_is_dropped_until_cards_flip_back():
+    reveal = Reveal("A1", "a1.jpg")
+    assert coalesce([reveal, reveal]) == [reveal]
+    batch = [reveal, FlipBack(("A1", "B1")), reveal]
+    assert coalesce(batch) == batch
+    batch = [reveal, HintFlash(("A1", "C1")), reveal, Reset(), reveal]
+    assert coalesce(batch) == batch
+
+
+def test_other_messages_keep_their_order():
+    batch = [Reveal("A1", "a.jpg"), Reveal("B1", "b.jpg"), Matched(("A1", "B1")),
+             ScreenMessage("hi"), ScreenMessage("hi")]
+    assert coalesce(batch) == batch
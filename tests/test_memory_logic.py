@@ -0,0 +1,41 @@
+import pytest
+import memory_logic
+from pose_graph import POSE_GRAPH, pose_key
+from recorded_positions import drop_positions
+
+
+@pytest.fixture
+def planner():
+    # A planner whose background thread is never started: plans are only made by take()
+    location, objective = POSE_GRAPH.location, memory_logic.STRATEGY_OBJECTIVE
+    yield memory_logic.SpeculativePlanner()
+    POSE_GRAPH.location, memory_logic.STRATEGY_OBJECTIVE = location, objective
+
+
+def test_plan_is_current_for_an_unchanged_board(planner):
+    plan = memory_logic.plan_first_pick()
+    assert planner._is_current(plan)
+
+
+def test_arm_move_makes_the_plan_stale(planner):
+    POSE_GRAPH.location = pose_key(drop_positions["A1"])
+    plan = memory_logic.plan_first_pick()
+    POSE_GRAPH.location = pose_key(drop_positions["D5"])
+    assert not planner._is_current(plan)
+
+
+def test_objective_change_makes_the_plan_stale(planner):
+    plan = memory_logic.plan_first_pick()
+    memory_logic.STRATEGY_OBJECTIVE = "margin" if plan[0][3] == "turns" else "turns"
+    assert not planner._is_current(plan)
+
+
+def test_hard_first_pick_is_the_unseen_square_nearest_the_arm(planner):
+    POSE_GRAPH.location = pose_key(drop_positions["D5"])
+    difficulty = memory_logic.DIFFICULTY
+    memory_logic.DIFFICULTY = "hard"
+    try:
+        _, pick, event, _ = memory_logic.plan_first_pick()
+    finally:
+        memory_logic.DIFFICULTY = difficulty
+    assert (pick, event) == ("D5", "robot_flip_unseen")
@@ -0,0 +1,74 @@
+import queue
+import time
+import pytest
+from memory_queues import CONTROL_LANE, NORMAL_LANE, CommandQueue
+
+
+def test_control_commands_jump_ahead_of_square_picks():
+    q = CommandQueue()
+    q.put("A1")
+    q.put({"event": "PLAN_NEXT_ROBOT_MOVE"})
+    q.put({"event": "RESTART_GAME"})
+    assert q.get() == {"event": "RESTART_GAME"}
+    assert [q.get(), q.get()] == ["A1", {"event": "PLAN_NEXT_ROBOT_MOVE"}]
+
+
+def test_explicit_lane_overrides_the_event():
+    q = CommandQueue()
+    q.put("B2")
+    q.put({"event": "GOTO_INTRO"}, lane=NORMAL_LANE)
+    q.put("C3", lane=CONTROL_LANE)
+    assert [q.get(), q.get(), q.get()] == ["C3", "B2", {"event": "GOTO_INTRO"}]
+
+
+def test_empty_queue_raises_empty():
+    q = CommandQueue()
+    assert q.empty() and q.qsize() == 0
+    with pytest.raises(queue.Empty):
+        q.get_nowait()
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0.01)
+
+
+def test_entries_carry_their_enqueue_time():
+    q = CommandQueue()
+    before = time.perf_counter()
+    q.put("D4")
+    item, enqueued_at = q.get_entry()
+    assert item == "D4" and before <= enqueued_at <= time.perf_counter()
+
+
+def test_clear_drops_everything():
+    q = CommandQueue()
+    q.put("A1")
+    q.put({"event": "RESTART_GAME"})
+    assert q.clear() == 2
+    assert q.empty()
+
+
+def test_clear_before_keeps_newer_commands():
+    q = CommandQueue()
+    q.put("A1")
+    q.put({"event": "RESTART_GAME"})
+    cutoff = time.perf_counter()
+    q.put("B2")
+    assert q.clear(before=cutoff) == 2
+    assert q.qsize() == 1 and q.get() == "B2"
+
+
+def test_control_listeners_run_on_put():
+    q = CommandQueue()
+    heard = []
+    q.add_control_listener(heard.append)
+    q.put("A1")
+    q.put({"event": "RESTART_GAME"})
+    assert heard == [{"event": "RESTART_GAME"}]
+
+
+def test_query_handlers_answer_without_queueing():
+    q = CommandQueue()
+    answers = []
+    q.add_query_handler("GET_HINT", answers.append)
+    q.put({"event": "GET_HINT"})
+    assert answers == [{"event": "GET_HINT"}]
+    assert q.empty()
@@ -0,0 +1,62 @@
+import pytest
+from board_geometry import BOARD
+from pose_graph import (POSE_GRAPH, STACK_CLEARANCE, STACK_NAMES, PoseGraph, build_pose_graph,
+                        clear_node, pick_node, pose_key)
+
+
+@pytest.fixture
+def graph():
+    return build_pose_graph()
+
+
+def test_pick_and_stack_poses_only_reachable_from_their_clearance(graph):
+    for square_id in BOARD.squares:
+        assert graph.edges[pick_node(square_id)] == {clear_node(square_id)}
+    for name in STACK_NAMES:
+        assert graph.edges[name] == {clear_node(name)}
+        assert graph.poses[clear_node(name)][2] == pytest.approx(graph.poses[name][2] + STACK_CLEARANCE)
+
+
+def test_route_from_board_to_stack_lifts_and_descends(graph):
+    graph.location = pose_key(graph.poses[pick_node("A1")])
+    assert graph.route("L1") == [clear_node("A1"), clear_node("L1"), "L1"]
+
+
+def test_route_leaves_a_stack_through_its_clearance(graph):
+    graph.location = pose_key(graph.poses["R2"])
+    assert graph.route(pick_node("D5")) == [clear_node("R2"), clear_node("D5"), pick_node("D5")]
+
+
+def test_unknown_location_takes_the_approach_pose_first(graph):
+    assert graph.location is None
+    assert graph.route(pick_node("B2")) == [clear_node("B2"), pick_node("B2")]
+    assert graph.route("L2") == [clear_node("L2"), "L2"]
+    assert graph.route("home") == ["home"]
+
+
+def test_route_to_current_node_is_empty(graph):
+    graph.location = pose_key(graph.poses["scan"])
+    assert graph.route("scan") == []
+    assert graph.stats["skipped"] == 1
+
+
+def test_measured_cost_replaces_prior():
+    graph = PoseGraph()
+    graph.add_pose("a", [0, 0, 0, 0, 0, 0])
+    graph.add_pose("b", [0.15, 0, 0, 0, 0, 0])
+    graph.connect("a", "b")
+    assert graph.estimate("a", "b") == pytest.approx(graph.prior("a", "b"))
+    graph.measured[("a", "b")] = 0.2
+    assert graph.estimate("a", "b") == 0.2
+
+
+def test_shortest_path_without_edge_raises():
+    graph = PoseGraph()
+    graph.add_pose("a", [0, 0, 0, 0, 0, 0])
+    graph.add_pose("b", [1, 0, 0, 0, 0, 0])
+    with pytest.raises(ValueError):
+        graph.shortest_path("a", "b")
+
+
+def test_module_graph_covers_every_square():
+    assert all(pick_node(sq) in POSE_GRAPH.poses for sq in BOARD.squares)
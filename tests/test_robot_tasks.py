@@ -0,0 +1,32 @@
+import pytest
+import robot_tasks
+from robot_tasks import ActionCancelled, cancel_requested, check_cancelled, finish_cancel, request_cancel
+
+
+@pytest.fixture(autouse=True)
+def no_pending_cancel():
+    finish_cancel()
+    yield
+    finish_cancel()
+
+
+def test_checkpoint_passes_without_a_request():
+    check_cancelled()
+    assert not cancel_requested()
+    assert finish_cancel() is None
+
+
+def test_request_stops_the_next_checkpoint_until_finished():
+    request_cancel("RESTART_GAME")
+    with pytest.raises(ActionCancelled, match="RESTART_GAME"):
+        check_cancelled()
+    latency = finish_cancel()
+    assert latency >= 0 and robot_tasks.ABORT_LATENCIES[-1] == latency
+    check_cancelled()
+
+
+def test_first_request_wins():
+    request_cancel("RESTART_GAME")
+    request_cancel("GOTO_INTRO")
+    with pytest.raises(ActionCancelled, match="RESTART_GAME"):
+        check_cancelled()
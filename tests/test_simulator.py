@@ -0,0 +1,45 @@
+import random
+import memory_logic
+import simulator
+from board_geometry import BOARD
+from pose_graph import POSE_GRAPH
+
+
+def test_games_finish_with_every_pair_taken():
+    for difficulty in ("hard", "medium", "easy"):
+        game = simulator.SimGame("t", difficulty, scan_error=0.1).play()
+        assert not game.on_board
+        assert sum(game.score) == BOARD.pairs
+
+
+def test_simulator_and_memory_logic_pick_the_same_squares():
+    simulator.cross_check(games=2)
+
+
+def test_cross_check_restores_live_state():
+    memory_logic.memory_board["A1"] = {"mean": None, "desc": None}
+    memory_logic.partner_of.update({"B1": "B2", "B2": "B1"})
+    memory_logic.known_pairs.add(("B1", "B2"))
+    POSE_GRAPH.location = (1.0, 2.0, 3.0)
+    difficulty = memory_logic.DIFFICULTY
+    random.seed(42)
+    before = (dict(memory_logic.memory_board), dict(memory_logic.partner_of), set(memory_logic.known_pairs),
+              set(memory_logic.matched_squares), list(memory_logic.game_history), random.getstate())
+    try:
+        simulator.cross_check(games=1)
+        after = (dict(memory_logic.memory_board), dict(memory_logic.partner_of), set(memory_logic.known_pairs),
+                 set(memory_logic.matched_squares), list(memory_logic.game_history), random.getstate())
+        assert after == before
+        assert POSE_GRAPH.location == (1.0, 2.0, 3.0)
+        assert memory_logic.DIFFICULTY == difficulty
+    finally:
+        memory_logic.memory_board.clear()
+        memory_logic.partner_of.clear()
+        memory_logic.known_pairs.clear()
+        POSE_GRAPH.location = None
+
+
+def test_batch_results_are_reproducible():
+    first = simulator.BatchSimulator("medium", games=20, seed=3).run()
+    assert first == simulator.BatchSimulator("medium", games=20, seed=3).run()
+    assert first["games"] == 20 and 0.0 <= first["robot_wins"] <= 1.0
@@ -0,0 +1,23 @@
+import pytest
+import stackandunstack
+from stackandunstack import CARD_THICKNESS, stack_pick_z
+
+
+def test_recorded_4x5_heights_match_baseline():
+    # Baseline place_initial_cards: 0.065 for the first two picks of a stack, 0.06 after that
+    assert [stack_pick_z(5, i) for i in range(5)] == [0.065, 0.065, 0.06, 0.06, 0.06]
+
+
+def test_smaller_stacks_use_recorded_heights():
+    assert [stack_pick_z(4, i) for i in range(4)] == [0.065, 0.065, 0.06, 0.06]
+
+
+def test_bigger_stacks_add_card_thickness_above_recorded_five():
+    heights = [stack_pick_z(9, i) for i in range(9)]
+    assert heights[0] == pytest.approx(0.065 + 4 * CARD_THICKNESS)
+    assert all(a > b for a, b in zip(heights[:4], heights[1:5]))
+    assert heights[4:] == [0.065, 0.065, 0.06, 0.06, 0.06]
+
+
+def test_default_board_stacks_hold_the_recorded_five():
+    assert stackandunstack.CARDS_PER_STACK == stackandunstack.RECORDED_STACK_CARDS
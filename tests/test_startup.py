@@ -0,0 +1,33 @@
+import threading
+import pytest
+import startup
+
+
+@pytest.fixture(autouse=True)
+def fresh_timing(monkeypatch):
+    monkeypatch.setattr(startup, "_stages", [])
+    monkeypatch.setattr(startup, "_ready", {})
+
+
+def test_stage_is_timed_on_its_thread():
+    with startup.startup_stage("load assets"):
+        pass
+    (thread_name, name, start, end), = startup._stages
+    assert (thread_name, name) == (threading.current_thread().name, "load assets")
+    assert 0 <= start <= end
+
+
+def test_stage_is_recorded_when_it_fails():
+    with pytest.raises(RuntimeError):
+        with startup.startup_stage("robot: connect"):
+            raise RuntimeError("no robot")
+    assert [s[1] for s in startup._stages] == ["robot: connect"]
+
+
+def test_report_prints_once_every_component_is_ready(capsys):
+    startup.mark_ready("gui")
+    assert "Startup timing" not in capsys.readouterr().out
+    startup.mark_ready("robot")
+    assert "Startup timing" in capsys.readouterr().out
+    startup.mark_ready("robot")
+    assert capsys.readouterr().out == ""
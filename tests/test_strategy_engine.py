@@ -0,0 +1,112 @@
+import pytest
+import strategy_engine
+from strategy_engine import (KNOWN, UNSEEN, choose_first, choose_second, engine_policy, first_pick_kind,
+                             nearest_square, policy_table, robot_first_pick, robot_second_pick,
+                             turns_after, value)
+from recorded_positions import drop_positions
+
+SQUARES = ["A1", "A2", "A3", "A4"]
+
+
+class FixedRng:
+    """Stands in for random: random() returns `draw`, choice() the first option."""
+    def __init__(self, draw):
+        self.draw = draw
+
+    def random(self):
+        return self.draw
+
+    def choice(self, options):
+        return options[0]
+
+
+# ----------- Values ------------
+
+def test_last_pair_is_always_won():
+    assert value(1, 0) == 1.0
+    assert value(1, 1) == 1.0
+    assert turns_after(1, 0) == 0.0
+
+
+def test_every_pair_half_known_is_swept_in_one_turn():
+    for n in range(1, 6):
+        assert value(n, n) == pytest.approx(n)
+        assert turns_after(n, n) == 0.0
+
+
+def test_fresh_4x5_board():
+    assert value(10, 0) == pytest.approx(-0.023, abs=1e-3)
+    assert 1 + turns_after(10, 0) == pytest.approx(6.62, abs=1e-2)
+
+
+def test_policy_never_flips_a_known_card_without_singletons():
+    for (n, k), (first, second) in policy_table(10).items():
+        assert first in (UNSEEN, KNOWN) and second in (UNSEEN, KNOWN)
+        if k == 0:
+            assert first == UNSEEN
+    assert engine_policy(3, 3) == (first_pick_kind(3, 3), UNSEEN)
+
+
+# ----------- Square selection ------------
+
+def test_nearest_square_to_the_arm():
+    assert nearest_square(SQUARES, drop_positions["A3"]) == "A3"
+
+
+def test_equal_distances_break_ties_by_name(monkeypatch):
+    monkeypatch.setitem(strategy_engine.drop_positions, "D5", drop_positions["A1"])
+    assert nearest_square(["D5", "A1"], drop_positions["A1"]) == "A1"
+
+
+def test_known_pair_comes_first_from_its_nearest_card():
+    pick = choose_first([("A1", "D5")], ["B2"], ["C3"], drop_positions["D5"])
+    assert pick == ("D5", "robot_confident_pair_match", ("A1", "D5"))
+
+
+def test_idle_without_cards():
+    assert choose_first([], [], []) is None
+    assert choose_second(True, [], []) is None
+
+
+def test_second_pick_takes_a_known_card_when_nothing_is_unseen():
+    assert choose_second(True, ["B2", "A1"], [], drop_positions["A1"]) == ("A1", "robot_second_pick_known")
+
+
+# ----------- Robot policy ------------
+
+def test_hard_first_pick_uses_the_engine():
+    pick = robot_first_pick("hard", SQUARES, {}, set(), {}, set(), [], drop_positions["A4"])
+    assert pick == ("A4", "robot_flip_unseen", "A4")
+
+
+def test_medium_takes_a_known_pair_unless_it_forgets():
+    state = (SQUARES, {"A1": 1, "A2": 1}, set(), {"A1": "A2", "A2": "A1"}, {("A1", "A2")}, [])
+    assert robot_first_pick("medium", *state, rng=FixedRng(0.9)) == ("A1", "robot_confident_pair_match", ("A1", "A2"))
+    assert robot_first_pick("medium", *state, rng=FixedRng(0.1)) == ("A3", "robot_flip_unseen", "A3")
+
+
+def test_unreadable_cards_are_not_taken_as_pairs():
+    state = (SQUARES, {"A1": 1, "A2": 1}, set(), {"A1": "A2", "A2": "A1"}, {("A1", "A2")}, [])
+    pick = robot_first_pick("medium", *state, unreadable={"A1"}, rng=FixedRng(0.9))
+    assert pick == ("A2", "robot_confident_pair_match", ("A2", "A1"))
+
+
+def test_easy_never_draws_for_pairs():
+    class NoDraw(FixedRng):
+        def random(self):
+            raise AssertionError("easy must not draw")
+    state = (SQUARES, {"A1": 1, "A2": 1}, set(), {"A1": "A2", "A2": "A1"}, {("A1", "A2")}, [])
+    assert robot_first_pick("easy", *state, rng=NoDraw(0)) == ("A3", "robot_flip_unseen", "A3")
+
+
+def test_second_pick_takes_the_known_partner():
+    pick = robot_second_pick("easy", "A1", False, SQUARES, {"A1": 1, "A3": 1}, set(), {"A1": "A3", "A3": "A1"}, [])
+    assert pick == ("A3", "robot_second_pick_partner")
+
+
+def test_fallback_when_everything_is_seen():
+    seen = dict.fromkeys(SQUARES, 1)
+    assert robot_first_pick("easy", SQUARES, seen, {"A1", "A2"}, {}, set(), [], rng=FixedRng(0)) == \
+        ("A3", "robot_fallback", "A3")
+    assert robot_second_pick("easy", "A3", False, SQUARES, seen, {"A1", "A2"}, {}, [], rng=FixedRng(0)) == \
+        ("A4", "robot_second_pick_fallback")
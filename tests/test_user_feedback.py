@@ -0,0 +1,37 @@
+import wave
+import pytest
+import user_feedback
+from user_feedback import clip_seconds
+
+
+def test_wav_length_from_header(tmp_path):
+    path = tmp_path / "beep.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\0\0" * 12000)
+    assert clip_seconds(str(path)) == pytest.approx(1.5)
+
+
+def test_mp3_length_from_bitrate(tmp_path):
+    path = tmp_path / "voice.wav"   # The game's .wav files can hold MP3 data
+    path.write_bytes(b"\xff\xfb\x90\x00" + bytes(15996))   # MPEG-1 Layer III, 128 kbps
+    assert clip_seconds(str(path)) == pytest.approx(16000 * 8 / 128000)
+
+
+def test_invalid_frame_headers_are_skipped(tmp_path):
+    path = tmp_path / "bad.wav"
+    # Bitrate index 15 and sample-rate index 3 are not valid frames; the real one follows
+    path.write_bytes(b"\xff\xfb\xf0\x00" + b"\xff\xfb\x9c\x00" + b"\xff\xfb\x90\x00" + bytes(3988))
+    assert clip_seconds(str(path)) == pytest.approx(3992 * 8 / 128000)
+    path.write_bytes(b"\xff\xfb\xf0\x00" + bytes(100))
+    assert clip_seconds(str(path)) is None
+
+
+def test_index_keeps_to_the_game_cues():
+    user_feedback.index_sounds()
+    clips = {p for paths in user_feedback.SOUND_INDEX.values() for p in paths}
+    assert clips and all(p.endswith(".wav") for p in clips)
+    assert not user_feedback.SOUND_INDEX.get("chocolate")   # Unused .mp3 narration: no playable clips
+    assert "adult/correct_match_human" in user_feedback.SOUND_INDEX
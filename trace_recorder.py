@@ -0,0 +1,109 @@
+import itertools
+import json
+import os
+import threading
+import time
+
+# ---------------------- CHROME TRACE RECORDER ----------------------
+# Optional timeline of a whole session in Chrome Trace Event format. The file can
+# be opened in chrome://tracing or https://ui.perfetto.dev.
+# Every span from spans.py becomes a complete ("X") event on its thread's track.
+# Every hop through square_queue or gui_queue becomes a flow arrow from the
+# producer's thread to the consumer's.
+# Off by default: `recorder` stays None and each hook costs one `if`. Enabled per
+# session with `python main.py --trace [file]`.
+
+MAX_EVENTS = 2_000_000  # Safety cap (~200 MB of JSON); later events are dropped
+
+recorder = None
+_flow_ids = itertools.count(1)
+
+
+def next_flow_id():
+    return next(_flow_ids)
+
+
+class TraceRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self.t0 = time.perf_counter()
+        self.events = []
+        self.threads = {}   # tid: name
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def _tid(self):
+        thread = threading.current_thread()
+        tid = thread.ident
+        if tid not in self.threads:
+            self.threads[tid] = thread.name
+        return tid
+
+    def _us(self, t):
+        return round((t - self.t0) * 1e6, 1)
+
+    def _add(self, *events):
+        with self._lock:
+            if len(self.events) >= MAX_EVENTS:
+                self.dropped += len(events)
+                return
+            self.events.extend(events)
+
+    # ----------- Events ------------
+
+    def complete(self, name, cat, start, duration, args=None):
+        event = {"name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": self._tid(),
+                 "ts": self._us(start), "dur": round(duration * 1e6, 1)}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def instant(self, name, cat, args=None):
+        event = {"name": name, "cat": cat, "ph": "i", "s": "t", "pid": self.pid, "tid": self._tid(),
+                 "ts": self._us(time.perf_counter())}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def flow(self, phase, flow_id, name, cat):
+        """
+        One end of a queue hop: phase "s" on put(), "f" on get(). Each end gets a
+        1 µs slice, so the arrow has something to attach to on that thread.
+        """
+        tid, ts = self._tid(), self._us(time.perf_counter())
+        label = "enqueue" if phase == "s" else "dequeue"
+        slice_event = {"name": f"{label} {name}", "cat": cat, "ph": "X", "pid": self.pid, "tid": tid,
+                       "ts": ts, "dur": 1}
+        flow_event = {"name": name, "cat": cat, "ph": phase, "id": flow_id, "pid": self.pid, "tid": tid, "ts": ts}
+        if phase == "f":
+            flow_event["bp"] = "e"
+        self._add(slice_event, flow_event)
+
+    # ----------- Output ------------
+
+    def save(self):
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+        metadata = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                    for tid, name in threads.items()]
+        with open(self.path, "w") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        print(f"[TRACE] Wrote {len(events)} events from {len(threads)} threads to {self.path}"
+              + (f" ({self.dropped} dropped)" if self.dropped else ""))
+
+
+def start(path="game_trace.json"):
+    global recorder
+    recorder = TraceRecorder(path)
+    print(f"[TRACE] Recording the session timeline to {path}")
+    return recorder
+
+
+def stop():
+    """Writes the trace file and stops recording."""
+    global recorder
+    if recorder is not None:
+        current, recorder = recorder, None
+        current.save()
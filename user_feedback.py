@@ -1,41 +1,321 @@
+import io
 import os
+import wave
+import queue
 import random
+import itertools
+import threading
+import time
+from collections import OrderedDict
 import pygame
+from startup import startup_stage
+from spans import traced
 
 # Path to your main sound folder
 SOUND_ROOT = "sounds"
 
-# Cache for loaded sounds to improve performance
-SOUND_CACHE = {}
+# ---------------------- SOUND BANK ----------------------
+# The sounds/ tree is indexed once at startup (category: clip paths), so playing a
+# cue never touches the filesystem. The clips of the active audio profile (plus the
+# shared ones) are decoded in the background by the "audio" thread, which also
+# opened the mixer. play_sound() never blocks: a decoded clip starts right away on
+# the channel manager, anything else is handed to the audio thread, ahead of the
+# background decoding. Decoded audio is capped at SOUND_CACHE_MB; the least recently
+# played clips of the inactive profile are evicted first.
+# Clips are classified by duration when indexed (read from the file header, not
+# decoded). Short effects are decoded in full; long narration (over LONG_CLIP_S) only
+# keeps its compressed bytes and streams through pygame.mixer.music, which starts
+# at once and decodes as it plays. One narration plays at a time.
 
-def play_sound(category):
-    
-    sound_path = None
-    folder_path = os.path.join(SOUND_ROOT, category)
-
-    if os.path.isdir(folder_path):
-        wav_files = [f for f in os.listdir(folder_path) if f.endswith(".wav")]
-        if not wav_files:
-            print(f"[SFX] No sounds found in: {category}")
-            return
-        chosen_file = random.choice(wav_files)
-        sound_path = os.path.join(folder_path, chosen_file)
+PROFILES = ("adult", "kid")   # Top-level folders that belong to one audio profile
+# The formats the game has always played. Some of its .wav files hold MP3 data, which
+# clip_seconds() reads too; the .mp3 clips in sounds/chocolate/ are not game cues.
+AUDIO_EXTENSIONS = (".wav",)
+LONG_CLIP_S = 5.0             # Longer clips are streamed instead of decoded into memory
+SOUND_CACHE_MB = 20           # Every clip resident takes ~22 MB, one profile and the shared clips ~14 MB
+MIXER_CHANNELS = 8
+STALE_PLAY_S = 2.0            # A cue that could not start within this long (counted from the mixer opening at the earliest) is dropped and logged
+
+SOUND_INDEX = {}              # category: tuple of clip paths, built by index_sounds()
+CLIP_SECONDS = {}             # path: duration from the file header (None if unknown)
+SOUND_CACHE = OrderedDict()   # path: (Sound or Stream, bytes), least recently played first
+sound_stats = {"hits": 0, "misses": 0, "dropped": 0, "stolen": 0, "evicted": 0,
+               "decoded": 0, "decode_ms": 0.0, "streamed": 0, "bytes": 0}
+
+# Layer III bitrates (kbps) by bitrate index (0 is free format, 15 is invalid)
+MP3_KBPS = {"mpeg1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+            "mpeg2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)}
+
+_PLAY, _PRELOAD = 0, 1        # Job priorities: a cue always goes before background decoding
+_jobs = queue.PriorityQueue()
+_job_order = itertools.count()
+_lock = threading.Lock()      # Guards SOUND_CACHE, sound_stats and the channels
+_active_profile = "adult"
+
+# Set once the mixer has been opened (or failed to open) by init_audio_async()
+_mixer_ready = threading.Event()
+_mixer_ready_at = None        # perf_counter() when the mixer was ready
+_mixer_opening = False
 
-    else:
-        filepath = f"{folder_path}.wav"
-        if os.path.isfile(filepath):
-            sound_path = filepath
 
-    if sound_path:
-        if sound_path in SOUND_CACHE:
-            SOUND_CACHE[sound_path].play()
+class Stream:
+    """A long clip kept compressed in memory, played through pygame.mixer.music."""
+
+    def __init__(self, data):
+        self.data = data
+
+
+class ChannelManager:
+    """
+    Plays sounds on a fixed set of mixer channels. When all are busy, the oldest cue is cut.
+    Streams go to the music channel, cutting the narration that is playing, if any.
+    """
+
+    def __init__(self, count):
+        pygame.mixer.set_num_channels(count)
+        self._channels = [pygame.mixer.Channel(i) for i in range(count)]
+        self._started = [0.0] * count
+
+    def play(self, sound):
+        if isinstance(sound, Stream):
+            if pygame.mixer.music.get_busy():
+                sound_stats["stolen"] += 1
+            pygame.mixer.music.load(io.BytesIO(sound.data))
+            pygame.mixer.music.play()
+            sound_stats["streamed"] += 1
+            return
+        free = [i for i, channel in enumerate(self._channels) if not channel.get_busy()]
+        if free:
+            i = free[0]
         else:
+            i = min(range(len(self._channels)), key=self._started.__getitem__)
+            sound_stats["stolen"] += 1
+        self._channels[i].play(sound)
+        self._started[i] = time.perf_counter()
+
+
+_channels = None
+
+
+def _profile_of(path):
+    """The audio profile a clip belongs to, or None for clips every profile uses."""
+    top = os.path.relpath(path, SOUND_ROOT).split(os.sep)[0]
+    return top if top in PROFILES else None
+
+
+def clip_seconds(path):
+    """Duration of a clip from its header, without decoding it (WAV or constant-bitrate MP3). None if unknown."""
+    with open(path, "rb") as f:
+        head = f.read(10)
+        if head[:4] == b"RIFF":
+            with wave.open(path) as w:
+                return w.getnframes() / w.getframerate()
+        start = 0
+        if head[:3] == b"ID3":
+            # ID3v2 tag size is a 28-bit "syncsafe" integer
+            start = 10 + ((head[6] & 0x7f) << 21 | (head[7] & 0x7f) << 14 | (head[8] & 0x7f) << 7 | head[9] & 0x7f)
+        f.seek(start)
+        frames = f.read(4096)
+    for i in range(len(frames) - 2):
+        if frames[i] != 0xFF or frames[i + 1] & 0xE6 != 0xE2:  # Frame sync, Layer III
+            continue
+        bitrate, sample_rate = frames[i + 2] >> 4, (frames[i + 2] >> 2) & 3
+        if bitrate in (0, 15) or sample_rate == 3:
+            continue  # Free-format or reserved values: a false sync (e.g. inside tag data)
+        kbps = MP3_KBPS["mpeg1" if frames[i + 1] & 0x18 == 0x18 else "mpeg2"][bitrate]
+        return (os.path.getsize(path) - start - i) * 8 / (kbps * 1000)
+    return None
+
+
+def is_long(path):
+    return (CLIP_SECONDS.get(path) or 0.0) > LONG_CLIP_S
+
+
+def index_sounds():
+    """Maps every category under SOUND_ROOT to its clips (a folder's clips, or a single clip) and times them."""
+    index = {}
+    files = {}
+    for folder, _, names in os.walk(SOUND_ROOT):
+        category = os.path.relpath(folder, SOUND_ROOT).replace(os.sep, "/")
+        prefix = "" if category == "." else category + "/"
+        clips = sorted(os.path.join(folder, name) for name in names if name.endswith(AUDIO_EXTENSIONS))
+        if prefix:
+            index[category] = tuple(clips)
+        for path in clips:
+            files[prefix + os.path.splitext(os.path.basename(path))[0]] = (path,)
             try:
-                sound = pygame.mixer.Sound(sound_path)
-                SOUND_CACHE[sound_path] = sound
-                sound.play()
-                print(f"[SFX] Played: {sound_path}")
-            except pygame.error as e:
-                print(f"[SFX] Error playing sound '{sound_path}': {e}")
-    else:
-        print(f"[SFX] Invalid category or file path: {category}")
\ No newline at end of file
+                CLIP_SECONDS[path] = clip_seconds(path)
+            except (OSError, EOFError, wave.Error, IndexError, ValueError) as e:
+                # Unknown length: the clip is decoded in full instead of streamed
+                print(f"[SFX] Could not read the header of '{path}': {e}")
+                CLIP_SECONDS[path] = None
+    for category, paths in files.items():
+        index.setdefault(category, paths)  # A folder wins over a file of the same name
+    SOUND_INDEX.clear()
+    SOUND_INDEX.update(index)
+    long_clips = sum(1 for path in CLIP_SECONDS if is_long(path))
+    print(f"[SFX] Indexed {len(index)} categories, {len(files)} clips under {SOUND_ROOT}/ "
+          f"({long_clips} longer than {LONG_CLIP_S:.0f} s will stream)")
+
+
+def _choose(category):
+    paths = SOUND_INDEX.get(category)
+    if paths is None:
+        print(f"[SFX] Invalid category or file path: {category}")
+        return None
+    if not paths:
+        print(f"[SFX] No sounds found in: {category}")
+        return None
+    return random.choice(paths)
+
+
+def _cached(path):
+    """The decoded clip, marked as recently used, or None. Called with _lock held."""
+    entry = SOUND_CACHE.get(path)
+    if entry is None:
+        return None
+    SOUND_CACHE.move_to_end(path)
+    return entry[0]
+
+
+def _evict():
+    """Drops least recently played clips until the cache fits. Called with _lock held."""
+    limit = SOUND_CACHE_MB * 1024 * 1024
+    while sound_stats["bytes"] > limit and len(SOUND_CACHE) > 1:
+        inactive = [p for p in SOUND_CACHE if _profile_of(p) not in (None, _active_profile)]
+        path = inactive[0] if inactive else next(iter(SOUND_CACHE))
+        sound_stats["bytes"] -= SOUND_CACHE.pop(path)[1]
+        sound_stats["evicted"] += 1
+
+
+def _load(path):
+    """Decodes `path` (or reads a long clip's bytes) into the cache, on the audio thread. Returns it, or None."""
+    with _lock:
+        sound = _cached(path)
+    if sound is not None:
+        return sound
+    started = time.perf_counter()
+    try:
+        if is_long(path):
+            with open(path, "rb") as f:
+                sound = Stream(f.read())
+            nbytes = len(sound.data)
+        else:
+            sound = pygame.mixer.Sound(path)
+            freq, size, channels = pygame.mixer.get_init()
+            nbytes = int(sound.get_length() * freq) * channels * abs(size) // 8
+    except (OSError, pygame.error) as e:
+        print(f"[SFX] Error loading sound '{path}': {e}")
+        return None
+    with _lock:
+        SOUND_CACHE[path] = (sound, nbytes)
+        sound_stats["bytes"] += nbytes
+        sound_stats["decoded"] += 1
+        sound_stats["decode_ms"] += (time.perf_counter() - started) * 1000
+        _evict()
+    return sound
+
+
+def _queue_profile(profile):
+    """Queues background decoding of the clips `profile` uses, then a summary."""
+    paths = sorted({p for clips in SOUND_INDEX.values() for p in clips if _profile_of(p) in (None, profile)})
+    for path in paths:
+        _jobs.put((_PRELOAD, next(_job_order), "preload", (profile, path), time.perf_counter()))
+    _jobs.put((_PRELOAD, next(_job_order), "profile_ready", (profile, len(paths)), time.perf_counter()))
+
+
+def _run_audio():
+    """The audio thread: opens the mixer, indexes sounds/, then serves cues and background decoding."""
+    global _channels, _mixer_ready_at
+    with startup_stage("audio: mixer init"):
+        try:
+            pygame.mixer.init()
+            _channels = ChannelManager(MIXER_CHANNELS)
+        except pygame.error as e:
+            print(f"[SFX] Could not initialise the mixer: {e}")
+    if _channels is not None:
+        with startup_stage("audio: index sounds"):
+            index_sounds()
+    _mixer_ready_at = time.perf_counter()
+    _mixer_ready.set()
+    if _channels is None:
+        # Cues asked for while the mixer was opening will never play
+        while not _jobs.empty():
+            _, _, kind, arg, _ = _jobs.get_nowait()
+            if kind == "play":
+                print(f"[SFX] Mixer not available, skipping: {arg[0]}")
+        return
+    _queue_profile(_active_profile)
+    while True:
+        _, _, kind, arg, asked_at = _jobs.get()
+        if kind == "play":
+            category, path = arg
+            path = path or _choose(category)
+            sound = _load(path) if path else None
+            if sound is None:
+                continue
+            # A slow mixer start-up does not age the cues queued while it opened (e.g. the intro)
+            waited = time.perf_counter() - max(asked_at, _mixer_ready_at)
+            if waited > STALE_PLAY_S:
+                sound_stats["dropped"] += 1
+                print(f"[SFX] Dropped cue '{category}' ({path}): could not start for {waited:.1f} s "
+                      f"(limit {STALE_PLAY_S:.0f} s)")
+                continue
+            with _lock:
+                _channels.play(sound)
+            print(f"[SFX] Played: {path}")
+        elif kind == "preload":
+            profile, path = arg
+            if profile == _active_profile or _profile_of(path) is None:
+                _load(path)
+        elif kind == "profile_ready" and arg[0] == _active_profile:
+            with _lock:
+                resident = len(SOUND_CACHE)
+            print(f"[SFX] '{arg[0]}' sounds ready: {arg[1]} clips checked in "
+                  f"{time.perf_counter() - asked_at:.2f} s, {resident} resident ({sound_summary()})")
+
+
+def init_audio_async():
+    """Opens the audio device on a background thread so the GUI never waits for it."""
+    global _mixer_opening
+    _mixer_opening = True
+    threading.Thread(target=_run_audio, name="audio", daemon=True).start()
+
+
+def set_audio_profile(profile):
+    """Switches the profile whose clips are kept decoded; its missing clips are decoded in the background."""
+    global _active_profile
+    if profile == _active_profile:
+        return
+    _active_profile = profile
+    if _mixer_ready.is_set() and _channels is not None:
+        _queue_profile(profile)
+
+
+def sound_summary():
+    s = sound_stats
+    return (f"{s['hits']} cues from memory, {s['misses']} decoded on demand, {s['dropped']} dropped late, "
+            f"{s['stolen']} channels stolen, {s['streamed']} streamed, {s['decoded']} clips loaded ({s['decode_ms']:.0f} ms), "
+            f"{s['bytes'] / (1024 * 1024):.1f} MB resident, {s['evicted']} evicted")
+
+
+@traced("sound")
+def play_sound(category):
+    """Starts a sound cue without blocking. category: a folder under sounds/ (random clip) or a clip name."""
+    if not _mixer_opening or (_mixer_ready.is_set() and _channels is None):
+        print(f"[SFX] Mixer not available, skipping: {category}")
+        return
+    path = None
+    if _mixer_ready.is_set():
+        path = _choose(category)
+        if path is None:
+            return
+        with _lock:
+            sound = _cached(path)
+            if sound is not None:
+                sound_stats["hits"] += 1
+                _channels.play(sound)
+                return
+    # Not decoded yet (or the mixer is still opening): the audio thread plays it as soon as it can
+    sound_stats["misses"] += 1
+    _jobs.put((_PLAY, next(_job_order), "play", (category, path), time.perf_counter()))